@@ -0,0 +1,36 @@
+"""
+Lokale JSON-API der Mannschaftskasse (nur lesend, ohne Streamlit-Session)
+
+Liefert Strafen-Statistik, offene Strafen pro Person und offene Kisten als
+JSON mit ETag. Wiederholte Abfragen mit "If-None-Match" bekommen 304, solange
+sich die Arbeitsmappen nicht geändert haben (siehe utils/api.py).
+
+Aufruf: python api.py [--host 127.0.0.1] [--port 8502]
+"""
+
+import argparse
+
+from utils.api import DEFAULT_HOST, DEFAULT_PORT, ENDPOINTS, create_server
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    args = parser.parse_args()
+
+    server = create_server(args.host, args.port)
+    host, port = server.server_address[:2]
+    print(f"✅ API läuft auf http://{host}:{port}")
+    for path in ENDPOINTS:
+        print(f"   http://{host}:{port}{path}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -6,9 +6,8 @@ Hauptdatei für FC Münster 05 Dashboard
 import streamlit as st
 from datetime import datetime
 
-# Import der Tab-Module
-from tabs import startseite, kistenliste, strafen
 from utils.data_loader import load_data
+from utils import profiling, warmup
 
 # Seitenkonfiguration
 st.set_page_config(
@@ -31,14 +30,6 @@ st.markdown(
         border-radius: 10px;
         box-shadow: 0 2px 4px rgba(0,0,0,0.1);
     }
-    .stTabs [data-baseweb="tab-list"] {
-        gap: 24px;
-        width: 100%;
-    }
-    .stTabs [data-baseweb="tab"] {
-        flex-grow: 1;
-        text-align: center;
-    }
 
     h1 {
         color: #1f2937;
@@ -52,6 +43,14 @@ st.markdown(
 
 def main():
     """Hauptfunktion der App"""
+    # Caches einmal pro Prozess im Hintergrund aufwärmen und aktuell halten
+    warmup.start()
+
+    # Diagnose-Messungen für diesen Rerun (?profile=1 oder FCM_PROFILE=1)
+    profiling.start_run(
+        enabled=profiling.ENV_ENABLED or st.query_params.get("profile") == "1"
+    )
+
     # Header mit Logo - zentriert
     col1, col_center, col3 = st.columns([1, 2, 1])
     with col_center:
@@ -79,17 +78,30 @@ def main():
 
     st.markdown("---")
 
-    # Tabs erstellen
-    tab1, tab2, tab3 = st.tabs(["🏠 Startseite", "📦 Kistenliste", "⚠️ Strafenkatalog"])
-
-    with tab1:
-        startseite.render()
-
-    with tab2:
-        kistenliste.render()
+    # Navigation: nur der aktive Bereich wird ausgeführt,
+    # die anderen erst beim Öffnen (Seiten in seiten/ rufen die Tab-Module auf)
+    page = st.navigation(
+        [
+            st.Page(
+                "seiten/startseite.py",
+                title="Startseite",
+                icon="🏠",
+                url_path="startseite",
+                default=True,
+            ),
+            st.Page(
+                "seiten/kistenliste.py", title="Kistenliste", icon="📦", url_path="kisten"
+            ),
+            st.Page(
+                "seiten/strafen.py", title="Strafenkatalog", icon="⚠️", url_path="strafen"
+            ),
+            st.Page("seiten/spieler.py", title="Spieler", icon="👤", url_path="spieler"),
+        ],
+        position="top",
+    )
+    page.run()
 
-    with tab3:
-        strafen.render()
+    profiling.render_panel()
 
 
 if __name__ == "__main__":
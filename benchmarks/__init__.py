@@ -0,0 +1,19 @@
+"""
+Benchmarks für das FC Münster 05 Dashboard
+
+Alle Benchmarks arbeiten auf einem eigenen Cache-Verzeichnis (FCM_CACHE_DIR),
+gesetzt bevor utils.cache importiert wird. Sie leeren ihren Cache mit
+shutil.rmtree(CACHE_DIR), .cache/ der App oder ein per FCM_CACHE_DIR
+eingestellter Cache werden so nie gelöscht. Unterprozesse übernehmen das
+Verzeichnis über FCM_BENCH_CACHE_DIR.
+"""
+
+import atexit
+import os
+import shutil
+import tempfile
+
+if "FCM_BENCH_CACHE_DIR" not in os.environ:
+    os.environ["FCM_BENCH_CACHE_DIR"] = tempfile.mkdtemp(prefix="fcm-bench-cache-")
+    atexit.register(shutil.rmtree, os.environ["FCM_BENCH_CACHE_DIR"], ignore_errors=True)
+os.environ["FCM_CACHE_DIR"] = os.environ["FCM_BENCH_CACHE_DIR"]
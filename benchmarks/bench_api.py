@@ -0,0 +1,121 @@
+"""
+JSON-API: erste Abfrage, Wiederholung mit ETag (304) und Änderung der Daten.
+
+Startet den Server lokal auf einem freien Port und fragt alle Endpunkte mit
+urllib ab:
+1. Erste Abfrage: 200, Daten werden geladen und berechnet.
+2. Wiederholung mit "If-None-Match": 304 ohne Body und ohne Neuberechnung.
+3. Nach Austausch der Arbeitsmappen: neuer ETag und 200 mit neuen Daten.
+Prüft außerdem, dass die JSON-Antworten den Funktionen aus data_loader
+entsprechen.
+
+Aufruf: python -m benchmarks.bench_api [--rows 20000] [--polls 50]
+"""
+
+import argparse
+import json
+import os
+import shutil
+import tempfile
+import threading
+import time
+import urllib.error
+import urllib.request
+
+from benchmarks.bench_warmup import _clear_caches, _write_workbooks
+from benchmarks.generate_data import ROOT_DIR
+from utils import api, data_loader
+
+
+def _get(url, etag=None):
+    request = urllib.request.Request(url)
+    if etag:
+        request.add_header("If-None-Match", etag)
+    start = time.perf_counter()
+    try:
+        with urllib.request.urlopen(request) as response:
+            body = response.read()
+            status, headers = response.status, response.headers
+    except urllib.error.HTTPError as e:
+        body, status, headers = e.read(), e.code, e.headers
+    return time.perf_counter() - start, status, headers.get("ETag"), body
+
+
+def _expected(path):
+    kisten = data_loader.load_data()
+    strafen = data_loader.load_strafen_excel()
+    stats = data_loader.get_strafen_stats(strafen)
+    per_person = [
+        {"name": name, "betrag": round(float(amount), 2), "anzahl": int(count)}
+        for name, amount, count in data_loader.calculate_strafen_per_person(
+            strafen
+        ).itertuples(index=False)
+    ]
+    if path == "/api/strafen":
+        return {key: round(float(value), 2) for key, value in stats.items()}
+    if path == "/api/strafen/personen":
+        return per_person
+    if path == "/api/kisten/offen":
+        return [
+            {"name": name, "kisten": float(count)}
+            for name, count in data_loader.create_open_boxes_table(kisten).itertuples(
+                index=False
+            )
+        ]
+    return {
+        "kisten_offen": int((~kisten["Ist_Bezahlt"]).sum()),
+        "betrag_offen": round(float(stats["betrag_offen"]), 2),
+        "schulden": per_person,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=20_000)
+    parser.add_argument("--polls", type=int, default=50)
+    args = parser.parse_args()
+
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as tmp:
+        _write_workbooks(tmp, args.rows, seed=1)
+        for name in (data_loader.KADER_PATH, data_loader.STRAFENKATALOG_PATH):
+            shutil.copy(os.path.join(ROOT_DIR, name), tmp)
+        os.chdir(tmp)
+        _clear_caches()
+        server = api.create_server(port=0)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        base = f"http://127.0.0.1:{server.server_address[1]}"
+        try:
+            print(f"{'Endpunkt':<24} {'erste':>9} {'304':>9} {'Bytes':>8}")
+            etags = {}
+            for path in api.ENDPOINTS:
+                first_s, status, etag, body = _get(base + path)
+                assert status == 200, f"{path}: Status {status}"
+                assert json.loads(body) == _expected(path), f"{path}: abweichende Daten"
+
+                polls = [_get(base + path, etag) for _ in range(args.polls)]
+                assert all(p[1] == 304 and not p[3] for p in polls), f"{path}: kein 304"
+                poll_s = sorted(p[0] for p in polls)[len(polls) // 2]
+                etags[path] = etag
+                print(
+                    f"{path:<24} {first_s * 1000:7.1f}ms {poll_s * 1000:7.2f}ms {len(body):8d}"
+                )
+
+            status = _get(base + "/api/gibtsnicht")[1]
+            assert status == 404, f"unbekannter Endpunkt: Status {status}"
+
+            # Neue Arbeitsmappen: alte ETags dürfen nicht mehr passen
+            _write_workbooks(tmp, args.rows + 100, seed=2)
+            for path, etag in etags.items():
+                _, status, new_etag, body = _get(base + path, etag)
+                assert status == 200 and new_etag != etag, f"{path}: Änderung nicht erkannt"
+                assert json.loads(body) == _expected(path), f"{path}: abweichende Daten"
+            print("✅ 304 bei unveränderten Daten, 200 mit neuem ETag nach Änderung")
+        finally:
+            server.shutdown()
+            server.server_close()
+            os.chdir(cwd)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+"""
+Speicherverhalten der Diagramme unter Dauerlast.
+
+Simuliert viele Reruns (ein Aufruf pro Diagramm und Besucher) und gibt
+den RSS des Prozesses aus. Mit Render-Cache und geschlossenen Figuren
+muss der RSS nach der Aufwärmphase flach bleiben.
+
+Aufruf: python -m benchmarks.bench_chart_memory [--reruns 2000]
+"""
+
+import argparse
+import time
+
+from utils import cache
+from utils.charts import CHART_BUILDERS, render_cache_info, render_chart
+from utils.data_loader import load_data, load_strafen_excel
+from utils.summary import build_summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--reruns", type=int, default=2000)
+    parser.add_argument("--versions", type=int, default=3, help="Anzahl Datenversionen")
+    args = parser.parse_args()
+
+    # Künstliche Versionen nicht in den gemeinsamen Cache schreiben
+    cache.SHARED_ENABLED = False
+    summary = build_summary(load_data(), load_strafen_excel())
+
+    start = time.perf_counter()
+    for i in range(args.reruns):
+        # Gelegentlich neue Datenversion, wie bei Änderungen an der Excel-Datei
+        summary.version = ("bench", i * args.versions // args.reruns)
+        for name in CHART_BUILDERS:
+            render_chart(name, summary)
+        if i % max(args.reruns // 10, 1) == 0:
+            info = render_cache_info()
+            print(
+                f"Rerun {i:>6}: RSS {info['rss'] / 2**20:7.1f} MiB, "
+                f"Cache {info['entries']} Einträge / {info['bytes'] / 1024:.0f} KiB, "
+                f"offene Figuren {info['open_figures']}"
+            )
+
+    info = render_cache_info()
+    elapsed = time.perf_counter() - start
+    print(
+        f"{args.reruns} Reruns in {elapsed:.2f}s, Treffer {info['hits']}, "
+        f"Renderings {info['misses']}, RSS {info['rss'] / 2**20:.1f} MiB"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""
+Ladezeit: Excel parsen, Parquet-Snapshot und kompilierter Stand (Arrow IPC).
+
+Erzeugt synthetische Arbeitsmappen, kompiliert sie und misst für beide
+Ledger das Laden über die drei Wege. Prüft, dass der kompilierte Stand
+dasselbe DataFrame liefert wie der Parquet-Snapshot und dass nach einer Änderung an einer Arbeitsmappe der
+kompilierte Stand ignoriert wird (Rückfall auf Excel).
+
+Aufruf: python -m benchmarks.bench_compiled [--rows 20000 100000]
+"""
+
+import argparse
+import os
+import shutil
+import tempfile
+import time
+
+import pandas as pd
+
+from benchmarks.bench_warmup import _clear_caches, _write_workbooks
+from benchmarks.generate_data import ROOT_DIR
+from utils import compiled, data_loader
+from utils.cache import file_fingerprint, load_snapshot
+
+LEDGERS = {
+    "kistenliste": (data_loader.KISTENLISTE_PATH, data_loader._parse_kistenliste),
+    "strafen": (data_loader.STRAFEN_PATH, data_loader._parse_strafen),
+}
+
+
+def _best_of(func, repeat=3, setup=None):
+    best = float("inf")
+    for _ in range(repeat):
+        if setup:
+            setup()
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def _measure(rows):
+    for name, (path, parse) in LEDGERS.items():
+        fingerprint = file_fingerprint(path)
+        excel_s, _ = _best_of(parse, repeat=1, setup=_clear_caches)
+        snapshot_s, snapshot = _best_of(lambda: load_snapshot(name, fingerprint, parse))
+        compiled_s, loaded = _best_of(
+            lambda: compiled.load_compiled(name, path, fingerprint)
+        )
+        assert loaded is not None, f"{name}: kompilierter Stand nicht geladen"
+        pd.testing.assert_frame_equal(loaded, snapshot)
+        print(
+            f"{rows:>8} {name:<12} {excel_s * 1000:9.1f} {snapshot_s * 1000:9.1f} "
+            f"{compiled_s * 1000:9.1f}"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, nargs="+", default=[20_000])
+    args = parser.parse_args()
+
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as tmp:
+        for name in (data_loader.KADER_PATH, data_loader.STRAFENKATALOG_PATH):
+            shutil.copy(os.path.join(ROOT_DIR, name), tmp)
+        os.chdir(tmp)
+        try:
+            print(f"{'Zeilen':>8} {'Ledger':<12} {'Excel ms':>9} {'Parquet':>9} {'Arrow':>9}")
+            for rows in args.rows:
+                _write_workbooks(tmp, rows, seed=1)
+                compiled.compile_sources()
+                _measure(rows)
+
+            # Geänderte Arbeitsmappe: kompilierter Stand passt nicht mehr
+            _write_workbooks(tmp, args.rows[-1] + 100, seed=2)
+            for name, (path, _) in LEDGERS.items():
+                assert compiled.load_compiled(name, path, file_fingerprint(path)) is None
+            assert set(compiled.compiled_status().values()) == {"veraltet", "aktuell"}
+            print("✅ Identische Daten, veralteter Stand wird ignoriert")
+        finally:
+            os.chdir(cwd)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+"""
+Bereinigung mit Zeilen-Lambdas und object-Spalten gegen die vektorisierte
+Bereinigung mit category/bool/float32.
+
+Misst Bereinigungszeit, Speicher der Ledger (memory_usage(deep=True)) und die
+Laufzeit der nachgelagerten groupbys (DashboardSummary, Strafen pro Person).
+Prüft, dass beide Varianten dieselben Werte liefern.
+
+Aufruf: python -m benchmarks.bench_dtypes [--rows 100000 1000000]
+"""
+
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from benchmarks.bench_incremental import _raw_strafen
+from benchmarks.bench_open_boxes import make_kistenliste
+from utils import data_loader
+from utils.summary import build_summary
+
+
+def clean_kistenliste_legacy(raw):
+    """Bisherige Bereinigung der Kistenliste (apply pro Zeile, object-Spalten)."""
+    df = raw.copy()
+    df["Name"] = df["Name"].str.strip()
+    df["Bezahlt"] = df["Bezahlt"].fillna("").str.strip()
+    df["Bezahlt_Status"] = df["Bezahlt"].apply(
+        lambda x: "Bezahlt" if x == "J" else "Offen"
+    )
+    return df
+
+
+def clean_strafen_legacy(raw):
+    """Bisherige Bereinigung der Strafen (apply pro Zeile, object-Spalten)."""
+    df = raw.dropna(subset=["Was?", "Wer?"], how="all").copy()
+    df["Termin"] = data_loader.parse_termin(df["Termin"])
+    df["Wer?"] = df["Wer?"].str.strip()
+    df["Bezahlt_Status"] = df["Bezahlt?"].apply(
+        lambda x: "Bezahlt" if x == 1 else "Offen"
+    )
+    df["Betrag"] = data_loader.parse_betrag(df["Wie viel?"])
+    return df
+
+
+def _raw_kistenliste(n_rows):
+    raw = make_kistenliste(n_rows).drop(columns="Bezahlt_Status")
+    return raw.astype(object)
+
+
+def _best_of(func, repeat=3):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def _mib(df):
+    return df.memory_usage(deep=True).sum() / 2**20
+
+
+def _assert_equivalent(legacy, compact):
+    for col in legacy.columns:
+        expected = legacy[col]
+        actual = compact[col]
+        if col == "Betrag":
+            assert np.allclose(expected, actual, equal_nan=True), col
+        else:
+            pd.testing.assert_series_equal(
+                expected.astype(object), actual.astype(object), check_names=False
+            )
+    expected_paid = legacy["Bezahlt_Status"] == "Bezahlt"
+    assert (compact["Ist_Bezahlt"].to_numpy() == expected_paid.to_numpy()).all()
+
+
+def run(n_rows):
+    rng = np.random.default_rng(0)
+    raw_kisten = _raw_kistenliste(n_rows)
+    raw_strafen = _raw_strafen(n_rows, rng)
+
+    variants = {
+        "legacy": (clean_kistenliste_legacy, clean_strafen_legacy),
+        "kompakt": (data_loader._clean_kistenliste, data_loader._clean_strafen),
+    }
+    frames = {}
+    for variant, (clean_kisten, clean_strafen) in variants.items():
+        kisten_s, df_kisten = _best_of(lambda: clean_kisten(raw_kisten))
+        strafen_s, df_strafen = _best_of(lambda: clean_strafen(raw_strafen))
+        summary_s, _ = _best_of(lambda: build_summary(df_kisten, df_strafen))
+        per_person_s, _ = _best_of(
+            lambda: data_loader.calculate_strafen_per_person(df_strafen)
+        )
+        frames[variant] = (df_kisten, df_strafen)
+        print(
+            f"{n_rows:>8} Zeilen {variant:<8} "
+            f"Bereinigung {(kisten_s + strafen_s) * 1000:8.1f} ms  "
+            f"Speicher {_mib(df_kisten) + _mib(df_strafen):7.1f} MiB  "
+            f"build_summary {summary_s * 1000:7.1f} ms  "
+            f"Strafen pro Person {per_person_s * 1000:6.1f} ms"
+        )
+
+    for legacy, compact in zip(frames["legacy"], frames["kompakt"]):
+        _assert_equivalent(legacy, compact)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, nargs="+", default=[100_000, 1_000_000])
+    args = parser.parse_args()
+
+    for n_rows in args.rows:
+        run(n_rows)
+    print("✅ Beide Bereinigungen liefern dieselben Werte")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+"""
+Vergleich: pd.read_excel (alle Spalten) gegen den streamenden Reader.
+
+Misst Parse-Zeit und Spitzen-Speicher (tracemalloc) für beide Sheets und
+prüft, dass die bereinigten Daten in den gelesenen Spalten übereinstimmen,
+auch für ein Sheet mit Leerblock mitten in der Liste.
+
+Aufruf: python -m benchmarks.bench_excel_reader [--rows 1000 10000 50000]
+"""
+
+import argparse
+import os
+import tempfile
+import time
+import tracemalloc
+
+import pandas as pd
+from openpyxl import Workbook
+
+from benchmarks.generate_data import generate
+from utils.data_loader import KISTENLISTE_COLUMNS, STRAFEN_COLUMNS, STRAFEN_DTYPES
+from utils.excel_reader import read_sheet
+
+
+def _read_excel(path, sheet_name, columns, dtypes):
+    """Bisheriger Weg: ganzes Sheet lesen, danach Spalten auswählen."""
+    df = pd.read_excel(path, sheet_name=sheet_name)
+    df.columns = df.columns.str.strip()
+    return df.dropna(how="all", subset=columns)[columns].reset_index(drop=True)
+
+
+def _read_stream(path, sheet_name, columns, dtypes):
+    return read_sheet(path, sheet_name, columns, dtypes=dtypes)
+
+
+def _measure(func, *args):
+    # Zeit ohne tracemalloc messen, Spitzen-Speicher in einem zweiten Lauf
+    start = time.perf_counter()
+    result = func(*args)
+    elapsed = time.perf_counter() - start
+
+    tracemalloc.start()
+    func(*args)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, elapsed, peak
+
+
+def _same_values(left, right):
+    return left.astype(str).equals(right.astype(str))
+
+
+def _check_gap(tmp):
+    """
+    Leerblock mitten in der Liste: alle Zeilen danach müssen wie bei
+    pd.read_excel gelesen werden, nur die leeren Zeilen entfallen.
+    """
+    path = os.path.join(tmp, "Luecke.xlsx")
+    wb = Workbook()
+    ws = wb.active
+    ws.title = "Kistenliste"
+    ws.append(KISTENLISTE_COLUMNS)
+    for block in range(3):
+        for i in range(4):
+            ws.append([f"Name {block}-{i}", "Geburtstag", None, "J" if i % 2 else None, None])
+        for _ in range(5):
+            ws.append([None] * len(KISTENLISTE_COLUMNS))
+    wb.save(path)
+
+    old = _read_excel(path, "Kistenliste", KISTENLISTE_COLUMNS, {})
+    new = _read_stream(path, "Kistenliste", KISTENLISTE_COLUMNS, {})
+    assert len(new) == 12, len(new)
+    assert _same_values(old, new), (old, new)
+    print("✅ Leerblock mitten im Sheet: alle 12 Zeilen gelesen, identisch mit read_excel")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, nargs="+", default=[1_000, 10_000, 50_000])
+    parser.add_argument(
+        "--blank-rows",
+        type=int,
+        default=5_000,
+        help="formatierte Leerzeilen am Ende jedes Sheets",
+    )
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        _check_gap(tmp)
+
+    print(
+        f"{'Sheet':<12} {'Zeilen':>8} {'read_excel':>12} {'stream':>10} "
+        f"{'Peak alt':>10} {'Peak neu':>10} {'gleich':>7}"
+    )
+    for n_rows in args.rows:
+        with tempfile.TemporaryDirectory() as tmp:
+            generate(tmp, n_kisten=n_rows, n_strafen=n_rows, blank_rows=args.blank_rows)
+            sheets = [
+                (os.path.join(tmp, "Kistenliste.xlsx"), "Kistenliste", KISTENLISTE_COLUMNS, {}),
+                (
+                    os.path.join(tmp, "Strafenkatalog.xlsx"),
+                    "Tabelle1",
+                    STRAFEN_COLUMNS,
+                    STRAFEN_DTYPES,
+                ),
+            ]
+            for path, sheet_name, columns, dtypes in sheets:
+                old, old_s, old_peak = _measure(_read_excel, path, sheet_name, columns, dtypes)
+                new, new_s, new_peak = _measure(_read_stream, path, sheet_name, columns, dtypes)
+                print(
+                    f"{sheet_name:<12} {n_rows:>8} {old_s:>11.3f}s {new_s:>9.3f}s "
+                    f"{old_peak / 2**20:>8.1f}MB {new_peak / 2**20:>8.1f}MB "
+                    f"{'ja' if _same_values(old, new) else 'NEIN':>7}"
+                )
+
+
+if __name__ == "__main__":
+    main()
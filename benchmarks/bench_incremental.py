@@ -0,0 +1,126 @@
+"""
+Inkrementelle Übernahme gegen kompletten Neuaufbau.
+
+Simuliert den Saisonverlauf: an eine große Liste werden Zeilen angehängt
+und einzelne "Bezahlt"-Zellen umgestellt. Nach jedem Schritt wird geprüft,
+dass Ledger-Frame und Aggregate mit einem kompletten Neuaufbau übereinstimmen.
+Ein Leser-Thread prüft währenddessen, dass snapshot() nie einen halb
+übernommenen Stand liefert.
+
+Aufruf: python -m benchmarks.bench_incremental [--rows 100000] [--steps 5]
+"""
+
+import argparse
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+
+from utils import data_loader
+from utils.incremental import IncrementalLedger
+
+
+def _raw_strafen(n_rows, rng):
+    players = [f"Spieler {i}" for i in range(40)]
+    termin = pd.Timestamp("2025-07-01") + pd.to_timedelta(rng.integers(0, 300, n_rows), "D")
+    return pd.DataFrame(
+        {
+            "Termin": termin.to_pydatetime().astype(object),
+            "Was?": rng.choice(["Ball verloren", "Tunnel im Kreisspiel", "Unnötig gelb"], n_rows),
+            "Wer?": rng.choice(players, n_rows),
+            "Wie viel?": rng.choice(["€ 1,00", "€ 0,50", "€ 5,00"], n_rows),
+            "Bezahlt?": np.where(rng.random(n_rows) < 0.5, 1.0, np.nan),
+        }
+    ).astype({"Termin": object, "Was?": object, "Wer?": object, "Wie viel?": object})
+
+
+def _new_ledger():
+    return IncrementalLedger(
+        data_loader._clean_strafen,
+        data_loader._strafen_contributions,
+        finish=data_loader._finish_strafen,
+    )
+
+
+def _assert_same(incremental, full):
+    pd.testing.assert_frame_equal(incremental.frame, full.frame)
+    for key, value in full.aggregates.items():
+        other = incremental.aggregates[key].reindex(value.index)
+        assert np.allclose(other.to_numpy(dtype=float), value.to_numpy(dtype=float)), key
+
+
+class _Reader(threading.Thread):
+    """Liest laufend snapshot() und vergleicht mit der Zeilenzahl des Fingerprints."""
+
+    def __init__(self, ledger, expected):
+        super().__init__(daemon=True)
+        self.ledger = ledger
+        self.expected = expected
+        self.reads = 0
+        self.errors = []
+        self._done = threading.Event()
+
+    def run(self):
+        while not self._done.wait(0.0005):
+            fingerprint, aggregates = self.ledger.snapshot()
+            if fingerprint is None:
+                continue
+            gesamt = aggregates["gesamt"]
+            open_amount = aggregates["offen_pro_person"]["Offener Betrag (€)"].sum()
+            if gesamt["gesamt"] != self.expected[fingerprint] or not np.isclose(
+                open_amount, gesamt["betrag_offen"]
+            ):
+                self.errors.append(fingerprint)
+            self.reads += 1
+
+    def stop(self):
+        self._done.set()
+        self.join()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--steps", type=int, default=5)
+    parser.add_argument("--append", type=int, default=50, help="neue Zeilen pro Schritt")
+    parser.add_argument("--flips", type=int, default=5, help="umgestellte Bezahlt-Zellen")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    raw = _raw_strafen(args.rows, rng)
+    ledger = _new_ledger()
+    expected = {"start": len(raw)}
+    ledger.update(raw, "start")
+    reader = _Reader(ledger, expected)
+    reader.start()
+
+    for step in range(args.steps):
+        raw = pd.concat([raw, _raw_strafen(args.append, rng)], ignore_index=True)
+        flip = rng.choice(len(raw), args.flips, replace=False)
+        raw.loc[flip, "Bezahlt?"] = np.where(raw.loc[flip, "Bezahlt?"] == 1, np.nan, 1.0)
+
+        expected[f"schritt-{step}"] = len(raw)
+        start = time.perf_counter()
+        ledger.update(raw, f"schritt-{step}")
+        incremental_s = time.perf_counter() - start
+
+        full = _new_ledger()
+        start = time.perf_counter()
+        full.update(raw)
+        full_s = time.perf_counter() - start
+
+        _assert_same(ledger, full)
+        print(
+            f"Schritt {step + 1}: {len(raw)} Zeilen, Modus {ledger.last_mode}, "
+            f"inkrementell {incremental_s * 1000:.1f} ms, Neuaufbau {full_s * 1000:.1f} ms"
+        )
+
+    reader.stop()
+    assert not reader.errors, f"halb übernommene Stände gelesen: {reader.errors[:3]}"
+    print(f"{reader.reads} Lesezugriffe während der Updates, alle konsistent")
+    print("✅ Inkrementeller Stand entspricht dem Neuaufbau")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,417 @@
+"""
+Lasttest: viele gleichzeitige Sessions gegen app.py (Streamlit AppTest).
+
+Jede Session ist ein eigener AppTest in einem eigenen Prozess, wie mehrere
+Server-Prozesse hinter einem Reverse-Proxy: Die Prozesse teilen sich nur
+den Cache auf der Platte (Snapshots, load_shared), Caches im Speicher hat
+jeder für sich. Die Prozesse bleiben über alle Szenarien bestehen, pro
+Szenario starten die Sessions gleichzeitig und spielen typische Abläufe
+durch:
+- "start": App öffnen (Startseite)
+- "tabs": App öffnen, Kistenliste, Strafen, Spieler, zurück zur Startseite
+- "strafen_filter": Strafen öffnen, Person und Status der Detailansicht
+  wechseln
+- "gemischt": zufällige Seitenwechsel und Filter
+Seiten werden über AppTest.switch_page() mit den Dateien in seiten/
+gewechselt. Gemessen werden pro Szenario die Dauer jedes Reruns
+(Perzentile), Reruns pro Sekunde, die Trefferquote der gecachten Funktionen
+(über die Messungen aus utils/profiling.py) und der höchste RSS pro Prozess
+sowie in Summe.
+
+Der Cache liegt wie bei allen Benchmarks in einem Temp-Verzeichnis
+(FCM_CACHE_DIR, siehe benchmarks/__init__.py), .cache/ im
+Arbeitsverzeichnis wird weder gelesen noch gelöscht. Läuft komplett
+offline, mit den echten Arbeitsmappen oder mit --rows auf synthetischen
+(siehe generate_data).
+
+Aufruf: python -m benchmarks.bench_load [--sitzungen 8] [--runden 3] [--rows 20000]
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import queue
+import random
+import shutil
+import sys
+import tempfile
+import threading
+import time
+from collections import Counter
+from datetime import datetime
+
+import numpy as np
+import streamlit as st
+from streamlit.testing.v1 import AppTest
+
+from benchmarks.bench_warmup import _write_workbooks
+from benchmarks.generate_data import ROOT_DIR
+from utils import charts, data_loader, profiling, warmup
+from utils.cache import CACHE_DIR
+
+APP_PATH = os.path.join(ROOT_DIR, "app.py")
+# Seiten relativ zu app.py, die Startseite ist die Standardseite
+PAGES = [
+    "seiten/startseite.py",
+    "seiten/kistenliste.py",
+    "seiten/strafen.py",
+    "seiten/spieler.py",
+]
+STRAFEN_PAGE = "seiten/strafen.py"
+STATUS = ["Alle", "Offen", "Bezahlt"]
+PERCENTILES = [50, 90, 95, 99]
+
+# Weitere Dateien, die die App neben den Arbeitsmappen liest
+STATIC_FILES = [
+    data_loader.KADER_PATH,
+    data_loader.STRAFENKATALOG_PATH,
+    "aliase.json",
+    "icon.png",
+]
+
+
+class Session:
+    """Ein Besucher: eigener AppTest, misst jeden Rerun."""
+
+    def __init__(self, rng, pause):
+        self.app = AppTest.from_file(APP_PATH, default_timeout=300)
+        self.rng = rng
+        self.pause = pause
+        self.latencies = []
+        self.errors = []
+
+    def _run(self, action):
+        if self.pause:
+            time.sleep(self.rng.uniform(0, 2 * self.pause))
+        start = time.perf_counter()
+        try:
+            action()
+        except Exception as e:
+            self.errors.append(repr(e))
+            return
+        self.latencies.append(time.perf_counter() - start)
+        self.errors.extend(str(e.value) for e in self.app.exception)
+        self.errors.extend(str(e.value) for e in self.app.error)
+
+    def open(self):
+        self._run(self.app.run)
+
+    def goto(self, page):
+        self._run(lambda: self.app.switch_page(page).run())
+
+    def filter_strafen(self, person=None, status=None):
+        def action():
+            if person is not None:
+                box = _selectbox(self.app, "Person filtern")
+                box.set_value(person if person in box.options else box.options[0])
+            if status is not None:
+                _selectbox(self.app, "Status filtern").set_value(status)
+            self.app.run()
+
+        self._run(action)
+
+    def persons(self):
+        box = _selectbox(self.app, "Person filtern")
+        return list(box.options) if box is not None else ["Alle"]
+
+
+def _selectbox(app, label):
+    return next((box for box in app.selectbox if box.label == label), None)
+
+
+def scenario_start(session, runden):
+    for _ in range(runden):
+        session.open()
+
+
+def scenario_tabs(session, runden):
+    session.open()
+    for _ in range(runden):
+        for page in PAGES[1:] + PAGES[:1]:
+            session.goto(page)
+
+
+def scenario_strafen_filter(session, runden):
+    session.open()
+    session.goto(STRAFEN_PAGE)
+    persons = session.persons()
+    for _ in range(runden):
+        session.filter_strafen(person=session.rng.choice(persons))
+        session.filter_strafen(status=session.rng.choice(STATUS))
+    session.filter_strafen(person="Alle", status="Alle")
+
+
+def scenario_gemischt(session, runden):
+    session.open()
+    for _ in range(runden * 4):
+        if session.rng.random() < 0.3:
+            session.goto(STRAFEN_PAGE)
+            session.filter_strafen(
+                person=session.rng.choice(session.persons()),
+                status=session.rng.choice(STATUS),
+            )
+        else:
+            session.goto(session.rng.choice(PAGES))
+
+
+SCENARIOS = {
+    "start": scenario_start,
+    "tabs": scenario_tabs,
+    "strafen_filter": scenario_strafen_filter,
+    "gemischt": scenario_gemischt,
+}
+
+
+class _RssSampler(threading.Thread):
+    """Höchster RSS des Prozesses während eines Szenarios."""
+
+    def __init__(self, interval=0.02):
+        super().__init__(daemon=True)
+        self.interval = interval
+        self.peak = profiling.current_rss()
+        self._done = threading.Event()
+
+    def run(self):
+        while not self._done.wait(self.interval):
+            self.peak = max(self.peak, profiling.current_rss())
+
+    def stop(self):
+        self._done.set()
+        self.join()
+        self.peak = max(self.peak, profiling.current_rss())
+
+
+def _cache_stats(log_paths):
+    """Treffer/Misses der gecachten Funktionen aus den Mess-Logs aller Prozesse."""
+    counts = Counter()
+    misses = Counter()
+    for log_path in log_paths:
+        if not os.path.exists(log_path):
+            continue
+        with open(log_path, "r", encoding="utf-8") as f:
+            for line in f:
+                record = json.loads(line)
+                if record.get("cache"):
+                    counts[record["cache"]] += 1
+                    if record["cache"] == "miss":
+                        misses[record["name"]] += 1
+    total = counts["hit"] + counts["miss"]
+    return {
+        "treffer": counts["hit"],
+        "misses": counts["miss"],
+        "trefferquote": round(counts["hit"] / total, 4) if total else None,
+        "misses_pro_funktion": dict(misses.most_common()),
+    }
+
+
+def clear_caches():
+    """Leert die Caches im Speicher dieses Prozesses (kalter Start)."""
+    st.cache_data.clear()
+    st.cache_resource.clear()
+    charts._render_cache.clear()
+    data_loader.KISTEN_LEDGER.reset()
+    data_loader.STRAFEN_LEDGER.reset()
+    data_loader.pin_fingerprints({})
+
+
+def _session_process(nummer, args, log_path, barrier, commands, results):
+    """
+    Ein Prozess pro Session: wartet auf Szenarien (Name, kalt), spielt sie
+    mit einem neuen AppTest durch und meldet Messwerte zurück.
+    """
+    # Messungen ins eigene Log, ohne Diagnose-Panel in der App
+    profiling.ENV_ENABLED = True
+    profiling.LOG_PATH = log_path
+    profiling.render_panel = lambda: None
+    warmup.ENABLED = not args.ohne_warmup
+
+    for name, kalt in iter(commands.get, None):
+        if kalt:
+            clear_caches()
+        if os.path.exists(log_path):
+            os.remove(log_path)
+        session = Session(random.Random(f"{args.seed}-{name}-{nummer}"), args.pause)
+        sampler = _RssSampler()
+        rss_start = profiling.current_rss()
+        sampler.start()
+        barrier.wait()
+        start = time.time()
+        try:
+            SCENARIOS[name](session, args.runden)
+        except Exception as e:
+            session.errors.append(repr(e))
+        end = time.time()
+        sampler.stop()
+        results.put(
+            {
+                "latencies": session.latencies,
+                "errors": session.errors,
+                "start": start,
+                "end": end,
+                "rss_start": rss_start,
+                "rss_peak": sampler.peak,
+            }
+        )
+
+
+def _receive(process, results):
+    """Ergebnis eines Session-Prozesses, Fehler statt Warten, wenn er abbricht."""
+    while True:
+        try:
+            return results.get(timeout=1)
+        except queue.Empty:
+            if not process.is_alive():
+                raise RuntimeError(f"Session-Prozess beendet (Exitcode {process.exitcode})")
+
+
+def run_scenario(name, args, workers, log_paths):
+    """Startet alle Sessions gleichzeitig und wertet das Szenario aus."""
+    if args.kalt:
+        # Temp-Verzeichnis der Benchmarks (siehe benchmarks/__init__.py)
+        shutil.rmtree(CACHE_DIR, ignore_errors=True)
+    for _, commands, _ in workers:
+        commands.put((name, args.kalt))
+    reports = [_receive(process, results) for process, _, results in workers]
+    elapsed = max(r["end"] for r in reports) - min(r["start"] for r in reports)
+
+    latencies = np.array([value for r in reports for value in r["latencies"]])
+    errors = [error for r in reports for error in r["errors"]]
+    peaks = [r["rss_peak"] for r in reports]
+    result = {
+        "szenario": name,
+        "sitzungen": args.sitzungen,
+        "reruns": len(latencies),
+        "sekunden": round(elapsed, 3),
+        "reruns_pro_s": round(len(latencies) / elapsed, 2) if elapsed else None,
+        "latenz_ms": {
+            f"p{p}": round(float(np.percentile(latencies, p)) * 1000, 1) for p in PERCENTILES
+        }
+        if len(latencies)
+        else {},
+        "max_ms": round(float(latencies.max()) * 1000, 1) if len(latencies) else None,
+        "rss_spitze_mib": round(max(peaks) / 2**20, 1),
+        "rss_summe_mib": round(sum(peaks) / 2**20, 1),
+        "rss_zuwachs_mib": round(
+            max(r["rss_peak"] - r["rss_start"] for r in reports) / 2**20, 1
+        ),
+        "cache": _cache_stats(log_paths),
+        "fehler": len(errors),
+        "fehlerbeispiele": sorted(set(errors))[:3],
+    }
+    return result
+
+
+def _print_result(result):
+    latency = result["latenz_ms"]
+    cache = result["cache"]
+    quote = cache["trefferquote"]
+    print(
+        f"{result['szenario']:<15} {result['reruns']:>5} Reruns  "
+        f"{result['reruns_pro_s']:>6.1f}/s  "
+        + "  ".join(f"{key} {value:>7.0f} ms" for key, value in latency.items())
+        + f"  Cache {quote * 100 if quote is not None else float('nan'):5.1f} %"
+        f"  RSS {result['rss_spitze_mib']:7.1f} MiB (+{result['rss_zuwachs_mib']:.1f},"
+        f" Summe {result['rss_summe_mib']:.1f})"
+        f"  Fehler {result['fehler']}",
+        file=sys.stderr,
+    )
+    for error in result["fehlerbeispiele"]:
+        print(f"   ❌ {error[:200]}", file=sys.stderr)
+
+
+def _prepare_data(tmp, rows):
+    """Synthetische Arbeitsmappen plus Kader, Katalog, Aliase und Logo."""
+    _write_workbooks(tmp, rows, seed=1)
+    for name in STATIC_FILES:
+        if os.path.exists(os.path.join(ROOT_DIR, name)):
+            shutil.copy(os.path.join(ROOT_DIR, name), tmp)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sitzungen", type=int, default=8, help="gleichzeitige Sessions")
+    parser.add_argument("--runden", type=int, default=3, help="Wiederholungen pro Ablauf")
+    parser.add_argument(
+        "--szenarien", nargs="+", choices=list(SCENARIOS), default=list(SCENARIOS)
+    )
+    parser.add_argument(
+        "--rows", type=int, help="synthetische Arbeitsmappen mit so vielen Zeilen"
+    )
+    parser.add_argument(
+        "--pause", type=float, default=0.0, help="mittlere Denkpause zwischen Klicks (s)"
+    )
+    parser.add_argument(
+        "--kalt", action="store_true", help="Caches vor jedem Szenario leeren"
+    )
+    parser.add_argument(
+        "--ohne-warmup", action="store_true", help="kein Warm-up-Thread (FCM_WARMUP=0)"
+    )
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="JSON-Datei für die Ergebnisse (sonst stdout)")
+    args = parser.parse_args()
+
+    cwd = os.getcwd()
+    context = multiprocessing.get_context("spawn")
+    with tempfile.TemporaryDirectory() as tmp:
+        if args.rows:
+            data_dir = os.path.join(tmp, "daten")
+            os.mkdir(data_dir)
+            _prepare_data(data_dir, args.rows)
+            os.chdir(data_dir)
+        else:
+            os.chdir(ROOT_DIR)
+        barrier = context.Barrier(args.sitzungen)
+        log_paths = [
+            os.path.join(tmp, f"messungen-{i}.jsonl") for i in range(args.sitzungen)
+        ]
+        workers = []
+        for i in range(args.sitzungen):
+            commands, results = context.Queue(), context.Queue()
+            process = context.Process(
+                target=_session_process,
+                args=(i, args, log_paths[i], barrier, commands, results),
+                daemon=True,
+            )
+            workers.append((process, commands, results))
+
+        results = []
+        try:
+            for process, _, _ in workers:
+                process.start()
+            for name in args.szenarien:
+                print(f"⏱️  {name} mit {args.sitzungen} Sessions ...", file=sys.stderr)
+                result = run_scenario(name, args, workers, log_paths)
+                _print_result(result)
+                results.append(result)
+        finally:
+            for _, commands, _ in workers:
+                commands.put(None)
+            for process, _, _ in workers:
+                process.join(timeout=30)
+                if process.is_alive():
+                    process.terminate()
+            os.chdir(cwd)
+
+    report = {
+        "zeitpunkt": datetime.now().isoformat(timespec="seconds"),
+        "parameter": {
+            "sitzungen": args.sitzungen,
+            "runden": args.runden,
+            "rows": args.rows,
+            "pause": args.pause,
+            "kalt": args.kalt,
+            "warmup": not args.ohne_warmup,
+        },
+        "ergebnisse": results,
+    }
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+    else:
+        json.dump(report, sys.stdout, indent=2, ensure_ascii=False)
+        print()
+
+
+if __name__ == "__main__":
+    main()
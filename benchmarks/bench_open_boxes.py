@@ -0,0 +1,136 @@
+"""
+Benchmark und Äquivalenzprüfung für create_open_boxes_table.
+
+Vergleicht die vektorisierte Implementierung mit der bisherigen
+iterrows()-Variante auf synthetischen Kistenlisten.
+
+Aufruf: python -m benchmarks.bench_open_boxes [--rows 10000 100000 1000000]
+"""
+
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from utils.data_loader import create_open_boxes_table
+
+
+def create_open_boxes_table_legacy(df):
+    """
+    Bisherige Implementierung mit iterrows() - dient als Referenz.
+    """
+    open_df = df[df["Bezahlt_Status"] == "Offen"].copy()
+    name_counts = {}
+
+    for _, row in open_df.iterrows():
+        name = str(row["Name"]).strip()
+
+        if name.lower() in ("geteilte kiste", "geteilte kisten"):
+            anmerkung = str(row.get("Anmerkung", ""))
+            if anmerkung and anmerkung != "nan":
+                shared_names = [n.strip() for n in anmerkung.split(",") if n.strip()]
+                fraction = 1.0 / len(shared_names) if shared_names else 0
+                for shared_name in shared_names:
+                    name_counts[shared_name] = (
+                        name_counts.get(shared_name, 0) + fraction
+                    )
+        else:
+            name_counts[name] = name_counts.get(name, 0) + 1.0
+
+    if name_counts:
+        result = pd.DataFrame(
+            list(name_counts.items()), columns=["Name", "Offene Kisten"]
+        )
+        result = result.sort_values("Offene Kisten", ascending=False)
+        result["Offene Kisten"] = result["Offene Kisten"].round(2)
+        return result
+    else:
+        return pd.DataFrame({"Name": [], "Offene Kisten": []})
+
+
+def make_kistenliste(n_rows, n_players=40, shared_ratio=0.1, paid_ratio=0.6, seed=0):
+    """
+    Erzeugt eine synthetische Kistenliste im Format von load_data().
+    """
+    rng = np.random.default_rng(seed)
+    players = np.array([f"Spieler {i}" for i in range(n_players)], dtype=object)
+
+    names = players[rng.integers(0, n_players, n_rows)]
+    shared = rng.random(n_rows) < shared_ratio
+    # Beide Schreibweisen aus den echten Listen
+    names[shared] = rng.choice(["Geteilte Kiste", "Geteilte Kisten"], shared.sum())
+
+    anmerkung = np.full(n_rows, np.nan, dtype=object)
+    for i in np.flatnonzero(shared):
+        k = rng.integers(0, 5)
+        anmerkung[i] = ", ".join(rng.choice(players, k, replace=False)) if k else np.nan
+
+    bezahlt = np.where(rng.random(n_rows) < paid_ratio, "J", "")
+    return pd.DataFrame(
+        {
+            "Name": names,
+            "Grund": "Geburtstag",
+            "Bezahlt": bezahlt,
+            "Anmerkung": anmerkung,
+            "Bezahlt_Status": np.where(bezahlt == "J", "Bezahlt", "Offen"),
+        }
+    )
+
+
+def assert_equivalent(df):
+    """
+    Prüft, dass beide Implementierungen dieselbe Tabelle liefern.
+    """
+    # Gleichstände sortiert die Referenz zufällig, die App nach Name
+    expected = create_open_boxes_table_legacy(df).sort_values(
+        ["Offene Kisten", "Name"], ascending=[False, True], kind="stable"
+    )
+    actual = create_open_boxes_table(df)
+    pd.testing.assert_frame_equal(
+        actual.astype({"Name": object}),
+        expected.astype({"Name": object}),
+        check_index_type=False,
+    )
+
+
+def _time(func, df, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(df)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument(
+        "--legacy-max-rows",
+        type=int,
+        default=100_000,
+        help="iterrows()-Referenz nur bis zu dieser Zeilenzahl messen",
+    )
+    args = parser.parse_args()
+
+    # Äquivalenz auf kleinen Daten inkl. Randfällen prüfen
+    for seed in range(5):
+        assert_equivalent(make_kistenliste(2_000, shared_ratio=0.3, seed=seed))
+    print("✅ Vektorisierte Variante liefert identische Ergebnisse")
+
+    print(f"{'Zeilen':>10} {'iterrows (s)':>14} {'vektorisiert (s)':>18} {'Faktor':>8}")
+    for n_rows in args.rows:
+        df = make_kistenliste(n_rows)
+        vectorized = _time(create_open_boxes_table, df, args.repeat)
+        if n_rows <= args.legacy_max_rows:
+            assert_equivalent(df)
+            legacy = _time(create_open_boxes_table_legacy, df, 1)
+            print(f"{n_rows:>10} {legacy:>14.3f} {vectorized:>18.4f} {legacy / vectorized:>7.1f}x")
+        else:
+            print(f"{n_rows:>10} {'-':>14} {vectorized:>18.4f} {'-':>8}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""
+Übertragene Datenmenge und Laufzeit der seitenweisen Detailansicht.
+
+Baut die Strafen-Detailansicht für eine große (mehrere Saisons) synthetische
+Strafenliste und vergleicht die Arrow-Größe der kompletten Tabelle mit der
+einer Seite. Misst Suche, Sortierung und Seitenwechsel und prüft die
+Ergebnisse gegen eine einfache pandas-Umsetzung.
+
+Aufruf: python -m benchmarks.bench_pagination [--rows 20000 200000] [--page-size 50]
+"""
+
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from benchmarks.bench_incremental import _raw_strafen
+from utils import data_loader
+from utils.pagination import paginate, payload_bytes
+
+
+def _best_of(func, repeat=5):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def _naive(table, termin, search, sort_by, ascending, page, page_size):
+    rows = table
+    if search:
+        mask = rows["Was?"].astype(str).str.contains(search, case=False, regex=False)
+        mask |= rows["Wer?"].astype(str).str.contains(search, case=False, regex=False)
+        rows = rows[mask]
+    if sort_by == "Termin":
+        keys = termin.loc[rows.index]
+        rows = rows.loc[keys.sort_values(ascending=ascending, kind="stable").index]
+    elif sort_by:
+        rows = rows.sort_values(
+            sort_by, ascending=ascending, kind="stable", key=lambda s: s.astype(str)
+        )
+    start = (page - 1) * page_size
+    return rows.iloc[start : start + page_size].astype(object), len(rows)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, nargs="+", default=[20_000, 200_000])
+    parser.add_argument("--page-size", type=int, default=50)
+    args = parser.parse_args()
+
+    cases = [
+        ("erste Seite", dict(page=1)),
+        ("Seite 5", dict(page=5)),
+        ("Suche 'tunnel'", dict(search="tunnel")),
+        ("Datum absteigend", dict(sort_by="Termin", ascending=False)),
+        ("Person, Seite 3", dict(sort_by="Wer?", page=3)),
+    ]
+
+    print(f"{'Zeilen':>8} {'Fall':<18} {'ms':>7} {'Seite KiB':>10} {'komplett KiB':>13}")
+    for rows in args.rows:
+        raw = _raw_strafen(rows, np.random.default_rng(1))
+        df = data_loader._finish_strafen(data_loader._clean_strafen(raw))
+        detail = data_loader.build_strafen_detail(df)
+        table, termin = detail["table"], detail["termin"]
+        full_kib = payload_bytes(table) / 1024
+
+        for label, options in cases:
+            options = dict(dict(page=1, sort_by=None, ascending=True, search=""), **options)
+            seconds, (page, total) = _best_of(
+                lambda: paginate(
+                    table,
+                    page_size=args.page_size,
+                    search_columns=["Was?", "Wer?"],
+                    sort_keys={"Termin": termin},
+                    **options,
+                )
+            )
+            expected, expected_total = _naive(
+                table, termin, page_size=args.page_size, **options
+            )
+            assert total == expected_total, f"{label}: {total} != {expected_total}"
+            pd.testing.assert_frame_equal(page.astype(object), expected)
+            print(
+                f"{rows:>8} {label:<18} {seconds * 1000:7.1f} "
+                f"{payload_bytes(page) / 1024:10.1f} {full_kib:13.1f}"
+            )
+    print("✅ Seiten identisch mit pandas (Suche, Sortierung, Seitenwahl)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""
+Renderzeit und Bildgröße des Personen-Diagramms bei vielen Personen.
+
+Erzeugt synthetische Zählungen pro Person und vergleicht das Diagramm mit
+allen Personen (top_n=None) gegen die Top-N-Ansicht mit "Andere". Prüft,
+dass die Top N plus "Andere" dieselben Summen ergeben wie alle Personen.
+
+Aufruf: python -m benchmarks.bench_person_chart [--people 50 200 1000]
+"""
+
+import argparse
+import io
+import time
+
+import numpy as np
+import pandas as pd
+
+from utils.charts import PERSON_CHART_TOP_N, create_person_chart, top_people
+from utils.summary import DashboardSummary
+
+
+def _summary(people, rng):
+    bezahlt = rng.integers(0, 8, people)
+    offen = rng.integers(0, 8, people)
+    per_person = pd.DataFrame(
+        {"Bezahlt": bezahlt, "Offen": offen, "Gesamt": bezahlt + offen},
+        index=pd.Index([f"Person {i}" for i in range(people)], name="Name"),
+    )
+    per_person = per_person.sort_values("Gesamt", ascending=False, kind="stable")
+    summary = DashboardSummary()
+    summary.kisten_pro_person = per_person
+    summary.personen = people
+    return summary
+
+
+def _render(summary, top_n):
+    import matplotlib.pyplot as plt
+
+    start = time.perf_counter()
+    fig = create_person_chart(summary, top_n=top_n)
+    buf = io.BytesIO()
+    fig.savefig(buf, format="png", dpi=100)
+    plt.close(fig)
+    return time.perf_counter() - start, buf.tell()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--people", type=int, nargs="+", default=[50, 200, 1000])
+    parser.add_argument("--top", type=int, default=PERSON_CHART_TOP_N)
+    args = parser.parse_args()
+
+    import matplotlib
+
+    matplotlib.use("Agg")
+    rng = np.random.default_rng(1)
+
+    print(f"{'Personen':>9} {'Modus':<8} {'ms':>8} {'PNG KiB':>9}")
+    for people in args.people:
+        summary = _summary(people, rng)
+        shown = top_people(summary.kisten_pro_person, args.top)
+        assert len(shown) <= args.top + 1
+        pd.testing.assert_series_equal(
+            shown.sum(), summary.kisten_pro_person[["Bezahlt", "Offen", "Gesamt"]].sum()
+        )
+        for label, top_n in (("alle", None), (f"top {args.top}", args.top)):
+            seconds, size = _render(summary, top_n)
+            print(f"{people:>9} {label:<8} {seconds * 1000:8.1f} {size / 1024:9.1f}")
+    print("✅ Top N plus Andere ergeben dieselben Summen")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+"""
+Spieler-Index: einmaliger Aufbau gegen Durchsuchen beider Ledger pro Profil.
+
+Erzeugt große Ledger mit unterschiedlichen Schreibweisen der Kader-Namen
+(Vorname, Nachname, voller Name, Groß-/Kleinschreibung, geteilte Kisten)
+und vergleicht die Kennzahlen aus dem Index mit einer Zeile-für-Zeile-
+Zuordnung über beide Ledger.
+
+Aufruf: python -m benchmarks.bench_player_index [--rows 100000]
+"""
+
+import argparse
+import os
+import time
+
+import numpy as np
+import pandas as pd
+
+from benchmarks.generate_data import ROOT_DIR
+from utils import data_loader
+from utils.identity import build_player_index, name_keys, resolve_name
+
+SPELLINGS = [
+    lambda p: p.vorname,
+    lambda p: p.nachname,
+    lambda p: f"{p.vorname} {p.nachname}",
+    lambda p: f"  {p.vorname.upper()}  {p.nachname} ",
+]
+
+
+def _ledgers(kader, rows, rng):
+    players = list(kader.itertuples(index=False))
+    names = [spell(p) for p in players for spell in SPELLINGS] + ["Unbekannt", "Geteilte Kiste"]
+    kisten_names = rng.choice(names, rows)
+    shared = kisten_names == "Geteilte Kiste"
+    anmerkung = np.where(
+        shared,
+        [", ".join(rng.choice([p.nachname for p in players], 3)) for _ in range(rows)],
+        None,
+    )
+    raw_kisten = pd.DataFrame(
+        {
+            "Name": kisten_names,
+            "Grund": "Geburtstag",
+            "Bezahlt": np.where(rng.random(rows) < 0.5, "J", None),
+            "Anmerkung": anmerkung,
+        }
+    ).astype(object)
+    raw_strafen = pd.DataFrame(
+        {
+            "Termin": "14.09.2025",
+            "Was?": "Zu spät",
+            "Wer?": rng.choice(names[:-1], rows),
+            "Wie viel?": rng.choice(["€ 1,00", "€ 0,50", "€ 5,00"], rows),
+            "Bezahlt?": np.where(rng.random(rows) < 0.5, 1.0, np.nan),
+        }
+    ).astype(object)
+    kisten = data_loader._finish_kistenliste(data_loader._clean_kistenliste(raw_kisten))
+    strafen = data_loader._finish_strafen(data_loader._clean_strafen(raw_strafen))
+    return kisten, strafen
+
+
+def _scan(kader, kisten, strafen, nummer):
+    """Profil eines Spielers durch Zuordnen jeder einzelnen Zeile."""
+    keys = name_keys(kader)
+    kisten_count, open_boxes = 0, 0.0
+    for name, paid, note in zip(kisten["Name"], kisten["Ist_Bezahlt"], kisten["Anmerkung"]):
+        if str(name).strip().lower() == "geteilte kiste":
+            parts = [part.strip() for part in str(note).split(",")]
+            share = sum(resolve_name(part, keys)[0] == nummer for part in parts)
+            open_boxes += 0 if paid else share / len(parts)
+        elif resolve_name(name, keys)[0] == nummer:
+            kisten_count += 1
+            open_boxes += 0 if paid else 1
+    mask = [resolve_name(name, keys)[0] == nummer for name in strafen["Wer?"]]
+    rows = strafen[mask]
+    return {
+        "Kisten": kisten_count,
+        "Offene Kisten": round(open_boxes, 2),
+        "Strafen": len(rows),
+        "Offener Betrag (€)": rows.loc[~rows["Ist_Bezahlt"], "Betrag"].sum(),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--players", type=int, default=3, help="geprüfte Profile")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    kader = pd.read_json(os.path.join(ROOT_DIR, "kader.json"))
+    kisten, strafen = _ledgers(kader, args.rows, rng)
+
+    start = time.perf_counter()
+    index = build_player_index(kader, kisten, strafen)
+    build_s = time.perf_counter() - start
+    print(f"Aufbau: {args.rows} Zeilen pro Ledger in {build_s * 1000:.1f} ms")
+
+    # Eindeutige Vornamen/Nachnamen, damit jede Schreibweise zugeordnet wird
+    numbers = [n for n in index["spieler"].index if n in (1, 7, 10, 20, 27)][: args.players]
+    for nummer in numbers:
+        start = time.perf_counter()
+        profile = index["spieler"].loc[nummer]
+        lookup_s = time.perf_counter() - start
+
+        start = time.perf_counter()
+        expected = _scan(kader, kisten, strafen, nummer)
+        scan_s = time.perf_counter() - start
+
+        for key, value in expected.items():
+            assert np.isclose(profile[key], value), (nummer, key, profile[key], value)
+        print(
+            f"Nr. {nummer:>2}: Index {lookup_s * 1e6:7.1f} µs, "
+            f"Durchsuchen {scan_s * 1000:8.1f} ms"
+        )
+
+    unmatched = index["nicht_zugeordnet"]
+    assert "Unbekannt" in set(unmatched["Name"]), unmatched
+    assert unmatched["Name"].is_unique, unmatched
+    print(f"Nicht zugeordnet: {len(unmatched)} Namen ({', '.join(unmatched['Name'].astype(str))})")
+    print("✅ Kennzahlen aus dem Index identisch mit dem Durchsuchen der Ledger")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+"""
+Preisprüfung: vektorisierte Regeln gegen Prüfen Zeile für Zeile.
+
+Erzeugt eine große Strafenliste aus dem echten strafenkatalog.json mit
+Schreibvarianten ("<5min", "2x", "*"), Staffeln (">15 min") und einigen
+falschen Beträgen und vergleicht check_prices() mit einer Schleife, die
+pro Person und Regel mitzählt.
+
+Aufruf: python -m benchmarks.bench_pricing [--rows 200000]
+"""
+
+import argparse
+import os
+import time
+
+import numpy as np
+import pandas as pd
+
+from benchmarks.generate_data import ROOT_DIR
+from utils.identity import normalize_name
+from utils.pricing import (
+    PRUEFUNG_ABWEICHUNG,
+    _price_table,
+    check_prices,
+    compile_katalog,
+    katalog_keys,
+    resolve_vergehen,
+)
+
+VARIANTS = [
+    "Zu spät Spiel >15 min",
+    "Zu spät Spiel >15 min 2x",
+    "Zu spät Spiel <5min",
+    "Tunnel im Kreisspiel 2x",
+    "Unnötiger Schuss und nicht im Sprint hinterhergehen *",
+    "Ball verloren",
+    "Unnötig rot",
+    "Sachen vergessen",
+]
+
+
+def _ledger(katalog, rows, rng):
+    vergehen = list(katalog["Vergehen"]) + VARIANTS
+    days = pd.Timestamp("2025-07-01") + pd.to_timedelta(rng.integers(0, 300, rows), "D")
+    termin = pd.Series(days).where(rng.random(rows) > 0.01)
+    df = pd.DataFrame(
+        {
+            "Termin": termin,
+            "Was?": rng.choice(vergehen, rows),
+            "Wer?": rng.choice([f"Spieler {i}" for i in range(40)], rows),
+        }
+    )
+    # Erwartete Beträge aus der Referenz, ein Teil absichtlich falsch
+    df["Betrag"] = _reference(df, compile_katalog(katalog))
+    wrong = rng.random(rows) < 0.02
+    df.loc[wrong, "Betrag"] = df.loc[wrong, "Betrag"].fillna(0) + 0.5
+    df["Betrag"] = df["Betrag"].fillna(0).astype("float32")
+    return df.sort_values("Termin", ascending=False, kind="stable")
+
+
+def _reference(df, regeln):
+    """Erwarteter Betrag Zeile für Zeile, Vergehen pro Person/Regel mitgezählt."""
+    keys = katalog_keys(regeln)
+    prices = _price_table(regeln)
+    seen = {}
+    expected = pd.Series(np.nan, index=df.index)
+    order = df.assign(_na=df["Termin"].isna(), _pos=np.arange(len(df)))
+    order = order.sort_values(["_na", "Termin", "_pos"])
+    for index, was, wer in zip(order.index, order["Was?"], order["Wer?"]):
+        regel, count = resolve_vergehen(was, keys)
+        if regel is None:
+            continue
+        key = (normalize_name(wer), regel)
+        total = 0.0
+        for _ in range(count):
+            seen[key] = seen.get(key, 0) + 1
+            stage = seen[key] if seen[key] in prices.columns else 0
+            total += prices.at[regel, stage]
+        expected[index] = total
+    return expected
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=200_000)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    katalog = pd.read_json(os.path.join(ROOT_DIR, "strafenkatalog.json"))
+    df = _ledger(katalog, args.rows, rng)
+
+    start = time.perf_counter()
+    regeln = compile_katalog(katalog)
+    result = check_prices(df, regeln)
+    vector_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    expected = _reference(df, regeln)
+    loop_s = time.perf_counter() - start
+
+    assert np.allclose(result["Erwartet"], expected, equal_nan=True)
+    flagged = result["Prüfung"] == PRUEFUNG_ABWEICHUNG
+    wrong = ~np.isclose(df["Betrag"], expected.fillna(0), atol=0.005) & expected.notna()
+    assert (flagged == wrong).all()
+    print(
+        f"{args.rows} Zeilen: vektorisiert {vector_s * 1000:.1f} ms, "
+        f"Zeile für Zeile {loop_s:.2f} s ({loop_s / vector_s:.0f}x)"
+    )
+    print(result["Prüfung"].value_counts(sort=False).to_string())
+    print("✅ Erwartete Beträge und Abweichungen identisch mit der Zeilenprüfung")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+"""
+Rangliste: laufend gepflegter Index gegen erneutes Zählen.
+
+Simuliert den Saisonverlauf auf einer großen Kistenliste: Zeilen werden
+angehängt und Kisten bezahlt. Nach jedem Schritt übernimmt der
+RankingIndex nur die geänderten Personen aus den Ledger-Aggregaten. Geprüft
+wird gegen pandas (rank mit method="min" bzw. "dense") auf der kompletten
+Liste, inklusive Rang-Abfragen einzelner Personen und der Top N.
+
+Aufruf: python -m benchmarks.bench_ranking [--rows 200000] [--players 500] [--steps 5]
+"""
+
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from utils import data_loader
+from utils.incremental import IncrementalLedger
+from utils.ranking import RankingIndex
+
+
+def _raw_kisten(n_rows, players, rng):
+    # Schiefe Verteilung, damit es viele Gleichstände und einige Spitzenreiter gibt
+    weights = 1.0 / np.arange(1, len(players) + 1)
+    return pd.DataFrame(
+        {
+            "Name": rng.choice(players, n_rows, p=weights / weights.sum()),
+            "Grund": rng.choice(["Geburtstag", "Erstes Tor", "Rote Karte"], n_rows),
+            "Bezahlt": np.where(rng.random(n_rows) < 0.5, "J", None),
+            "Anmerkung": None,
+        }
+    ).astype(object)
+
+
+def _expected(df, method):
+    counts = df["Name"].dropna().astype(object).value_counts()
+    ranks = counts.rank(method="min" if method == "competition" else "dense", ascending=False)
+    expected = pd.DataFrame(
+        {
+            "Rang": ranks.astype(int).to_numpy(),
+            "Name": counts.index.to_numpy(),
+            "Anzahl Kisten": counts.to_numpy(),
+        }
+    )
+    return expected.sort_values(["Rang", "Name"]).reset_index(drop=True)
+
+
+def _check(ranking, df):
+    for method in ("competition", "dense"):
+        expected = _expected(df, method)
+        table = ranking.table(method)
+        pd.testing.assert_frame_equal(
+            table[["Rang", "Name", "Anzahl Kisten"]], expected, check_dtype=False
+        )
+        # Gleichstände teilen sich die Medaille
+        medals = table.groupby("Rang")["Medaille"].nunique()
+        assert (medals == 1).all(), method
+        for _, row in expected.sample(min(20, len(expected)), random_state=0).iterrows():
+            assert ranking.rank(row["Name"], method) == row["Rang"], (method, row["Name"])
+        top = ranking.top(3, method)
+        pd.testing.assert_frame_equal(
+            top[["Rang", "Name", "Anzahl Kisten"]],
+            expected[expected["Rang"] <= 3],
+            check_dtype=False,
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=200_000)
+    parser.add_argument("--players", type=int, default=500)
+    parser.add_argument("--steps", type=int, default=5)
+    parser.add_argument("--append", type=int, default=20, help="neue Zeilen pro Schritt")
+    parser.add_argument("--pays", type=int, default=5, help="bezahlte Kisten pro Schritt")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    players = [f"Spieler {i}" for i in range(args.players)]
+    raw = _raw_kisten(args.rows, players, rng)
+    ledger = IncrementalLedger(
+        data_loader._clean_kistenliste,
+        data_loader._kisten_contributions,
+        finish=data_loader._finish_kistenliste,
+    )
+    df = ledger.update(raw)
+    ranking = RankingIndex()
+    ranking.sync(ledger.aggregates["kisten_pro_name"])
+    _check(ranking, df)
+
+    for step in range(args.steps):
+        raw = pd.concat([raw, _raw_kisten(args.append, players, rng)], ignore_index=True)
+        open_rows = np.flatnonzero(raw["Bezahlt"].isna().to_numpy())
+        raw.loc[rng.choice(open_rows, args.pays, replace=False), "Bezahlt"] = "J"
+        df = ledger.update(raw)
+
+        start = time.perf_counter()
+        changed = ranking.sync(ledger.aggregates["kisten_pro_name"])
+        sync_s = time.perf_counter() - start
+
+        start = time.perf_counter()
+        data_loader.create_ranking_table(df)
+        full_s = time.perf_counter() - start
+
+        start = time.perf_counter()
+        ranking.rank(players[-1])
+        query_s = time.perf_counter() - start
+
+        _check(ranking, df)
+        print(
+            f"Schritt {step + 1}: {len(raw)} Zeilen, {changed} Personen geändert, "
+            f"sync {sync_s * 1000:.2f} ms, Neuzählung {full_s * 1000:.1f} ms, "
+            f"Rang-Abfrage {query_s * 1e6:.1f} µs"
+        )
+
+    print("✅ Ränge identisch mit pandas (competition und dense, Top N, Abfragen)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+"""
+Gemeinsamer Cache mehrerer Server-Prozesse (wie hinter einem Reverse-Proxy).
+
+Startet mehrere Prozesse gleichzeitig auf denselben Arbeitsmappen. Jeder
+Prozess macht einen kompletten ersten Aufruf (Quellen, Summary,
+Strafen-Detailansicht, Diagramme) und zählt, wie oft er selbst geparst,
+berechnet oder gerendert hat. Mit gemeinsamem Cache muss jede Arbeit über
+alle Prozesse genau einmal passieren (pro Diagramm einmal rendern), ohne
+berechnet jeder Prozess Summary und Diagramme selbst (die Parquet-Snapshots
+der Quellen werden in beiden Fällen geteilt).
+Danach werden die Arbeitsmappen ausgetauscht und der Lauf wiederholt.
+
+Aufruf: python -m benchmarks.bench_shared_cache [--rows 20000] [--workers 4]
+"""
+
+import argparse
+import multiprocessing
+import os
+import shutil
+import tempfile
+import time
+from collections import Counter
+
+from benchmarks.bench_warmup import _session, _write_workbooks
+from benchmarks.generate_data import ROOT_DIR
+from utils.cache import CACHE_DIR
+from utils.charts import CHART_BUILDERS
+
+
+def _count_calls(counter, module, name):
+    func = getattr(module, name)
+
+    def counted(*args, **kwargs):
+        counter[name] += 1
+        return func(*args, **kwargs)
+
+    setattr(module, name, counted)
+
+
+def _worker(directory, shared, barrier, results):
+    from utils import cache, charts, data_loader, summary
+
+    os.chdir(directory)
+    cache.SHARED_ENABLED = shared
+    counter = Counter()
+    _count_calls(counter, data_loader, "_parse_kistenliste")
+    _count_calls(counter, data_loader, "_parse_strafen")
+    _count_calls(counter, data_loader, "build_strafen_detail")
+    _count_calls(counter, summary, "build_summary")
+    _count_calls(counter, charts, "_render")
+
+    barrier.wait()
+    start = time.perf_counter()
+    _session()
+    results.put((time.perf_counter() - start, dict(counter)))
+
+
+def _run(directory, workers, shared):
+    context = multiprocessing.get_context("spawn")
+    barrier = context.Barrier(workers)
+    results = context.Queue()
+    processes = [
+        context.Process(target=_worker, args=(directory, shared, barrier, results))
+        for _ in range(workers)
+    ]
+    for process in processes:
+        process.start()
+    outcomes = [results.get() for _ in processes]
+    for process in processes:
+        process.join()
+
+    total = Counter()
+    for _, counts in outcomes:
+        total.update(counts)
+    return max(seconds for seconds, _ in outcomes), total
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=20_000)
+    parser.add_argument("--workers", type=int, default=4)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for name in (
+            os.path.join(ROOT_DIR, "kader.json"),
+            os.path.join(ROOT_DIR, "strafenkatalog.json"),
+        ):
+            shutil.copy(name, tmp)
+
+        print(f"{'':<28} {'langsamster':>11}  Arbeit (Summe aller Prozesse)")
+        for label, shared, seed in (
+            ("ohne gemeinsamen Cache", False, 1),
+            ("mit gemeinsamem Cache", True, 1),
+            ("nach Änderung, gemeinsam", True, 2),
+        ):
+            if seed == 1:
+                shutil.rmtree(os.path.join(tmp, CACHE_DIR), ignore_errors=True)
+                _write_workbooks(tmp, args.rows, seed=seed)
+            else:
+                _write_workbooks(tmp, args.rows + 100, seed=seed)
+
+            seconds, total = _run(tmp, args.workers, shared)
+            work = ", ".join(f"{name} {count}" for name, count in sorted(total.items()))
+            print(f"{label:<28} {seconds * 1000:9.0f}ms  {work}")
+            if shared:
+                expected = {name: 1 for name in total}
+                expected["_render"] = len(CHART_BUILDERS)
+                assert total == expected, f"{label}: Arbeit mehrfach erledigt: {dict(total)}"
+        print(f"✅ Mit {args.workers} Prozessen wurde jede Arbeit genau einmal erledigt")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""
+Kaltstart-Benchmark: Importzeit und Zeit bis zum ersten Rendern.
+
+Jede Messung läuft in einem frischen Python-Prozess, damit nichts aus
+sys.modules oder den Streamlit-Caches übernommen wird. Gemessen werden
+- Import der Tab-Module (wie app.py) und ob matplotlib dabei geladen wird
+- erster vollständiger Lauf von app.py (Startseite) über AppTest
+
+Aufruf: python -m benchmarks.bench_startup [--runs 5]
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+IMPORT_PROBE = """
+import json, sys, time
+start = time.perf_counter()
+from tabs import startseite, kistenliste, strafen
+elapsed = time.perf_counter() - start
+print(json.dumps({"sekunden": elapsed, "matplotlib": "matplotlib" in sys.modules,
+                  "seaborn": "seaborn" in sys.modules}))
+"""
+
+FIRST_RENDER_PROBE = """
+import json, time
+start = time.perf_counter()
+from streamlit.testing.v1 import AppTest
+at = AppTest.from_file("app.py", default_timeout=120)
+at.run()
+elapsed = time.perf_counter() - start
+print(json.dumps({"sekunden": elapsed, "fehler": len(at.exception)}))
+"""
+
+
+def _run_probe(code):
+    result = subprocess.run(
+        [sys.executable, "-c", code],
+        cwd=ROOT_DIR,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    imports = [_run_probe(IMPORT_PROBE) for _ in range(args.runs)]
+    renders = [_run_probe(FIRST_RENDER_PROBE) for _ in range(args.runs)]
+
+    report = {
+        "import_tabs_median_s": statistics.median(r["sekunden"] for r in imports),
+        "matplotlib_beim_import": imports[0]["matplotlib"],
+        "seaborn_beim_import": imports[0]["seaborn"],
+        "erstes_rendern_median_s": statistics.median(r["sekunden"] for r in renders),
+        "fehler_beim_rendern": sum(r["fehler"] for r in renders),
+    }
+    print(json.dumps(report, indent=2, ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""
+SQLite-Speicher gegen pandas für Abfragen über mehrere Saisons.
+
+Importiert mehrere synthetische Saisons in eine temporäre Datenbank und
+vergleicht "offene Strafen von Person X" und die Aggregate pro Person und
+Grund: einmal als SQL-Abfrage, einmal auf dem komplett geladenen DataFrame
+aller Saisons. Prüft, dass beide Wege dieselben Ergebnisse liefern.
+
+Aufruf: python -m benchmarks.bench_storage [--rows 100000] [--seasons 5]
+"""
+
+import argparse
+import os
+import tempfile
+import time
+from contextlib import closing
+
+import numpy as np
+import pandas as pd
+
+from benchmarks.bench_incremental import _raw_strafen
+from utils import data_loader, storage
+
+
+def _best_of(func, repeat=5):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def _pandas_open_fines(df, season, person):
+    rows = df[(df["Saison"] == season) & (df["Wer?"] == person) & ~df["Ist_Bezahlt"]]
+    return rows.sort_values("Termin", ascending=False, kind="stable")
+
+
+def _pandas_per_person(df, season):
+    rows = df[(df["Saison"] == season) & ~df["Ist_Bezahlt"]]
+    return rows.groupby("Wer?", observed=True)["Betrag"].sum().round(2)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=100_000, help="Strafen pro Saison")
+    parser.add_argument("--seasons", type=int, default=5)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    season_names = [f"{2020 + i}/{(21 + i) % 100:02d}" for i in range(args.seasons)]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db = os.path.join(tmp, "bench.sqlite")
+        frames = []
+        with closing(storage.connect(db)) as conn:
+            start = time.perf_counter()
+            for season in season_names:
+                df = data_loader._finish_strafen(
+                    data_loader._clean_strafen(_raw_strafen(args.rows, rng))
+                )
+                storage.import_strafen(conn, season, df, fingerprint=season)
+                frames.append(df.assign(Saison=season))
+            import_s = time.perf_counter() - start
+
+            all_seasons = pd.concat(frames, ignore_index=True)
+            season = season_names[-1]
+            person = all_seasons["Wer?"].iloc[0]
+
+            sql_s, sql_rows = _best_of(
+                lambda: storage.strafen(conn, season, person=person, status="Offen")
+            )
+            pandas_s, pandas_rows = _best_of(
+                lambda: _pandas_open_fines(all_seasons, season, person)
+            )
+            sql_agg_s, sql_agg = _best_of(lambda: storage.strafen_pro_person(conn, season))
+            pandas_agg_s, pandas_agg = _best_of(
+                lambda: _pandas_per_person(all_seasons, season)
+            )
+
+        assert len(sql_rows) == len(pandas_rows)
+        assert np.allclose(sql_rows["Betrag"], pandas_rows["Betrag"])
+        sql_agg = sql_agg.set_index("Name")["Offener Betrag (€)"].sort_index()
+        assert np.allclose(sql_agg, pandas_agg.rename(index=str).sort_index())
+
+        frame_mib = all_seasons.memory_usage(deep=True).sum() / 2**20
+        db_mib = os.path.getsize(db) / 2**20
+
+    total = args.rows * args.seasons
+    print(f"{args.seasons} Saisons, {total} Strafen, Import {import_s:.1f} s")
+    print(f"DataFrame im Speicher {frame_mib:7.1f} MiB, SQLite-Datei {db_mib:7.1f} MiB")
+    print(f"Offene Strafen einer Person   SQL {sql_s * 1000:7.1f} ms  pandas {pandas_s * 1000:7.1f} ms")
+    print(f"Offener Betrag pro Person     SQL {sql_agg_s * 1000:7.1f} ms  pandas {pandas_agg_s * 1000:7.1f} ms")
+    print("✅ SQL und pandas liefern dieselben Ergebnisse")
+
+
+if __name__ == "__main__":
+    main()
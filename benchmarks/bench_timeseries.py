@@ -0,0 +1,116 @@
+"""
+Zeitreihen: vorberechnete Tagessummen gegen Resampling und Masken.
+
+Baut für eine große synthetische Strafenliste die Zeitreihen, hängt wie im
+Saisonverlauf Zeilen an und prüft nach jedem Schritt, dass die laufend
+gepflegten Tagessummen des Ledgers einer Neuberechnung entsprechen. Wochen-,
+Monats- und Zeitraumsummen sowie die per Binärsuche gefilterten Zeilen
+werden mit pandas (resample, boolesche Masken) verglichen.
+
+Aufruf: python -m benchmarks.bench_timeseries [--rows 200000] [--steps 3]
+"""
+
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from benchmarks.bench_incremental import _new_ledger, _raw_strafen
+from utils import timeseries
+from utils.timeseries import build_timeseries, strafen_pro_tag, termin_range, window
+
+
+def _best_of(func, repeat=5):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def _resampled(df, freq):
+    """Summen pro Zeitraum wie bisher: jedes Mal aus dem kompletten Frame."""
+    frame = pd.DataFrame(
+        {
+            "Strafen": 1.0,
+            "Betrag": df["Betrag"].to_numpy(dtype=float),
+            "Offener Betrag": np.where(df["Ist_Bezahlt"], 0.0, df["Betrag"]),
+        },
+        index=df["Termin"],
+    )
+    return frame[frame.index.notna()].resample(freq).sum()
+
+
+def _check(ts, df, rng):
+    monat = _resampled(df, "MS")
+    # Betrag ist im Ledger float32, daher nicht bitgenau
+    pd.testing.assert_frame_equal(
+        ts["monat"][monat.columns],
+        monat,
+        check_names=False,
+        check_freq=False,
+        check_dtype=False,
+        check_index_type=False,
+        check_exact=False,
+    )
+    woche = _resampled(df, "W-SUN")
+    assert np.allclose(ts["woche"]["Betrag"].to_numpy(), woche["Betrag"].to_numpy())
+
+    days = df["Termin"].dropna()
+    for _ in range(20):
+        von, bis = np.sort(rng.choice(days.to_numpy(), 2))
+        mask = (df["Termin"] >= von) & (df["Termin"] <= bis)
+        start, stop = termin_range(df["Termin"], von, bis)
+        pd.testing.assert_frame_equal(df.iloc[start:stop], df[mask])
+        sums = window(ts, von, bis)
+        assert np.isclose(sums["Betrag"], df.loc[mask, "Betrag"].astype(float).sum())
+        assert sums["Strafen"] == mask.sum()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=200_000)
+    parser.add_argument("--steps", type=int, default=3)
+    parser.add_argument("--append", type=int, default=100, help="neue Zeilen pro Schritt")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    raw = _raw_strafen(args.rows, rng)
+    ledger = _new_ledger()
+    df = ledger.update(raw)
+
+    for step in range(args.steps):
+        raw = pd.concat([raw, _raw_strafen(args.append, rng)], ignore_index=True)
+        df = ledger.update(raw)
+
+        # Laufend gepflegt gegen komplett neu berechnet
+        incremental = ledger.aggregates["pro_tag"].sort_index()
+        full = strafen_pro_tag(df)
+        assert np.allclose(incremental.reindex(full.index).to_numpy(), full.to_numpy())
+
+        build_s, ts = _best_of(lambda: build_timeseries(incremental, pd.DataFrame()))
+        resample_s, _ = _best_of(lambda: (_resampled(df, "W-SUN"), _resampled(df, "MS")))
+        _check(ts, df, rng)
+
+        von, bis = df["Termin"].quantile([0.4, 0.6])
+        search_s, _ = _best_of(lambda: termin_range(df["Termin"], von, bis))
+        mask_s, _ = _best_of(lambda: df[(df["Termin"] >= von) & (df["Termin"] <= bis)])
+        window_s, _ = _best_of(lambda: window(ts, von, bis))
+        print(
+            f"Schritt {step + 1}: {len(df)} Zeilen, {len(ts['tage'])} Tage | "
+            f"Aufbau aus Tagessummen {build_s * 1000:.1f} ms, "
+            f"Resampling {resample_s * 1000:.1f} ms | "
+            f"Zeitraum: Binärsuche {search_s * 1e6:.0f} µs, Maske {mask_s * 1000:.1f} ms, "
+            f"Summen {window_s * 1e6:.0f} µs"
+        )
+
+    age = timeseries.open_age(ts, df["Termin"].max())
+    open_amount = df.loc[~df["Ist_Bezahlt"], "Betrag"].astype(float).sum()
+    assert np.isclose(age["Offener Betrag"].sum(), open_amount)
+    print("✅ Tagessummen, Wochen/Monate, Zeiträume und Alter offener Strafen stimmen")
+
+
+if __name__ == "__main__":
+    main()
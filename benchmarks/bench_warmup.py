@@ -0,0 +1,144 @@
+"""
+Erster Aufruf nach dem Start mit und ohne Warm-up, Auslieferung während
+eines Neuaufbaus.
+
+1. Kalt: die Session lädt Quellen, Summary, Detailansicht und Diagramme selbst.
+2. Warm: warmup.rebuild() läuft vorher, die Session trifft nur noch Caches.
+3. Watcher: die Arbeitsmappen werden ausgetauscht. Während der Neuaufbau
+   läuft, bekommt die Session weiter die alte Version (ohne zu warten),
+   danach die neue.
+
+Der Warm-up wird für den Benchmark eingeschaltet (auch bei FCM_WARMUP=0),
+auf Neuaufbauten wird höchstens --timeout Sekunden gewartet.
+
+Aufruf: python -m benchmarks.bench_warmup [--rows 20000] [--timeout 300]
+"""
+
+import argparse
+import os
+import shutil
+import statistics
+import tempfile
+import time
+
+from benchmarks.generate_data import ROOT_DIR, generate
+from utils import charts, data_loader, summary, warmup
+from utils.cache import CACHE_DIR
+
+
+def _session():
+    """Alles, was ein Besucher beim ersten Aufruf aller Seiten braucht."""
+    dashboard = summary.load_summary()
+    for name in charts.CHART_BUILDERS:
+        charts.render_chart(name, dashboard)
+    data_loader.load_strafen_detail()
+    data_loader.load_kader()
+    data_loader.load_strafenkatalog()
+    data_loader.load_open_boxes()
+    return dashboard.version
+
+
+def _clear_caches():
+    for func in (
+        data_loader._load_kistenliste,
+        data_loader._load_strafen,
+        data_loader._load_json,
+        data_loader._load_strafen_detail,
+        summary._load_summary,
+    ):
+        func.clear()
+    charts._render_cache.clear()
+    data_loader.KISTEN_LEDGER.reset()
+    data_loader.STRAFEN_LEDGER.reset()
+    data_loader.pin_fingerprints({})
+    shutil.rmtree(CACHE_DIR, ignore_errors=True)
+
+
+def _wait_for_builds(count, timeout, during=None):
+    """Wartet, bis der Watcher count Neuaufbauten fertig hat, ruft solange during() auf."""
+    deadline = time.monotonic() + timeout
+    while warmup.status()["aufbauten"] < count:
+        if time.monotonic() > deadline:
+            raise TimeoutError(
+                f"Kein {count}. Neuaufbau nach {timeout} s (Status: {warmup.status()})"
+            )
+        if during is not None:
+            during()
+        time.sleep(0.05)
+
+
+def _timed(func):
+    start = time.perf_counter()
+    result = func()
+    return time.perf_counter() - start, result
+
+
+def _write_workbooks(target_dir, rows, seed):
+    # Erst in ein eigenes Verzeichnis schreiben, dann atomar austauschen
+    with tempfile.TemporaryDirectory(dir=target_dir) as tmp:
+        generate(tmp, n_kisten=rows, n_strafen=rows, seed=seed)
+        for name in (data_loader.KISTENLISTE_PATH, data_loader.STRAFEN_PATH):
+            os.replace(os.path.join(tmp, name), os.path.join(target_dir, name))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=20_000)
+    parser.add_argument(
+        "--timeout", type=float, default=300, help="max. Wartezeit auf einen Neuaufbau (s)"
+    )
+    args = parser.parse_args()
+
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as tmp:
+        _write_workbooks(tmp, args.rows, seed=1)
+        for name in (data_loader.KADER_PATH, data_loader.STRAFENKATALOG_PATH):
+            shutil.copy(os.path.join(ROOT_DIR, name), tmp)
+        os.chdir(tmp)
+        try:
+            _clear_caches()
+            cold_s, _ = _timed(_session)
+
+            _clear_caches()
+            warmup_s, _ = _timed(lambda: warmup.rebuild(warmup.current_fingerprints()))
+            warm_s, _ = _timed(_session)
+
+            print(f"Erster Aufruf ohne Warm-up  {cold_s * 1000:8.1f} ms")
+            print(f"Warm-up im Hintergrund      {warmup_s * 1000:8.1f} ms")
+            print(f"Erster Aufruf nach Warm-up  {warm_s * 1000:8.1f} ms")
+
+            # Watcher: Version 1 ist freigegeben, Dateien werden ausgetauscht
+            _clear_caches()
+            warmup.ENABLED = True
+            warmup.WATCH_INTERVAL = 0.1
+            warmup.start()
+            _wait_for_builds(1, args.timeout)
+            old_version = _session()
+
+            _write_workbooks(tmp, args.rows + 100, seed=2)
+            latencies, versions = [], []
+
+            def measure():
+                seconds, version = _timed(_session)
+                latencies.append(seconds)
+                versions.append(version)
+
+            _wait_for_builds(2, args.timeout, during=measure)
+            new_version = _session()
+
+            stale = sum(version == old_version for version in versions)
+            assert new_version != old_version, "neue Version wurde nicht freigegeben"
+            assert all(v in (old_version, new_version) for v in versions)
+            print(
+                f"Während des Neuaufbaus: {stale}/{len(versions)} Aufrufe mit altem Stand, "
+                f"Median {statistics.median(latencies) * 1000:.1f} ms, "
+                f"max. {max(latencies, default=0) * 1000:.1f} ms, "
+                f"Neuaufbau {warmup.status()['dauer_s']:.2f} s"
+            )
+            print("✅ Alter Stand wurde bis zur Freigabe der neuen Version ausgeliefert")
+        finally:
+            os.chdir(cwd)
+
+
+if __name__ == "__main__":
+    main()
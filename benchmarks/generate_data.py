@@ -0,0 +1,218 @@
+"""
+Erzeugt synthetische Kistenliste.xlsx und Strafenkatalog.xlsx.
+
+Die Dateien haben dieselben Sheets und Spalten wie die echten Dateien
+(inkl. Leerzeichen in Namen und Spaltenköpfen, gemischten Datumsformaten,
+Beträgen als Text und der "Ergebnis"-Zeile am Ende der Strafen).
+
+Aufruf: python -m benchmarks.generate_data OUT_DIR [--kisten 10000] [--strafen 10000]
+"""
+
+import argparse
+import json
+import os
+import random
+from datetime import datetime, timedelta
+
+from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import PatternFill
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SAISON_START = datetime(2025, 7, 1)
+
+KISTEN_GRUENDE = [
+    "Geburtstag",
+    "Debüt",
+    "1. Tor",
+    "Kapitän",
+    "Sieg Borussia",
+    "Heimsieg",
+    "Wette gegen Kunde",
+    "MBT vergessen",
+    "Kegeln verloren",
+    "Abschlussspiel verloren (Training)",
+    "Erstes Spiel zu Null",
+    "Debüt Pflicht Spiel",
+]
+
+
+def load_players(n_players, kader_path=os.path.join(ROOT_DIR, "kader.json")):
+    """
+    Spielernamen aus kader.json, bei Bedarf mit generierten Namen aufgefüllt.
+    """
+    players = []
+    try:
+        with open(kader_path, "r", encoding="utf-8") as f:
+            players = [f"{p['vorname']} {p['nachname']}" for p in json.load(f)]
+    except (OSError, KeyError, ValueError):
+        pass
+    players = players[:n_players]
+    players += [f"Spieler {i}" for i in range(len(players), n_players)]
+    return players
+
+
+def load_catalog(catalog_path=os.path.join(ROOT_DIR, "strafenkatalog.json")):
+    """
+    (Vergehen, Betrag) aus strafenkatalog.json, nur Einträge mit Eurobetrag.
+    """
+    try:
+        with open(catalog_path, "r", encoding="utf-8") as f:
+            entries = json.load(f)
+    except (OSError, ValueError):
+        return [("Tunnel im Kreisspiel", 0.5), ("Ball verloren", 1.0)]
+
+    catalog = []
+    for entry in entries:
+        try:
+            amount = float(entry["Strafe"].replace("€", "").strip())
+        except (KeyError, ValueError):
+            continue
+        catalog.append((entry["Vergehen"], amount))
+    return catalog
+
+
+def _random_date(rng):
+    return SAISON_START + timedelta(days=rng.randrange(300))
+
+
+def _format_euro(amount):
+    return f"€ {amount:.2f}".replace(".", ",")
+
+
+def _append_blank_rows(ws, n_rows, n_columns):
+    """Formatierte, aber leere Zeilen - wie sie Kassenwarte gern stehen lassen."""
+    fill = PatternFill("solid", fgColor="FFF2CC")
+    for _ in range(n_rows):
+        row = []
+        for _ in range(n_columns):
+            cell = WriteOnlyCell(ws, value=None)
+            cell.fill = fill
+            row.append(cell)
+        ws.append(row)
+
+
+def write_kistenliste(
+    path, n_rows, players, shared_ratio=0.1, paid_ratio=0.5, rng=None, blank_rows=0
+):
+    """
+    Schreibt Kistenliste.xlsx mit Sheet "Kistenliste" (und "Häufigkeit").
+    """
+    rng = rng or random.Random(0)
+    short_names = [p.split()[0] for p in players]
+
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet("Kistenliste")
+    ws.append(["Name", "Grund", "Datum", "Bezahlt", "Anmerkung"])
+
+    for _ in range(n_rows):
+        datum = _random_date(rng)
+        # Wie in der echten Datei: teils Text, teils echtes Datum
+        datum = datum.strftime("%d.%m.%Y") if rng.random() < 0.4 else datum
+        bezahlt = "J" if rng.random() < paid_ratio else None
+
+        if rng.random() < shared_ratio:
+            k = rng.randint(2, 5)
+            anmerkung = ", ".join(rng.sample(short_names, min(k, len(short_names))))
+            ws.append(["Geteilte Kisten", rng.choice(KISTEN_GRUENDE), datum, bezahlt, anmerkung])
+        else:
+            name = rng.choice(short_names) + (" " if rng.random() < 0.3 else "")
+            ws.append([name, rng.choice(KISTEN_GRUENDE), datum, bezahlt, None])
+
+    _append_blank_rows(ws, blank_rows, 5)
+
+    ws_count = wb.create_sheet("Häufigkeit")
+    ws_count.append([None, None])
+    ws_count.append(["Name", "Anzahl von Name"])
+
+    wb.save(path)
+
+
+def write_strafenkatalog(
+    path, n_rows, players, catalog, paid_ratio=0.5, rng=None, blank_rows=0
+):
+    """
+    Schreibt Strafenkatalog.xlsx mit Sheet "Tabelle1".
+    """
+    rng = rng or random.Random(1)
+
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet("Tabelle1")
+    ws.append(["Termin", "Was?", "Wer? ", "Wie viel?", "Bezahlt? ", "Bemerkung"])
+
+    total = 0.0
+    for _ in range(n_rows):
+        termin = _random_date(rng)
+        termin = f"{termin.month}/{termin.day}/{termin.year}" if rng.random() < 0.5 else termin
+        vergehen, amount = rng.choice(catalog)
+        total += amount
+        bezahlt = 1 if rng.random() < paid_ratio else None
+        ws.append([termin, vergehen, rng.choice(players), _format_euro(amount), bezahlt, None])
+
+    # Leerer Block und Summenzeile wie in der echten Datei
+    for _ in range(3):
+        ws.append([None] * 6)
+    ws.append(["Ergebnis", None, None, _format_euro(total), None, None])
+    _append_blank_rows(ws, blank_rows, 6)
+
+    wb.save(path)
+
+
+def generate(
+    out_dir,
+    n_kisten=1000,
+    n_strafen=1000,
+    n_players=30,
+    shared_ratio=0.1,
+    paid_ratio=0.5,
+    seed=0,
+    blank_rows=0,
+):
+    """
+    Schreibt beide Arbeitsmappen nach out_dir und gibt die Pfade zurück.
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    rng = random.Random(seed)
+    players = load_players(n_players)
+
+    kisten_path = os.path.join(out_dir, "Kistenliste.xlsx")
+    strafen_path = os.path.join(out_dir, "Strafenkatalog.xlsx")
+    write_kistenliste(
+        kisten_path, n_kisten, players, shared_ratio, paid_ratio, rng, blank_rows
+    )
+    write_strafenkatalog(
+        strafen_path, n_strafen, players, load_catalog(), paid_ratio, rng, blank_rows
+    )
+    return kisten_path, strafen_path
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("out_dir")
+    parser.add_argument("--kisten", type=int, default=1000, help="Zeilen Kistenliste")
+    parser.add_argument("--strafen", type=int, default=1000, help="Zeilen Strafen")
+    parser.add_argument("--players", type=int, default=30)
+    parser.add_argument("--shared-ratio", type=float, default=0.1)
+    parser.add_argument("--paid-ratio", type=float, default=0.5)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "--blank-rows", type=int, default=0, help="formatierte Leerzeilen am Ende"
+    )
+    args = parser.parse_args()
+
+    paths = generate(
+        args.out_dir,
+        args.kisten,
+        args.strafen,
+        args.players,
+        args.shared_ratio,
+        args.paid_ratio,
+        args.seed,
+        args.blank_rows,
+    )
+    for path in paths:
+        print(f"✅ {path} geschrieben")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,179 @@
+"""
+Benchmark-Runner für Loader, Aggregationen und Diagramme.
+
+Erzeugt pro Skalierung synthetische Arbeitsmappen (siehe generate_data),
+misst alle Hot-Path-Funktionen und schreibt die Ergebnisse als JSON,
+damit Regressionen zwischen Versionen verglichen werden können.
+
+Aufruf: python -m benchmarks.run_benchmarks [--scales 1000 10000 50000] [--output results.json]
+"""
+
+import argparse
+import json
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+import matplotlib.pyplot as plt
+import pandas as pd
+
+from benchmarks.generate_data import generate
+from utils import charts, data_loader
+from utils.cache import CACHE_DIR
+from utils.summary import build_summary
+
+
+def _clear_caches():
+    data_loader._load_kistenliste.clear()
+    data_loader._load_strafen.clear()
+    shutil.rmtree(CACHE_DIR, ignore_errors=True)
+
+
+def _best_of(func, repeat, setup=None):
+    best = float("inf")
+    for _ in range(repeat):
+        if setup:
+            setup()
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def _chart(builder, summary):
+    def run():
+        plt.close(builder(summary))
+
+    return run
+
+
+def run_scale(n_rows, args):
+    """
+    Misst alle Funktionen für eine Skalierung und gibt die Ergebnisse zurück.
+    """
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        generate(
+            tmp,
+            n_kisten=n_rows,
+            n_strafen=n_rows,
+            n_players=args.players,
+            shared_ratio=args.shared_ratio,
+            paid_ratio=args.paid_ratio,
+        )
+
+        cwd = os.getcwd()
+        os.chdir(tmp)
+        try:
+            # Loader kalt (Excel parsen) und warm (Snapshot von der Platte)
+            cold = [
+                ("load_data", data_loader.load_data),
+                ("load_strafen_excel", data_loader.load_strafen_excel),
+            ]
+            for name, func in cold:
+                results.append(
+                    (name + "[kalt]", _best_of(func, args.repeat, setup=_clear_caches))
+                )
+                results.append(
+                    (
+                        name + "[snapshot]",
+                        _best_of(
+                            func,
+                            args.repeat,
+                            setup=lambda: (
+                                data_loader._load_kistenliste.clear(),
+                                data_loader._load_strafen.clear(),
+                            ),
+                        ),
+                    )
+                )
+
+            df_kisten = data_loader.load_data()
+            df_strafen = data_loader.load_strafen_excel()
+            summary = build_summary(df_kisten, df_strafen)
+
+            hot_path = [
+                ("create_open_boxes_table", lambda: data_loader.create_open_boxes_table(df_kisten)),
+                ("create_ranking_table", lambda: data_loader.create_ranking_table(df_kisten)),
+                (
+                    "calculate_strafen_per_person",
+                    lambda: data_loader.calculate_strafen_per_person(df_strafen),
+                ),
+                ("get_strafen_stats", lambda: data_loader.get_strafen_stats(df_strafen)),
+                ("build_summary", lambda: build_summary(df_kisten, df_strafen)),
+            ]
+            hot_path += [
+                (builder.__name__, _chart(builder, summary))
+                for builder in charts.CHART_BUILDERS.values()
+            ]
+            for name, func in hot_path:
+                results.append((name, _best_of(func, args.repeat)))
+        finally:
+            _clear_caches()
+            os.chdir(cwd)
+
+    return [
+        {"funktion": name, "zeilen": n_rows, "sekunden": round(seconds, 6)}
+        for name, seconds in results
+    ]
+
+
+def _git_revision():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--scales", type=int, nargs="+", default=[1_000, 10_000, 50_000])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--players", type=int, default=30)
+    parser.add_argument("--shared-ratio", type=float, default=0.1)
+    parser.add_argument("--paid-ratio", type=float, default=0.5)
+    parser.add_argument("--output", help="JSON-Datei für die Ergebnisse (sonst stdout)")
+    args = parser.parse_args()
+
+    results = []
+    for n_rows in args.scales:
+        print(f"⏱️  {n_rows} Zeilen ...", file=sys.stderr)
+        results += run_scale(n_rows, args)
+
+    report = {
+        "zeitpunkt": datetime.now().isoformat(timespec="seconds"),
+        "git": _git_revision(),
+        "python": platform.python_version(),
+        "pandas": pd.__version__,
+        "parameter": {
+            "repeat": args.repeat,
+            "players": args.players,
+            "shared_ratio": args.shared_ratio,
+            "paid_ratio": args.paid_ratio,
+        },
+        "ergebnisse": results,
+    }
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+    else:
+        json.dump(report, sys.stdout, indent=2, ensure_ascii=False)
+        print()
+
+    for row in results:
+        print(f"{row['funktion']:<35} {row['zeilen']:>8} {row['sekunden']:>10.4f}s", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,46 @@
+"""
+Kompiliert alle Quellen in einen schnell ladbaren Datenstand (Arrow IPC)
+
+Liest Kistenliste.xlsx, Strafenkatalog.xlsx, kader.json und
+strafenkatalog.json, prüft und bereinigt sie und schreibt sie mit Manifest
+nach kompiliert/. Die App lädt diesen Stand per Memory-Mapping statt Excel
+und JSON zu parsen, solange er zu den Quelldateien passt (sonst wie bisher
+direkt aus den Quellen, siehe utils/compiled.py).
+
+Aufruf: python compile_data.py [--ausgabe kompiliert] [--status]
+"""
+
+import argparse
+import sys
+
+from utils.compiled import COMPILED_DIR, compile_sources, compiled_status
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--ausgabe", default=COMPILED_DIR, help="Zielverzeichnis")
+    parser.add_argument(
+        "--status", action="store_true", help="nur anzeigen, ob der Stand aktuell ist"
+    )
+    args = parser.parse_args()
+
+    if args.status:
+        for name, status in compiled_status(args.ausgabe).items():
+            print(f"{name:<16} {status}")
+        return
+
+    try:
+        manifest, notes = compile_sources(args.ausgabe)
+    except Exception as e:
+        print(f"❌ Kompilieren fehlgeschlagen: {e}", file=sys.stderr)
+        sys.exit(1)
+
+    for name, entry in manifest["tabellen"].items():
+        print(f"{name:<16} {entry['zeilen']:>7} Zeilen  {entry['bytes'] / 1024:8.1f} KiB")
+        for note in notes.get(name, []):
+            print(f"   ⚠️ {note}")
+    print(f"✅ {args.ausgabe}/ geschrieben")
+
+
+if __name__ == "__main__":
+    main()
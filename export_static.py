@@ -0,0 +1,36 @@
+"""
+Statischer Export der Mannschaftskasse (ohne Streamlit-Session pro Besucher)
+
+Rechnet Kennzahlen und Diagramme einmal und schreibt index.html, JSON-Dateien
+und Diagramme mit Inhalts-Hash im Dateinamen. Teile, deren Quelldateien sich
+nicht geändert haben, werden übersprungen (siehe utils/static_export.py).
+
+Aufruf: python export_static.py [--ausgabe site] [--alles]
+"""
+
+import argparse
+import sys
+
+from utils.static_export import DEFAULT_OUT_DIR, export_bundle
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--ausgabe", default=DEFAULT_OUT_DIR, help="Zielverzeichnis")
+    parser.add_argument("--alles", action="store_true", help="alle Teile neu bauen")
+    args = parser.parse_args()
+
+    try:
+        result = export_bundle(args.ausgabe, force=args.alles)
+    except Exception as e:
+        print(f"❌ Export fehlgeschlagen: {e}", file=sys.stderr)
+        sys.exit(1)
+
+    for name, status in result.items():
+        print(f"{name:<25} {status}")
+    built = sum(status == "neu" for status in result.values())
+    print(f"✅ {args.ausgabe}/: {built} von {len(result)} Dateien neu geschrieben")
+
+
+if __name__ == "__main__":
+    main()
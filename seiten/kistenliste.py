@@ -0,0 +1,7 @@
+"""
+Seite Kistenliste: Einstiegspunkt für st.navigation
+"""
+
+from tabs import kistenliste
+
+kistenliste.render()
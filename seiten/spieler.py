@@ -0,0 +1,7 @@
+"""
+Seite Spieler: Einstiegspunkt für st.navigation
+"""
+
+from tabs import spieler
+
+spieler.render()
@@ -0,0 +1,7 @@
+"""
+Seite Startseite: Einstiegspunkt für st.navigation
+"""
+
+from tabs import startseite
+
+startseite.render()
@@ -0,0 +1,7 @@
+"""
+Seite Strafenkatalog: Einstiegspunkt für st.navigation
+"""
+
+from tabs import strafen
+
+strafen.render()
@@ -2,6 +2,6 @@
 Tabs Package für FC Münster 05 Dashboard
 """
 
-from . import startseite, kistenliste, strafen
+from . import startseite, kistenliste, strafen, spieler
 
-__all__ = ["startseite", "kistenliste", "strafen"]
+__all__ = ["startseite", "kistenliste", "strafen", "spieler"]
@@ -2,11 +2,16 @@
 Kistenliste Tab - Detaillierte Statistiken und Diagramme
 """
 
+import pandas as pd
 import streamlit as st
-from utils.data_loader import load_data, create_open_boxes_table, create_ranking_table
-from utils.charts import create_person_chart, create_payment_chart, create_reasons_chart
+from utils.data_loader import load_data, load_open_boxes, load_ranking, load_timeseries
+from utils.summary import load_summary
+from utils.charts import PERSON_CHART_TOP_N, render_chart
+from utils.pagination import render_paginated_table
+from utils.profiling import profiled
 
 
+@profiled(name="kistenliste.render")
 def render():
     """Rendert die Kistenliste mit allen Statistiken und Diagrammen"""
     
@@ -16,28 +21,26 @@ def render():
     if df is None:
         st.stop()
 
-    # Statistiken berechnen
-    bezahlt_count = len(df[df["Bezahlt_Status"] == "Bezahlt"])
-    offen_count = len(df[df["Bezahlt_Status"] == "Offen"])
-    personen_count = df["Name"].nunique()
+    # Statistiken (einmal pro Datenversion berechnet)
+    summary = load_summary()
 
     # Metriken anzeigen
     col1, col2, col3, col4 = st.columns(4)
 
     with col1:
-        st.metric("Gesamt Einträge", len(df))
+        st.metric("Gesamt Einträge", summary.kisten_gesamt)
     with col2:
-        st.metric("Bezahlt", bezahlt_count, delta=None, delta_color="normal")
+        st.metric("Bezahlt", summary.kisten_bezahlt, delta=None, delta_color="normal")
     with col3:
-        st.metric("Offen", offen_count, delta=None, delta_color="inverse")
+        st.metric("Offen", summary.kisten_offen, delta=None, delta_color="inverse")
     with col4:
-        st.metric("Personen", personen_count)
+        st.metric("Personen", summary.personen)
 
     st.markdown("---")
 
     # Offene Kisten Tabelle
     st.subheader("⚠️ Offene Kisten")
-    open_boxes = create_open_boxes_table(df)
+    open_boxes = load_open_boxes()
     st.dataframe(
         open_boxes,
         hide_index=True,
@@ -57,32 +60,72 @@ def render():
 
     with col_left:
         st.subheader("🏆 Kisten pro Person")
-        fig1 = create_person_chart(df)
-        st.pyplot(fig1)
+        st.image(render_chart("person", summary), use_container_width=True)
+        # Vollständige Verteilung (das Diagramm zeigt nur die Top N)
+        if summary.personen > PERSON_CHART_TOP_N + 1:
+            st.caption(
+                f"Top {PERSON_CHART_TOP_N} von {summary.personen} Personen, "
+                "alle weiteren als „Andere“"
+            )
+        st.download_button(
+            "⬇️ Alle Personen als CSV",
+            data=summary.kisten_pro_person.to_csv(sep=";").encode("utf-8-sig"),
+            file_name="kisten_pro_person.csv",
+            mime="text/csv",
+        )
 
     with col_right:
         st.subheader("💰 Bezahlstatus")
-        fig2 = create_payment_chart(df)
-        st.pyplot(fig2)
+        st.image(render_chart("payment", summary), use_container_width=True)
 
     st.markdown("---")
 
     # Gründe
     st.subheader("📋 Top 10 Häufigste Gründe")
-    fig3 = create_reasons_chart(df)
-    st.pyplot(fig3)
+    st.image(render_chart("reasons", summary), use_container_width=True)
+
+    # Kisten pro Monat (vorberechnete Zeitreihe, nur Einträge mit Datum)
+    monate = load_timeseries()["monat"]
+    if not monate.empty and monate["Kisten"].sum() > 0:
+        st.subheader("📅 Kisten pro Monat")
+        st.bar_chart(
+            pd.DataFrame(
+                {
+                    "Bezahlt": monate["Kisten"] - monate["Offene Kisten"],
+                    "Offen": monate["Offene Kisten"],
+                }
+            ),
+            y_label="Anzahl Kisten",
+            color=["#16a34a", "#dc2626"],
+            stack=True,
+        )
+
+    st.markdown("---")
 
+    # Rangliste (Blättern und Suchen lösen nur einen Rerun dieses Abschnitts aus)
+    render_ranking()
+
+    # Footer
     st.markdown("---")
+    st.markdown(
+        '<p style="text-align: center; color: #6b7280; font-size: 14px;">💡 Die Seite aktualisiert sich automatisch bei Änderungen der Excel-Datei</p>',
+        unsafe_allow_html=True,
+    )
+
 
-    # Rangliste
+@st.fragment
+@profiled(name="kistenliste.render_ranking")
+def render_ranking():
+    """Rendert die Rangliste seitenweise (Gleichstände teilen sich den Rang)"""
     st.subheader("🏆 Rangliste")
-    ranking = create_ranking_table(df)
+    ranking = load_ranking().table()
 
-    # Styling für Tabelle
-    st.dataframe(
+    # Styling für Tabelle, nur die sichtbare Seite wird übertragen
+    render_paginated_table(
         ranking,
-        hide_index=True,
-        use_container_width=True,
+        key="rangliste",
+        search_columns=["Name"],
+        page_size=25,
         column_config={
             "Rang": st.column_config.NumberColumn("Rang", width="small"),
             "Medaille": st.column_config.TextColumn("", width="small"),
@@ -92,10 +135,3 @@ def render():
             ),
         },
     )
-
-    # Footer
-    st.markdown("---")
-    st.markdown(
-        '<p style="text-align: center; color: #6b7280; font-size: 14px;">💡 Die Seite aktualisiert sich automatisch bei Änderungen der Excel-Datei</p>',
-        unsafe_allow_html=True,
-    )
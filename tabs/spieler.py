@@ -0,0 +1,119 @@
+"""
+Spieler Tab - Kisten, Strafen und offene Beträge pro Kader-Spieler
+"""
+
+import streamlit as st
+from utils.data_loader import load_data, load_strafen_excel
+from utils.identity import load_player_index
+from utils.profiling import profiled
+
+
+@profiled(name="spieler.render")
+def render():
+    """Rendert das Profil eines Spielers aus dem vorberechneten Spieler-Index"""
+
+    index = load_player_index()
+
+    if index is None:
+        st.warning("Mannschaftskader konnte nicht geladen werden.")
+        st.stop()
+
+    spieler = index["spieler"]
+
+    # Auswahl (per ?spieler=<Rückennummer> verlinkbar)
+    numbers = list(spieler.index)
+    requested = st.query_params.get("spieler")
+    default = numbers.index(int(requested)) if requested in map(str, numbers) else 0
+    nummer = st.selectbox(
+        "Spieler",
+        numbers,
+        index=default,
+        format_func=lambda n: f"{n} • {spieler.at[n, 'Name']}",
+    )
+    st.query_params["spieler"] = str(nummer)
+    player = spieler.loc[nummer]
+
+    st.subheader(f"👤 {player['Name']}")
+    caption = f"Nr. {nummer} • {player['Position']}"
+    rank = index["kisten_rang"].get(nummer)
+    if rank is not None:
+        medal = f"{rank['Medaille']} " if rank["Medaille"] else ""
+        caption += f" • {medal}Rang {rank['Rang']} von {rank['Personen']} nach Kisten"
+    st.caption(caption)
+
+    # Metriken anzeigen
+    col1, col2, col3, col4 = st.columns(4)
+
+    with col1:
+        st.metric(
+            "📦 Kisten",
+            player["Kisten"],
+            help=f"Dazu {player['Geteilte Kisten']} geteilte Kisten",
+        )
+    with col2:
+        st.metric(
+            "⚠️ Offene Kisten",
+            f"{player['Offene Kisten']:g}",
+            help="Geteilte Kisten zählen anteilig",
+        )
+    with col3:
+        st.metric("Strafen", player["Strafen"])
+    with col4:
+        st.metric(
+            "💰 Offener Betrag",
+            f"{player['Offener Betrag (€)']:.2f} €",
+            delta_color="inverse",
+        )
+
+    st.markdown("---")
+
+    # Einträge des Spielers (Zeilenpositionen aus dem Index, kein Durchsuchen)
+    version = index["version"]
+    col_left, col_right = st.columns(2)
+
+    with col_left:
+        st.subheader("📦 Kisten")
+        positions = index["kisten_zeilen"].get(nummer)
+        df = load_data(version[0]) if positions is not None else None
+        if df is not None:
+            st.dataframe(
+                df.iloc[positions][["Name", "Grund", "Bezahlt_Status", "Anmerkung"]],
+                hide_index=True,
+                use_container_width=True,
+                column_config={
+                    "Bezahlt_Status": st.column_config.TextColumn("Status", width="small"),
+                },
+            )
+        else:
+            st.info("Keine Kisten.")
+
+    with col_right:
+        st.subheader("⚠️ Strafen")
+        positions = index["strafen_zeilen"].get(nummer)
+        df = load_strafen_excel(version[1]) if positions is not None else None
+        if df is not None:
+            rows = df.iloc[positions][["Termin", "Was?", "Betrag", "Bezahlt_Status"]]
+            st.dataframe(
+                rows,
+                hide_index=True,
+                use_container_width=True,
+                column_config={
+                    "Termin": st.column_config.DateColumn("Datum", format="DD.MM.YYYY"),
+                    "Was?": st.column_config.TextColumn("Was?", width="large"),
+                    "Betrag": st.column_config.NumberColumn("Betrag", format="%.2f €"),
+                    "Bezahlt_Status": st.column_config.TextColumn("Status", width="small"),
+                },
+            )
+        else:
+            st.success("🎉 Keine Strafen!")
+
+    # Namen aus den Ledgern ohne (eindeutigen) Kader-Eintrag
+    unmatched = index["nicht_zugeordnet"]
+    if not unmatched.empty:
+        with st.expander(f"❓ Nicht zugeordnete Namen ({len(unmatched)})"):
+            st.caption(
+                "Diese Namen passen zu keinem (oder mehreren) Spielern im Kader. "
+                "Zuordnen lassen sie sich über aliase.json, sobald der Verein "
+                "bestätigt hat, wer gemeint ist."
+            )
+            st.dataframe(unmatched, hide_index=True, use_container_width=True)
@@ -4,15 +4,12 @@ Startseite Tab - Übersicht und Mannschaftskader
 
 import streamlit as st
 from datetime import datetime
-from utils.data_loader import (
-    load_data,
-    load_kader,
-    load_strafenkatalog,
-    load_strafen_excel,
-    get_strafen_stats,
-)
+from utils.data_loader import load_kader, load_strafenkatalog
+from utils.summary import load_summary
+from utils.profiling import profiled
 
 
+@profiled(name="startseite.render")
 def render():
     """Rendert die Startseite mit Hintergrundbild, Kader und Infos"""
 
@@ -43,34 +40,19 @@ def render():
 
     st.markdown("<br>", unsafe_allow_html=True)
 
-    # Quick Stats laden
-    df_kisten = load_data()
-
-    if df_kisten is not None:
-        total_kisten = len(df_kisten)
-        offene_kisten = len(df_kisten[df_kisten["Bezahlt_Status"] == "Offen"])
-        personen = df_kisten["Name"].nunique()
-        bezahlt_kisten = len(df_kisten[df_kisten["Bezahlt_Status"] == "Bezahlt"])
-    else:
-        total_kisten = 0
-        offene_kisten = 0
-        personen = 0
-        bezahlt_kisten = 0
+    # Quick Stats laden (Kisten und Strafen aus der gemeinsamen Summary)
+    summary = load_summary()
 
     # Stats Kacheln
 
     st.markdown("### 📊 Schnellübersicht")
 
-    # Strafen laden für Betrag
-    df_strafen = load_strafen_excel()
-    strafen_stats = get_strafen_stats(df_strafen)
-
     col1, col2 = st.columns(2)
 
     with col1:
         st.metric(
             label="⚠️ Offene Kisten",
-            value=offene_kisten,
+            value=summary.kisten_offen,
             delta=None,
             delta_color="inverse",
         )
@@ -78,7 +60,7 @@ def render():
     with col2:
         st.metric(
             label="💰 Offene Strafen",
-            value=f"{strafen_stats['betrag_offen']:.2f} €",
+            value=f"{summary.betrag_offen:.2f} €",
             delta=None,
             delta_color="inverse",
         )
@@ -2,14 +2,22 @@
 Strafen Tab - Aktuelle Strafen aus Excel
 """
 
+import pandas as pd
 import streamlit as st
 from utils.data_loader import (
     load_strafen_excel,
-    calculate_strafen_per_person,
-    get_strafen_stats,
+    load_strafen_detail,
+    load_timeseries,
+    filter_strafen_detail,
 )
+from utils.pricing import PRUEFUNG_ABWEICHUNG, PRUEFUNG_UNBEKANNT, load_price_check
+from utils.timeseries import days_between, open_age, window
+from utils.summary import load_summary
+from utils.pagination import render_paginated_table
+from utils.profiling import profiled
 
 
+@profiled(name="strafen.render")
 def render():
     """Rendert den Strafen-Tab mit allen Statistiken"""
 
@@ -20,8 +28,9 @@ def render():
         st.warning("Keine Strafen-Daten verfügbar.")
         st.stop()
 
-    # Statistiken berechnen
-    stats = get_strafen_stats(df_strafen)
+    # Statistiken (einmal pro Datenversion berechnet)
+    summary = load_summary()
+    stats = summary.strafen_stats
 
     # Metriken anzeigen
     col1, col2, col3, col4 = st.columns(4)
@@ -41,7 +50,7 @@ def render():
 
     # Offene Strafen pro Person
     st.subheader("⚠️ Offene Strafen pro Person")
-    strafen_per_person = calculate_strafen_per_person(df_strafen)
+    strafen_per_person = summary.strafen_pro_person
 
     if not strafen_per_person.empty:
         st.dataframe(
@@ -61,8 +70,158 @@ def render():
     else:
         st.success("🎉 Keine offenen Strafen!")
 
+    # Beträge gegen den Strafenkatalog geprüft (einmal pro Datenversion)
+    check = load_price_check()
+    if check is not None:
+        render_preispruefung(check)
+
+    st.markdown("---")
+
+    # Verlauf (Zeitraum und Auflösung lösen nur einen Rerun dieses Abschnitts aus)
+    render_verlauf(load_timeseries())
+
     st.markdown("---")
 
+    # Detailansicht (Filter lösen nur einen Rerun dieses Abschnitts aus)
+    detail = load_strafen_detail()
+    if detail is not None:
+        render_detail(detail)
+
+    # Footer
+    st.markdown("---")
+    st.markdown(
+        '<p style="text-align: center; color: #6b7280; font-size: 14px;">💡 Die Daten werden automatisch aus der Excel-Datei geladen</p>',
+        unsafe_allow_html=True,
+    )
+
+
+@profiled(name="strafen.render_preispruefung")
+def render_preispruefung(check):
+    """Rendert Strafen, deren Betrag nicht zum Strafenkatalog passt"""
+    abweichungen = check["abweichungen"]
+    unbekannt = check["unbekannt"]
+    count = check["anzahl"].get(PRUEFUNG_ABWEICHUNG, 0)
+    label = f"🔎 Preisprüfung: {count} abweichende Beträge"
+    if not unbekannt.empty:
+        label += f", {check['anzahl'].get(PRUEFUNG_UNBEKANNT, 0)} Strafen nicht im Katalog"
+
+    with st.expander(label, expanded=False):
+        st.caption(
+            "Erwarteter Betrag laut Strafenkatalog; \"2x\" zählt doppelt, "
+            "Staffeln (\"1. Mal\" / \"jedes weitere Mal\") pro Person in "
+            "zeitlicher Reihenfolge."
+        )
+        if abweichungen.empty:
+            st.success("✅ Alle Beträge passen zum Strafenkatalog.")
+        else:
+            st.dataframe(
+                abweichungen[
+                    ["Termin", "Was?", "Wer?", "Vorkommen", "Betrag", "Erwartet", "Differenz"]
+                ],
+                hide_index=True,
+                use_container_width=True,
+                column_config={
+                    "Termin": st.column_config.DateColumn("Datum", format="DD.MM.YYYY"),
+                    "Was?": st.column_config.TextColumn("Was?", width="large"),
+                    "Vorkommen": st.column_config.NumberColumn("Mal", width="small"),
+                    "Betrag": st.column_config.NumberColumn("Betrag", format="%.2f €"),
+                    "Erwartet": st.column_config.NumberColumn("Erwartet", format="%.2f €"),
+                    "Differenz": st.column_config.NumberColumn("Differenz", format="%+.2f €"),
+                },
+            )
+        if not unbekannt.empty:
+            st.markdown("**Nicht im Strafenkatalog**")
+            st.dataframe(unbekannt, hide_index=True, use_container_width=True)
+
+
+@st.fragment
+@profiled(name="strafen.render_verlauf")
+def render_verlauf(ts):
+    """Rendert Strafen pro Woche/Monat, kumulierten Betrag und Alter offener Strafen"""
+    st.subheader("📈 Verlauf")
+
+    tage = ts["tage"]
+    tage = tage[tage["Strafen"] > 0]
+    if tage.empty:
+        st.info("Keine Strafen mit Datum.")
+        return
+    first, last = tage.index[0].date(), tage.index[-1].date()
+
+    col_range, col_period = st.columns([3, 1])
+    with col_range:
+        zeitraum = st.date_input(
+            "Zeitraum",
+            (first, last),
+            min_value=first,
+            max_value=last,
+            format="DD.MM.YYYY",
+            key="verlauf_zeitraum",
+        )
+    with col_period:
+        periode = st.radio(
+            "Auflösung", ["Woche", "Monat"], horizontal=True, key="verlauf_periode"
+        )
+    # Während der Auswahl liefert date_input nur das Startdatum
+    von = zeitraum[0] if zeitraum else first
+    bis = zeitraum[1] if len(zeitraum) > 1 else last
+
+    # Summen des Zeitraums aus den kumulierten Tageswerten
+    sums = window(ts, von, bis)
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        st.metric("Strafen im Zeitraum", int(sums["Strafen"]))
+    with col2:
+        st.metric("Betrag im Zeitraum", f"{sums['Betrag']:.2f} €")
+    with col3:
+        st.metric("Davon offen", f"{sums['Offener Betrag']:.2f} €", delta_color="inverse")
+
+    # Summen pro Woche/Monat (vorberechnet, Zeitraum über den sortierten Index)
+    start = pd.Timestamp(von)
+    if periode == "Woche":
+        table, start = ts["woche"], start - pd.Timedelta(days=start.weekday())
+    else:
+        table, start = ts["monat"], start.replace(day=1)
+    rows = table.loc[start : pd.Timestamp(bis)]
+    chart = pd.DataFrame(
+        {
+            "Bezahlt": rows["Betrag"] - rows["Offener Betrag"],
+            "Offen": rows["Offener Betrag"],
+        }
+    )
+    st.bar_chart(chart, y_label="Betrag (€)", color=["#16a34a", "#dc2626"], stack=True)
+
+    col_left, col_right = st.columns([2, 1])
+    with col_left:
+        st.markdown("**Kumulierter Betrag seit Saisonbeginn**")
+        start, stop = days_between(ts, von, bis)
+        cumulative = ts["tage"].iloc[start:stop]
+        st.line_chart(
+            cumulative[["Betrag kumuliert", "Offener Betrag kumuliert"]].set_axis(
+                ["Verhängt", "Davon offen"], axis=1
+            ),
+            y_label="Betrag (€)",
+            color=["#2563eb", "#dc2626"],
+        )
+    with col_right:
+        st.markdown("**Alter offener Strafen**")
+        st.dataframe(
+            open_age(ts),
+            hide_index=True,
+            use_container_width=True,
+            column_config={
+                "Offener Betrag": st.column_config.NumberColumn(
+                    "Offener Betrag", format="%.2f €"
+                ),
+            },
+        )
+        st.caption("Tage seit dem Termin (ein Zahlungsdatum wird nicht erfasst)")
+
+
+@st.fragment
+@profiled(name="strafen.render_detail")
+def render_detail(detail):
+    """Rendert die gefilterte Detailansicht aller Strafen"""
+
     # Filter für Detailansicht
     st.subheader("📋 Alle Strafen - Detailansicht")
 
@@ -71,32 +230,21 @@ def render():
     with col_filter1:
         filter_person = st.selectbox(
             "Person filtern",
-            ["Alle"] + sorted(df_strafen["Wer?"].dropna().unique().tolist()),
+            ["Alle"] + detail["personen"],
         )
 
     with col_filter2:
         filter_status = st.selectbox("Status filtern", ["Alle", "Offen", "Bezahlt"])
 
-    # Filtern
-    df_filtered = df_strafen.copy()
-
-    if filter_person != "Alle":
-        df_filtered = df_filtered[df_filtered["Wer?"] == filter_person]
-
-    if filter_status != "Alle":
-        df_filtered = df_filtered[df_filtered["Bezahlt_Status"] == filter_status]
+    # Filtern über den vorberechneten Index
+    df_display = filter_strafen_detail(detail, filter_person, filter_status)
 
-    # Spalten für Anzeige auswählen
-    display_columns = ["Termin", "Was?", "Wer?", "Betrag", "Bezahlt_Status"]
-    df_display = df_filtered[display_columns].copy()
-
-    # Datum formatieren
-    df_display["Termin"] = df_display["Termin"].dt.strftime("%d.%m.%Y")
-
-    st.dataframe(
+    # Nur die sichtbare Seite wird an den Browser geschickt
+    _, count = render_paginated_table(
         df_display,
-        hide_index=True,
-        use_container_width=True,
+        key="strafen_detail",
+        search_columns=["Was?", "Wer?"],
+        sort_keys={"Termin": detail["termin"]},
         column_config={
             "Termin": st.column_config.TextColumn("Datum", width="small"),
             "Was?": st.column_config.TextColumn("Vergehen", width="large"),
@@ -108,11 +256,4 @@ def render():
         },
     )
 
-    st.caption(f"Angezeigt: {len(df_display)} von {len(df_strafen)} Strafen")
-
-    # Footer
-    st.markdown("---")
-    st.markdown(
-        '<p style="text-align: center; color: #6b7280; font-size: 14px;">💡 Die Daten werden automatisch aus der Excel-Datei geladen</p>',
-        unsafe_allow_html=True,
-    )
+    st.caption(f"Angezeigt: {count} von {len(detail['table'])} Strafen")
@@ -6,19 +6,43 @@ from .data_loader import (
     load_data,
     create_open_boxes_table,
     create_ranking_table,
+    load_ranking,
     load_kader,
     load_strafenkatalog,
     load_strafen_excel,
     calculate_strafen_per_person,
     get_strafen_stats,
+    query_strafen,
+    sync_storage,
 )
-from .charts import create_person_chart, create_payment_chart, create_reasons_chart
+from .summary import DashboardSummary, load_summary
+
+# Diagrammfunktionen erst bei Bedarf laden (siehe __getattr__)
+_CHART_EXPORTS = {
+    "create_person_chart",
+    "create_payment_chart",
+    "create_reasons_chart",
+    "render_chart",
+}
+
+
+def __getattr__(name):
+    if name in _CHART_EXPORTS:
+        from . import charts
+
+        return getattr(charts, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 
 __all__ = [
     "load_data",
     "create_open_boxes_table",
     "create_ranking_table",
+    "load_ranking",
+    "DashboardSummary",
+    "load_summary",
     "create_person_chart",
     "create_payment_chart",
     "create_reasons_chart",
+    "render_chart",
 ]
@@ -0,0 +1,226 @@
+"""
+Schlanke JSON-API (nur lesend) für Bots und Widgets
+
+Liefert dieselben Kennzahlen wie get_strafen_stats(),
+calculate_strafen_per_person() und create_open_boxes_table() als kompaktes
+JSON. Der ETag wird nur aus den Fingerprints der Quelldateien gebildet:
+Bei "If-None-Match" mit aktuellem ETag antwortet der Server mit 304, ohne
+Daten zu laden oder zu berechnen. Antworten werden pro Datenversion gecacht.
+
+Endpunkte:
+    /api/uebersicht          Zahlen der Startseite inkl. Schulden pro Person
+    /api/strafen             get_strafen_stats()
+    /api/strafen/personen    calculate_strafen_per_person()
+    /api/kisten/offen        create_open_boxes_table()
+"""
+
+import hashlib
+import json
+import logging
+import threading
+from collections import OrderedDict
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit
+
+from .cache import file_fingerprint
+from .data_loader import (
+    KISTENLISTE_PATH,
+    STRAFEN_PATH,
+    calculate_strafen_per_person,
+    create_open_boxes_table,
+    get_strafen_stats,
+    load_data,
+    load_strafen_excel,
+)
+from .warmup import quiet_background_threads
+
+# Erhöhen, wenn sich das Format der Antworten ändert (neue ETags)
+API_FORMAT = 1
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8502
+
+# Anzahl gecachter Antworten (Endpunkt x Datenversion)
+RESPONSE_CACHE_SIZE = 16
+
+_responses = OrderedDict()
+_responses_lock = threading.Lock()
+
+logger = logging.getLogger(__name__)
+
+
+def _load(loader, fingerprint, path):
+    df = loader(fingerprint)
+    if df is None:
+        raise RuntimeError(f"{path} konnte nicht geladen werden")
+    return df
+
+
+def _stats(fingerprints):
+    df = _load(load_strafen_excel, fingerprints[STRAFEN_PATH], STRAFEN_PATH)
+    stats = get_strafen_stats(df)
+    return {
+        "gesamt": int(stats["gesamt"]),
+        "offen": int(stats["offen"]),
+        "bezahlt": int(stats["bezahlt"]),
+        "betrag_offen": round(float(stats["betrag_offen"]), 2),
+        "betrag_bezahlt": round(float(stats["betrag_bezahlt"]), 2),
+    }
+
+
+def _per_person(fingerprints):
+    df = _load(load_strafen_excel, fingerprints[STRAFEN_PATH], STRAFEN_PATH)
+    per_person = calculate_strafen_per_person(df)
+    return [
+        {"name": str(name), "betrag": round(float(amount), 2), "anzahl": int(count)}
+        for name, amount, count in per_person.itertuples(index=False)
+    ]
+
+
+def _open_boxes(fingerprints):
+    df = _load(load_data, fingerprints[KISTENLISTE_PATH], KISTENLISTE_PATH)
+    open_boxes = create_open_boxes_table(df)
+    return [
+        {"name": str(name), "kisten": round(float(count), 2)}
+        for name, count in open_boxes.itertuples(index=False)
+    ]
+
+
+def _overview(fingerprints):
+    df = _load(load_data, fingerprints[KISTENLISTE_PATH], KISTENLISTE_PATH)
+    stats = _stats(fingerprints)
+    return {
+        "kisten_offen": int((~df["Ist_Bezahlt"]).sum()),
+        "betrag_offen": stats["betrag_offen"],
+        "schulden": _per_person(fingerprints),
+    }
+
+
+# Pfad -> (benötigte Quelldateien, Erzeugung der Daten)
+ENDPOINTS = {
+    "/api/uebersicht": ((KISTENLISTE_PATH, STRAFEN_PATH), _overview),
+    "/api/strafen": ((STRAFEN_PATH,), _stats),
+    "/api/strafen/personen": ((STRAFEN_PATH,), _per_person),
+    "/api/kisten/offen": ((KISTENLISTE_PATH,), _open_boxes),
+}
+
+
+def etag_for(path, fingerprints):
+    """ETag eines Endpunkts für die angegebenen Fingerprints der Quelldateien."""
+    sources, _ = ENDPOINTS[path]
+    key = "|".join([str(API_FORMAT), path] + [fingerprints[source] for source in sources])
+    return '"' + hashlib.sha256(key.encode("utf-8")).hexdigest()[:20] + '"'
+
+
+def response_for(path, fingerprints):
+    """
+    Kompakter JSON-Body eines Endpunkts (bytes), gecacht pro ETag.
+    """
+    etag = etag_for(path, fingerprints)
+    with _responses_lock:
+        body = _responses.get(etag)
+        if body is not None:
+            _responses.move_to_end(etag)
+            return etag, body
+
+    _, build = ENDPOINTS[path]
+    data = build(fingerprints)
+    body = json.dumps(data, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+    with _responses_lock:
+        _responses[etag] = body
+        while len(_responses) > RESPONSE_CACHE_SIZE:
+            _responses.popitem(last=False)
+    return etag, body
+
+
+def _matches(if_none_match, etag):
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    # Schwache Vergleiche wie W/"..." zulassen
+    candidates = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+    return etag in candidates
+
+
+class ApiHandler(BaseHTTPRequestHandler):
+    """Beantwortet GET/HEAD für die Endpunkte in ENDPOINTS."""
+
+    server_version = "FCM-API/1"
+
+    def do_GET(self):
+        self._respond(send_body=True)
+
+    def do_HEAD(self):
+        self._respond(send_body=False)
+
+    def _respond(self, send_body):
+        path = urlsplit(self.path).path.rstrip("/") or "/"
+        if path not in ENDPOINTS:
+            self._send_json(HTTPStatus.NOT_FOUND, {"fehler": "Unbekannter Endpunkt"}, send_body)
+            return
+
+        try:
+            fingerprints = {
+                source: file_fingerprint(source) for source in ENDPOINTS[path][0]
+            }
+            etag = etag_for(path, fingerprints)
+            if _matches(self.headers.get("If-None-Match"), etag):
+                self.send_response(HTTPStatus.NOT_MODIFIED)
+                self.send_header("ETag", etag)
+                self.send_header("Cache-Control", "no-cache")
+                self.end_headers()
+                return
+            etag, body = response_for(path, fingerprints)
+        except Exception:
+            # Details nur ins Log, nicht an den Client
+            logger.exception("Fehler bei %s", path)
+            self._send_json(
+                HTTPStatus.INTERNAL_SERVER_ERROR, {"fehler": "Interner Fehler"}, send_body
+            )
+            return
+
+        self.send_response(HTTPStatus.OK)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("ETag", etag)
+        self.send_header("Cache-Control", "no-cache")
+        self.end_headers()
+        if send_body:
+            self.wfile.write(body)
+
+    def _send_json(self, status, data, send_body):
+        body = json.dumps(data, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        if send_body:
+            self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        # Nur Fehler protokollieren, nicht jede Abfrage
+        pass
+
+
+class ApiServer(ThreadingHTTPServer):
+    """
+    ThreadingHTTPServer, dessen Anfrage-Threads "fcm-api" heißen. Sie laufen
+    ohne Session, die Warnungen zu fehlendem ScriptRunContext werden daher
+    wie bei den Warm-up-Threads unterdrückt (quiet_background_threads).
+    """
+
+    def process_request_thread(self, request, client_address):
+        threading.current_thread().name = "fcm-api"
+        super().process_request_thread(request, client_address)
+
+
+def create_server(host=DEFAULT_HOST, port=DEFAULT_PORT):
+    """
+    Erstellt den Server (noch nicht gestartet). port=0 wählt einen freien
+    Port, z.B. für lokale Tests: server.server_address[1].
+    """
+    quiet_background_threads()
+    return ApiServer((host, port), ApiHandler)
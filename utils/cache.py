@@ -0,0 +1,237 @@
+"""
+Fingerprints und Snapshot-Cache für die Excel-Quellen
+
+Snapshots und der gemeinsame Cache (load_shared) liegen als Dateien in
+.cache/ (oder FCM_CACHE_DIR) und werden von allen Server-Prozessen auf
+demselben Rechner genutzt.
+Eine Dateisperre sorgt dafür, dass nach einer Änderung genau ein Prozess
+neu berechnet, die anderen warten und lesen dann dessen Ergebnis.
+"""
+
+import hashlib
+import os
+import pickle
+from contextlib import contextmanager
+
+import pandas as pd
+
+try:
+    import fcntl
+except ImportError:  # Windows: ohne Sperre, jeder Prozess rechnet selbst
+    fcntl = None
+
+# Verzeichnis für die bereinigten Snapshots (wird nicht eingecheckt),
+# änderbar mit FCM_CACHE_DIR (z.B. für Benchmarks in einem Temp-Verzeichnis)
+CACHE_DIR = os.environ.get("FCM_CACHE_DIR", ".cache")
+SNAPSHOT_DIR = os.path.join(CACHE_DIR, "snapshots")
+# Gemeinsamer Cache für Summary, Detailansicht und Diagramme
+SHARED_DIR = os.path.join(CACHE_DIR, "shared")
+
+# Abschalten mit FCM_SHARED_CACHE=0 (dann nur st.cache_data pro Prozess)
+SHARED_ENABLED = os.environ.get("FCM_SHARED_CACHE", "1") not in ("", "0")
+# Einträge pro Namensraum, die auf der Platte bleiben
+SHARED_KEEP = 6
+
+# Erhöhen, wenn sich die Bereinigung oder die gemeinsam gecachten Strukturen
+# ändern (alte Snapshots und Einträge werden ungültig)
+SNAPSHOT_FORMAT = 10
+
+# Letzter Inhalts-Hash pro Pfad: Pfad -> ((Pfad, mtime, Größe), Hash), damit
+# eine unveränderte Datei nicht bei jedem Rerun neu gelesen und gehasht werden
+# muss. Ein Eintrag pro Datei, ältere Stände werden überschrieben.
+_content_hashes = {}
+
+
+def file_fingerprint(path):
+    """
+    Berechnet einen Fingerprint aus Pfad, Änderungszeit, Größe und Inhalts-Hash.
+    Ändert sich die Datei, ändert sich auch der Fingerprint.
+    """
+    stat_key = _stat_key(path)
+    key = "|".join(str(part) for part in stat_key) + "|" + _content_hash(path, stat_key)
+    return hashlib.sha256(key.encode("utf-8")).hexdigest()
+
+
+def content_hash(path):
+    """
+    SHA-256 nur über den Inhalt der Datei (unabhängig von Pfad und
+    Änderungszeit, z.B. für den kompilierten Datenstand nach einem Deployment).
+    """
+    return _content_hash(path, _stat_key(path))
+
+
+def _stat_key(path):
+    stat = os.stat(path)
+    return (os.path.abspath(path), stat.st_mtime_ns, stat.st_size)
+
+
+def _content_hash(path, stat_key):
+    cached_key, digest = _content_hashes.get(stat_key[0], (None, None))
+    if cached_key != stat_key:
+        with open(path, "rb") as f:
+            digest = hashlib.sha256(f.read()).hexdigest()
+        _content_hashes[stat_key[0]] = (stat_key, digest)
+    return digest
+
+
+def _snapshot_path(name, fingerprint):
+    return os.path.join(
+        SNAPSHOT_DIR, f"{name}-v{SNAPSHOT_FORMAT}-{fingerprint[:16]}.parquet"
+    )
+
+
+def normalize_for_snapshot(df):
+    """
+    Wandelt Spalten mit gemischten Typen (z.B. Datum als Text und datetime)
+    in Text um, damit das DataFrame verlustfrei als Parquet gespeichert werden kann.
+    Wird auch auf frisch geparste Daten angewendet, damit Cache-Treffer und
+    Neuberechnung identische DataFrames liefern.
+    """
+    df = df.copy()
+    for col in df.columns:
+        if df[col].dtype != object:
+            continue
+        values = df[col].dropna()
+        if values.map(type).nunique() > 1:
+            df[col] = df[col].map(lambda x: x if pd.isna(x) else str(x))
+    return df
+
+
+def load_snapshot(name, fingerprint, build):
+    """
+    Lädt das bereinigte DataFrame aus dem Parquet-Snapshot zum Fingerprint.
+    Existiert kein Snapshot, wird build() genau einmal aufgerufen, das Ergebnis
+    gespeichert und ältere Snapshots derselben Quelle werden entfernt.
+    """
+    path = _snapshot_path(name, fingerprint)
+    df = _read_snapshot(path)
+    if df is not None:
+        return df
+
+    # Nur ein Prozess parst, die anderen warten und lesen dann den Snapshot
+    with file_lock(os.path.join(SNAPSHOT_DIR, f"{name}.lock")):
+        df = _read_snapshot(path)
+        if df is not None:
+            return df
+        return _write_snapshot(name, path, normalize_for_snapshot(build()))
+
+
+def _read_snapshot(path):
+    if not os.path.exists(path):
+        return None
+    try:
+        return pd.read_parquet(path)
+    except Exception:
+        # Beschädigter Snapshot - neu aufbauen
+        return None
+
+
+def _write_snapshot(name, path, df):
+    try:
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        df.to_parquet(tmp_path, index=True)
+        os.replace(tmp_path, path)
+        _remove_old_snapshots(name, keep=path)
+    except Exception:
+        # Ohne beschreibbares Cache-Verzeichnis einfach ohne Snapshot weiter
+        pass
+
+    return df
+
+
+def _remove_old_snapshots(name, keep):
+    for filename in os.listdir(SNAPSHOT_DIR):
+        path = os.path.join(SNAPSHOT_DIR, filename)
+        if filename.startswith(f"{name}-") and path != keep:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+
+@contextmanager
+def file_lock(path):
+    """
+    Exklusive Sperre über eine Lock-Datei (prozessübergreifend, flock).
+    Die Lock-Datei bleibt liegen, damit alle Prozesse dieselbe Datei sperren.
+    Ohne beschreibbares Verzeichnis oder fcntl wird ohne Sperre weitergemacht.
+    """
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        lock_file = open(path, "a")
+    except OSError:
+        lock_file = None
+    try:
+        if lock_file is not None and fcntl is not None:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+        yield
+    finally:
+        if lock_file is not None:
+            # Schließen gibt die Sperre frei
+            lock_file.close()
+
+
+def _shared_path(namespace, key):
+    digest = hashlib.sha256(repr(key).encode("utf-8")).hexdigest()
+    return os.path.join(SHARED_DIR, f"{namespace}-v{SNAPSHOT_FORMAT}-{digest[:24]}.pkl")
+
+
+_MISSING = object()
+
+
+def _read_shared(path):
+    try:
+        with open(path, "rb") as f:
+            return pickle.load(f)
+    except Exception:
+        # Nicht vorhanden, beschädigt oder veraltet - neu berechnen
+        return _MISSING
+
+
+def load_shared(namespace, key, build):
+    """
+    Gemeinsamer Cache aller Prozesse für beliebige picklebare Werte
+    (DashboardSummary, DataFrames, Bilddaten). key enthält die Fingerprints
+    der Quellen, eine Änderung ergibt also automatisch einen neuen Eintrag.
+    Fehlt der Eintrag, ruft genau ein Prozess build() auf, die anderen
+    warten auf die Sperre und lesen dann das Ergebnis. Wirft build() eine
+    Ausnahme, wird nichts gespeichert.
+    """
+    if not SHARED_ENABLED:
+        return build()
+
+    path = _shared_path(namespace, key)
+    value = _read_shared(path)
+    if value is not _MISSING:
+        return value
+
+    with file_lock(os.path.join(SHARED_DIR, f"{namespace}.lock")):
+        value = _read_shared(path)
+        if value is not _MISSING:
+            return value
+
+        value = build()
+        try:
+            tmp_path = f"{path}.{os.getpid()}.tmp"
+            with open(tmp_path, "wb") as f:
+                pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, path)
+            _remove_old_shared(namespace)
+        except Exception:
+            # Ohne beschreibbares Cache-Verzeichnis nur für diesen Prozess
+            pass
+    return value
+
+
+def _remove_old_shared(namespace, keep=SHARED_KEEP):
+    entries = [
+        os.path.join(SHARED_DIR, filename)
+        for filename in os.listdir(SHARED_DIR)
+        if filename.startswith(f"{namespace}-v") and filename.endswith(".pkl")
+    ]
+    entries.sort(key=os.path.getmtime, reverse=True)
+    for path in entries[keep:]:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
@@ -2,43 +2,103 @@
 Diagramm- und Visualisierungsfunktionen
 """
 
+import functools
+import io
+import threading
+from collections import OrderedDict
+
 import pandas as pd
-import matplotlib.pyplot as plt
-import seaborn as sns
+
+from .cache import load_shared
+from .profiling import cache_miss, current_rss, profiled
+
+# matplotlib wird erst beim ersten Diagramm importiert (schnellerer Kaltstart)
+
+# Entspricht seaborn.set_style("whitegrid"), ohne seaborn zu importieren
+WHITEGRID_STYLE = {
+    "figure.facecolor": "white",
+    "axes.facecolor": "white",
+    "axes.edgecolor": ".8",
+    "axes.grid": True,
+    "axes.axisbelow": True,
+    "axes.labelcolor": ".15",
+    "grid.color": ".8",
+    "grid.linestyle": "-",
+    "text.color": ".15",
+    "xtick.color": ".15",
+    "ytick.color": ".15",
+    "xtick.direction": "out",
+    "ytick.direction": "out",
+    "xtick.bottom": False,
+    "ytick.left": False,
+    "xtick.top": False,
+    "ytick.right": False,
+    "font.family": ["sans-serif"],
+    "font.sans-serif": [
+        "Arial",
+        "DejaVu Sans",
+        "Liberation Sans",
+        "Bitstream Vera Sans",
+        "sans-serif",
+    ],
+    "lines.solid_capstyle": "round",
+    "patch.edgecolor": "w",
+    "patch.force_edgecolor": True,
+}
+
+# Anzahl gerenderter Diagramme, die im Speicher gehalten werden
+RENDER_CACHE_SIZE = 24
+
+# Personen im Diagramm "Kisten pro Person", alle weiteren werden zusammengefasst
+PERSON_CHART_TOP_N = 25
+
+_render_cache = OrderedDict()
+# _render_lock schützt nur den Cache (kurz), _pyplot_lock das Rendern.
+# So warten Treffer nicht, während z.B. der Warm-up eine neue Version rendert.
+_render_lock = threading.Lock()
+_pyplot_lock = threading.Lock()
+# hits: aus _render_cache, shared_hits: aus dem gemeinsamen Cache eines
+# anderen Prozesses, misses: in diesem Prozess gerendert
+_render_stats = {"hits": 0, "shared_hits": 0, "misses": 0}
+
+
+def _whitegrid(func):
+    """Erstellt das Diagramm mit WHITEGRID_STYLE, ohne globale rcParams zu ändern."""
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        import matplotlib.pyplot as plt
+
+        with plt.rc_context(WHITEGRID_STYLE):
+            return func(*args, **kwargs)
+
+    return wrapper
 
 
-def create_person_chart(df):
+@profiled()
+@_whitegrid
+def create_person_chart(summary, top_n=PERSON_CHART_TOP_N):
     """
     Erstellt ein gestapeltes horizontales Balkendiagramm:
     Zeigt für jede Person die Anzahl bezahlter und offener Kisten.
     Sortiert nach Gesamtanzahl.
     Zeigt die Werte direkt an den Balken.
+    Liest die Zählungen aus der DashboardSummary.
+    Bei mehr als top_n Personen werden die übrigen als "Andere" zusammengefasst
+    (top_n=None zeigt alle), Höhe und Bildgröße bleiben dadurch begrenzt.
     """
-    sns.set_style("whitegrid")
-
-    # Daten vorbereiten
-    name_bezahlt = df[df["Bezahlt_Status"] == "Bezahlt"].groupby("Name").size()
-    name_offen = df[df["Bezahlt_Status"] == "Offen"].groupby("Name").size()
-
-    all_names = df["Name"].value_counts().index
-    name_stats = pd.DataFrame(
-        {
-            "Name": all_names,
-            "Bezahlt": [name_bezahlt.get(name, 0) for name in all_names],
-            "Offen": [name_offen.get(name, 0) for name in all_names],
-        }
-    )
+    import matplotlib.pyplot as plt
 
-    name_stats["Gesamt"] = name_stats["Bezahlt"] + name_stats["Offen"]
-    name_stats = name_stats.sort_values("Gesamt", ascending=True)
+    # Daten vorbereiten (absteigend nach Gesamt, "Andere" am Ende)
+    name_stats = top_people(summary.kisten_pro_person, top_n)
 
     # Diagramm für Kisten pro Person
-    # Dynamische Höhe basierend auf Anzahl der Namen
-    n_people = len(name_stats)
-    height = max(8, n_people * 0.4)  # Minimum 8, sonst 0.4 pro Person
+    # Dynamische Höhe basierend auf Anzahl der Balken (höchstens top_n + 1)
+    n_bars = len(name_stats)
+    height = max(8, n_bars * 0.4)  # Minimum 8, sonst 0.4 pro Balken
     fig, ax = plt.subplots(figsize=(12, height))
     fig.patch.set_facecolor("white")
-    y_pos = range(len(name_stats))
+    y_pos = range(n_bars)
 
     ax.barh(
         y_pos,
@@ -48,7 +108,7 @@ def create_person_chart(df):
         edgecolor="darkgreen",
         linewidth=1.5,
     )
-    ax.barh(
+    offen = ax.barh(
         y_pos,
         name_stats["Offen"],
         left=name_stats["Bezahlt"],
@@ -59,34 +119,66 @@ def create_person_chart(df):
     )
 
     ax.set_yticks(y_pos)
-    ax.set_yticklabels(name_stats["Name"])
+    ax.set_yticklabels(name_stats.index)
+    # Größter Wert oben
+    ax.invert_yaxis()
     ax.set_xlabel("Anzahl Kisten", fontweight="bold", fontsize=11)
     ax.set_ylabel("Name", fontweight="bold", fontsize=11)
-    ax.legend(loc="lower right")
+    # Legende über dem Diagramm, unten rechts steht ggf. der Balken "Andere"
+    ax.legend(loc="lower right", bbox_to_anchor=(1.0, 1.0), ncol=2)
     ax.grid(axis="x", alpha=0.3)
     ax.xaxis.set_major_locator(plt.MaxNLocator(integer=True))
 
-    # Werte anzeigen
-    for i, row in enumerate(name_stats.itertuples()):
-        ax.text(
-            row.Gesamt + 0.1,
-            i,
-            str(row.Gesamt),
-            va="center",
-            fontweight="bold",
-            fontsize=10,
-        )
+    # Werte (Gesamt) in einem Aufruf am Ende der gestapelten Balken anzeigen
+    labels = name_stats["Gesamt"].astype(str).tolist()
+    if len(name_stats) < len(summary.kisten_pro_person):
+        # "Andere" kann viel größer sein als die Top N: Achse an den Top N
+        # ausrichten, der Balken läuft über den Rand, der Wert steht innen
+        limit = name_stats["Gesamt"].iloc[:-1].max() * 1.15
+        if name_stats["Gesamt"].iloc[-1] > limit:
+            ax.set_xlim(0, limit)
+            ax.text(
+                limit,
+                n_bars - 1,
+                f"{labels[-1]} ",
+                ha="right",
+                va="center",
+                color="white",
+                fontweight="bold",
+                fontsize=10,
+            )
+            labels[-1] = ""
+    ax.bar_label(offen, labels=labels, padding=3, fontweight="bold", fontsize=10)
 
     plt.tight_layout()
     return fig
 
 
-def create_payment_chart(df):
+def top_people(per_person, top_n=PERSON_CHART_TOP_N):
+    """
+    Die top_n Personen (wie DashboardSummary.kisten_pro_person, absteigend nach
+    Gesamt) plus eine Zeile "Andere (k Personen)" mit der Summe aller übrigen.
+    """
+    counts = per_person[["Bezahlt", "Offen", "Gesamt"]]
+    # Eine einzelne übrige Person wird direkt gezeigt statt als "Andere"
+    if top_n is None or len(counts) <= top_n + 1:
+        return counts
+
+    rest = counts.iloc[top_n:]
+    others = rest.sum().rename(f"Andere ({len(rest)} Personen)")
+    return pd.concat([counts.iloc[:top_n], others.to_frame().T])
+
+
+@profiled()
+@_whitegrid
+def create_payment_chart(summary):
     """
     Erstellt ein Tortendiagramm:
     Zeigt den Anteil "Bezahlt" vs. "Offen" für alle Einträge.
     """
-    bezahlt_counts = df["Bezahlt_Status"].value_counts()
+    import matplotlib.pyplot as plt
+
+    bezahlt_counts = summary.kisten_status
 
     fig, ax = plt.subplots(figsize=(5, 5))
     fig.patch.set_facecolor("white")
@@ -109,15 +201,17 @@ def create_payment_chart(df):
     return fig
 
 
-def create_reasons_chart(df):
+@profiled()
+@_whitegrid
+def create_reasons_chart(summary):
     """
     Erstellt ein horizontales Balkendiagramm:
     Zeigt die Top 10 häufigsten Gründe aus der Spalte "Grund".
     Werte werden direkt angezeigt.
     """
-    sns.set_style("whitegrid")
+    import matplotlib.pyplot as plt
 
-    grund_counts = df["Grund"].value_counts().head(10).sort_values(ascending=True)
+    grund_counts = summary.kisten_pro_grund.head(10).sort_values(ascending=True)
 
     fig, ax = plt.subplots(figsize=(10, 6))
     fig.patch.set_facecolor("white")
@@ -142,3 +236,91 @@ def create_reasons_chart(df):
 
     plt.tight_layout()
     return fig
+
+
+CHART_BUILDERS = {
+    "person": create_person_chart,
+    "payment": create_payment_chart,
+    "reasons": create_reasons_chart,
+}
+
+
+@profiled(cached=True)
+def render_chart(name, summary, fmt="png", dpi=200):
+    """
+    Liefert ein Diagramm als fertig kodierte Bilddaten (PNG oder SVG).
+    Gerendert wird nur einmal pro Datenversion und Parametern, danach kommen
+    die Bytes aus einem LRU-Cache. Die matplotlib-Figur wird sofort geschlossen.
+    """
+    key = (name, summary.version, fmt, dpi)
+
+    data = _cached_render(key)
+    if data is not None:
+        return data
+
+    # pyplot ist nicht threadsicher - immer nur ein Diagramm gleichzeitig rendern
+    with _pyplot_lock:
+        # Inzwischen von einem anderen Thread gerendert?
+        data = _cached_render(key)
+        if data is not None:
+            return data
+
+        cache_miss()
+        rendered = []
+
+        def render():
+            rendered.append(key)
+            return _render(name, summary, fmt, dpi)
+
+        # Über alle Server-Prozesse geteilt: nur einer rendert pro Version
+        data = load_shared(f"diagramm-{name}", key, render)
+
+    with _render_lock:
+        _render_stats["misses" if rendered else "shared_hits"] += 1
+        _render_cache[key] = data
+        while len(_render_cache) > RENDER_CACHE_SIZE:
+            _render_cache.popitem(last=False)
+
+    return data
+
+
+def _render(name, summary, fmt, dpi):
+    import matplotlib.pyplot as plt
+
+    fig = CHART_BUILDERS[name](summary)
+    try:
+        buffer = io.BytesIO()
+        with plt.rc_context(WHITEGRID_STYLE):
+            fig.savefig(buffer, format=fmt, dpi=dpi, bbox_inches="tight")
+        return buffer.getvalue()
+    finally:
+        plt.close(fig)
+
+
+def _cached_render(key):
+    with _render_lock:
+        data = _render_cache.get(key)
+        if data is not None:
+            _render_cache.move_to_end(key)
+            _render_stats["hits"] += 1
+        return data
+
+
+def render_cache_info():
+    """
+    Kennzahlen des Render-Caches inkl. offener Figuren und Speicherverbrauch
+    des Prozesses (RSS in Bytes).
+    """
+    import sys
+
+    pyplot = sys.modules.get("matplotlib.pyplot")
+    with _render_lock:
+        return {
+            "hits": _render_stats["hits"],
+            "shared_hits": _render_stats["shared_hits"],
+            "misses": _render_stats["misses"],
+            "entries": len(_render_cache),
+            "bytes": sum(len(data) for data in _render_cache.values()),
+            "open_figures": len(pyplot.get_fignums()) if pyplot else 0,
+            "rss": current_rss(),
+        }
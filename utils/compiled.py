@@ -0,0 +1,232 @@
+"""
+Kompilierter Datenstand: alle Quellen als Arrow IPC mit Manifest
+
+compile_sources() (Aufruf über compile_data.py) liest beide Arbeitsmappen,
+kader.json und strafenkatalog.json, prüft und bereinigt sie und schreibt pro
+Tabelle eine Arrow-IPC-Datei plus manifest.json nach COMPILED_DIR.
+
+load_compiled() wird von den Loadern in data_loader vor dem Excel-/JSON-Pfad
+gefragt. Die Datei wird per Memory-Mapping gelesen (kein Parsen, die Seiten
+liegen im Page-Cache und werden von allen Prozessen geteilt). Passt der
+SHA-256 der Quelldatei nicht mehr zum Manifest oder fehlt der Stand, wird
+None zurückgegeben und wie bisher aus Excel/JSON geladen.
+"""
+
+import json
+import os
+from datetime import datetime
+
+import pyarrow as pa
+
+from .cache import SNAPSHOT_FORMAT, content_hash, file_fingerprint, normalize_for_snapshot
+
+# Zielverzeichnis, änderbar mit FCM_COMPILED_DIR
+COMPILED_DIR = os.environ.get("FCM_COMPILED_DIR", "kompiliert")
+MANIFEST_NAME = "manifest.json"
+
+# Erhöhen, wenn sich das Format des kompilierten Stands ändert
+COMPILED_FORMAT = 1
+
+
+def _read_manifest(out_dir):
+    try:
+        with open(os.path.join(out_dir, MANIFEST_NAME), "r", encoding="utf-8") as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return None
+    # Anderes Format oder andere Bereinigung: Stand ist veraltet
+    if (
+        manifest.get("format") != COMPILED_FORMAT
+        or manifest.get("snapshot_format") != SNAPSHOT_FORMAT
+    ):
+        return None
+    return manifest
+
+
+def load_compiled(name, source, fingerprint=None, out_dir=None):
+    """
+    Lädt eine Tabelle aus dem kompilierten Stand, wenn er zum aktuellen
+    Inhalt der Quelldatei passt. fingerprint ist die angefragte Version
+    (siehe file_fingerprint); gehört sie nicht zur aktuellen Datei, wird
+    None zurückgegeben. Sonst None, wenn kein gültiger Stand vorliegt.
+    """
+    manifest = _read_manifest(out_dir or COMPILED_DIR)
+    if manifest is None:
+        return None
+    entry = manifest["tabellen"].get(name)
+    if entry is None:
+        return None
+
+    try:
+        if fingerprint is not None and fingerprint != file_fingerprint(source):
+            return None
+        if content_hash(source) != entry["sha256"]:
+            return None
+        # Memory-Mapping: Arrow liest die Puffer direkt aus der gemappten Datei
+        mapped = pa.memory_map(os.path.join(out_dir or COMPILED_DIR, entry["datei"]))
+        table = pa.ipc.open_file(mapped).read_all()
+    except (OSError, pa.ArrowInvalid):
+        # Quelle fehlt oder Datei wurde gerade ersetzt - normal laden
+        return None
+    return table.to_pandas()
+
+
+def compiled_status(out_dir=None):
+    """
+    Zustand des kompilierten Stands pro Tabelle: "aktuell", "veraltet"
+    oder "fehlt" (für das Diagnose-Panel und die Kommandozeile).
+    """
+    manifest = _read_manifest(out_dir or COMPILED_DIR) or {"tabellen": {}}
+    status = {}
+    for name, (source, _, _) in _tables().items():
+        entry = manifest["tabellen"].get(name)
+        if entry is None:
+            status[name] = "fehlt"
+            continue
+        try:
+            current = content_hash(source) == entry["sha256"]
+        except OSError:
+            current = False
+        status[name] = "aktuell" if current else "veraltet"
+    return status
+
+
+def _tables():
+    """Tabellenname -> (Quelldatei, Lesen + Bereinigen, Prüfung)."""
+    from .data_loader import (
+        KADER_PATH,
+        KISTENLISTE_PATH,
+        STRAFEN_PATH,
+        STRAFENKATALOG_PATH,
+        _parse_kistenliste,
+        _parse_strafen,
+        _read_json,
+    )
+
+    return {
+        "kistenliste": (KISTENLISTE_PATH, _parse_kistenliste, _check_kistenliste),
+        "strafen": (STRAFEN_PATH, _parse_strafen, _check_strafen),
+        "kader": (KADER_PATH, lambda: _read_json(KADER_PATH), _check_kader),
+        "strafenkatalog": (
+            STRAFENKATALOG_PATH,
+            lambda: _read_json(STRAFENKATALOG_PATH),
+            _check_strafenkatalog,
+        ),
+    }
+
+
+def _check_kistenliste(df):
+    errors, notes = [], []
+    if df.empty:
+        errors.append("keine Einträge")
+    elif df["Name"].isna().any():
+        errors.append(f"{int(df['Name'].isna().sum())} Zeilen ohne Name")
+    if "Datum" in df.columns and df["Datum"].isna().any():
+        notes.append(f"{int(df['Datum'].isna().sum())} Kisten ohne lesbares Datum")
+    unknown = set(df["Bezahlt"].dropna().unique()) - {"", "J"}
+    if unknown:
+        notes.append(f"unbekannte Werte in 'Bezahlt' (gelten als offen): {sorted(unknown)}")
+    return errors, notes
+
+
+def _check_strafen(df):
+    errors, notes = [], []
+    if df.empty:
+        errors.append("keine Einträge")
+    if (df["Betrag"] < 0).any():
+        errors.append("negative Beträge")
+    if df["Wer?"].isna().any():
+        errors.append(f"{int(df['Wer?'].isna().sum())} Strafen ohne Person")
+    if df["Termin"].isna().any():
+        notes.append(f"{int(df['Termin'].isna().sum())} Strafen ohne lesbares Datum")
+    if (df["Betrag"] == 0).any():
+        notes.append(f"{int((df['Betrag'] == 0).sum())} Strafen ohne Betrag")
+    return errors, notes
+
+
+def _check_columns(df, columns):
+    missing = [col for col in columns if col not in df.columns]
+    if missing:
+        return [f"fehlende Felder: {missing}"]
+    return [f"leere Werte in '{col}'" for col in columns if df[col].isna().any()]
+
+
+def _check_kader(df):
+    errors = _check_columns(df, ["nummer", "vorname", "nachname", "position"])
+    if not errors and df["nummer"].duplicated().any():
+        duplicates = sorted(df.loc[df["nummer"].duplicated(), "nummer"].tolist())
+        errors.append(f"doppelte Rückennummern: {duplicates}")
+    return errors, []
+
+
+def _check_strafenkatalog(df):
+    return _check_columns(df, ["Vergehen", "Strafe"]), []
+
+
+def compile_sources(out_dir=None):
+    """
+    Liest, bereinigt und prüft alle Quellen und schreibt den kompilierten
+    Stand. Gibt das Manifest und die Hinweise pro Tabelle zurück.
+    Bei Fehlern wird ValueError geworfen und nichts geschrieben, der
+    bisherige Stand bleibt gültig.
+    """
+    out_dir = out_dir or COMPILED_DIR
+    frames, notes, errors = {}, {}, []
+    for name, (source, build, check) in _tables().items():
+        try:
+            sha256 = content_hash(source)
+            df = normalize_for_snapshot(build())
+        except Exception as e:
+            errors.append(f"{source}: {e}")
+            continue
+        table_errors, notes[name] = check(df)
+        errors.extend(f"{source}: {error}" for error in table_errors)
+        frames[name] = (source, sha256, df)
+    if errors:
+        raise ValueError("; ".join(errors))
+
+    os.makedirs(out_dir, exist_ok=True)
+    manifest = {
+        "format": COMPILED_FORMAT,
+        "snapshot_format": SNAPSHOT_FORMAT,
+        "erstellt": datetime.now().isoformat(timespec="seconds"),
+        "tabellen": {},
+    }
+    for name, (source, sha256, df) in frames.items():
+        # Inhalts-Hash im Namen: laufende Leser des alten Manifests bleiben gültig
+        filename = f"{name}-{sha256[:12]}.arrow"
+        _write_ipc(pa.Table.from_pandas(df, preserve_index=True), os.path.join(out_dir, filename))
+        manifest["tabellen"][name] = {
+            "quelle": source,
+            "sha256": sha256,
+            "datei": filename,
+            "zeilen": len(df),
+            "bytes": os.path.getsize(os.path.join(out_dir, filename)),
+        }
+
+    tmp_path = os.path.join(out_dir, f"{MANIFEST_NAME}.{os.getpid()}.tmp")
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2, ensure_ascii=False)
+    os.replace(tmp_path, os.path.join(out_dir, MANIFEST_NAME))
+    _remove_unreferenced(out_dir, manifest)
+    return manifest, notes
+
+
+def _write_ipc(table, path):
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    # Unkomprimiert, damit die Puffer direkt aus der gemappten Datei nutzbar sind
+    with pa.OSFile(tmp_path, "wb") as sink:
+        with pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+    os.replace(tmp_path, path)
+
+
+def _remove_unreferenced(out_dir, manifest):
+    referenced = {entry["datei"] for entry in manifest["tabellen"].values()}
+    for filename in os.listdir(out_dir):
+        if filename.endswith(".arrow") and filename not in referenced:
+            try:
+                os.remove(os.path.join(out_dir, filename))
+            except OSError:
+                pass
+
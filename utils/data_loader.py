@@ -4,166 +4,701 @@ Datenlade- und Verarbeitungsfunktionen
 
 import streamlit as st
 import pandas as pd
+import numpy as np
 import json
+import os
+from contextlib import closing
 
+from . import storage
+from .cache import file_fingerprint, load_shared, load_snapshot
+from .compiled import load_compiled
+from .excel_reader import read_sheet
+from .incremental import IncrementalLedger
+from .names import is_shared_box
+from .profiling import cache_miss, profiled
+from .ranking import DEFAULT_METHOD, RankingIndex, count_boxes
+from .timeseries import build_timeseries, kisten_pro_tag, strafen_pro_tag, termin_range
 
-@st.cache_data
-def load_data():
+KISTENLISTE_PATH = "Kistenliste.xlsx"
+STRAFEN_PATH = "Strafenkatalog.xlsx"
+KADER_PATH = "kader.json"
+STRAFENKATALOG_PATH = "strafenkatalog.json"
+
+# JSON-Quelle -> Tabellenname im kompilierten Stand (siehe utils/compiled.py)
+JSON_TABLES = {KADER_PATH: "kader", STRAFENKATALOG_PATH: "strafenkatalog"}
+
+# Nur diese Spalten werden aus den Arbeitsmappen gelesen
+KISTENLISTE_COLUMNS = ["Name", "Grund", "Datum", "Bezahlt", "Anmerkung"]
+STRAFEN_COLUMNS = ["Termin", "Was?", "Wer?", "Wie viel?", "Bezahlt?"]
+STRAFEN_DTYPES = {"Bezahlt?": "float64"}
+
+# Spalten mit wenigen verschiedenen Werten werden als category gespeichert
+KISTENLISTE_CATEGORIES = ["Name", "Grund", "Bezahlt_Status"]
+STRAFEN_CATEGORIES = ["Was?", "Wer?", "Bezahlt_Status"]
+STATUS_CATEGORIES = ["Bezahlt", "Offen"]
+
+
+# Wie oft eine Arbeitsmappe neu gelesen wird, wenn sie sich beim Lesen ändert
+READ_ATTEMPTS = 3
+
+
+class SourceChangedError(RuntimeError):
+    """Die Quelldatei passt nicht (mehr) zum angefragten Fingerprint."""
+
+
+# Vom Hintergrund-Watcher festgehaltene Fingerprints (Pfad -> Fingerprint).
+# Solange ein Neuaufbau läuft, lesen alle Sessions weiter den alten Stand.
+_pinned_fingerprints = {}
+
+
+def source_fingerprint(path):
+    """
+    Fingerprint, unter dem eine Quelldatei gelesen wird: der vom Watcher
+    festgehaltene (siehe utils/warmup.py), sonst der aktuelle der Datei.
+    """
+    fingerprint = _pinned_fingerprints.get(path)
+    if fingerprint is None:
+        fingerprint = file_fingerprint(path)
+    return fingerprint
+
+
+def _load_current(load, path, fingerprint):
+    """
+    Ruft load(fingerprint) auf. Ist der angefragte (z.B. festgehaltene)
+    Stand nicht mehr gecacht und die Datei inzwischen geändert, wird der
+    aktuelle Stand der Datei geladen.
+    """
+    try:
+        return load(fingerprint)
+    except SourceChangedError:
+        return load(file_fingerprint(path))
+
+
+def require_loaded(df, path, fingerprint):
+    """
+    Für gecachte Berechnungen: löst RuntimeError aus, wenn load_data() bzw.
+    load_strafen_excel() eine vorhandene Datei (fingerprint nicht None)
+    nicht laden konnte, denn eine Ausnahme wird nicht gecacht, ein leeres
+    Ergebnis schon. Eine fehlende Datei bleibt None, ihr Fingerprint ist
+    Teil des Cache-Schlüssels.
+    """
+    if df is None and fingerprint is not None:
+        raise RuntimeError(f"{path} konnte nicht geladen werden")
+    return df
+
+
+def pin_fingerprints(fingerprints):
+    """Legt die Fingerprints fest, die ab jetzt an alle Sessions ausgeliefert werden."""
+    global _pinned_fingerprints
+    _pinned_fingerprints = dict(fingerprints)
+
+
+def data_version():
+    """
+    Liefert die Fingerprints beider Excel-Dateien als Tupel.
+    Dient als Cache-Schlüssel für alle abgeleiteten Daten (Statistiken, Diagramme).
+    """
+    version = []
+    for path in (KISTENLISTE_PATH, STRAFEN_PATH):
+        try:
+            version.append(source_fingerprint(path))
+        except OSError:
+            version.append(None)
+    return tuple(version)
+
+
+@profiled(cached=True)
+def load_data(fingerprint=None):
     """
     Lädt die Excel-Datei Kistenliste.xlsx (Sheet: "Kistenliste").
     Bereinigt die Spalte "Name" und den Bezahlstatus ("Bezahlt").
-    Erstellt eine neue Spalte Bezahlt_Status mit den Werten "Bezahlt" oder "Offen".
+    Erstellt eine neue Spalte Bezahlt_Status mit den Werten "Bezahlt" oder "Offen"
+    (category) sowie Ist_Bezahlt (bool). Name und Grund sind category-Spalten.
+    Der Cache ist an den Fingerprint der Datei gebunden, Änderungen an der
+    Excel-Datei werden also beim nächsten Rerun übernommen.
+    fingerprint wählt eine bestimmte Version (Standard: source_fingerprint()).
     Gibt das DataFrame zurück oder zeigt einen Fehler an.
     """
     try:
-        df = pd.read_excel("Kistenliste.xlsx", sheet_name="Kistenliste")
-        df["Name"] = df["Name"].str.strip()
-
-        # Bezahlt-Status korrigieren
-        df["Bezahlt"] = df["Bezahlt"].fillna("").str.strip()
-        df["Bezahlt_Status"] = df["Bezahlt"].apply(
-            lambda x: "Bezahlt" if x == "J" else "Offen"
+        return _load_current(
+            _load_kistenliste, KISTENLISTE_PATH, fingerprint or source_fingerprint(KISTENLISTE_PATH)
         )
-
-        return df
     except Exception as e:
         st.error(f"❌ Fehler beim Laden der Datei: {e}")
         return None
 
 
+@st.cache_data(max_entries=2)
+def _load_kistenliste(fingerprint):
+    cache_miss()
+    # Kompilierter Stand (compile_data.py), solange er zur Datei passt
+    compiled = load_compiled("kistenliste", KISTENLISTE_PATH, fingerprint)
+    if compiled is not None:
+        return compiled
+    return load_snapshot(
+        "kistenliste", fingerprint, lambda: _parse_kistenliste(fingerprint)
+    )
+
+
+def _parse_kistenliste(fingerprint=None):
+    raw = read_source(
+        KISTENLISTE_PATH,
+        fingerprint,
+        lambda: read_sheet(KISTENLISTE_PATH, "Kistenliste", KISTENLISTE_COLUMNS),
+    )
+    return KISTEN_LEDGER.update(raw, fingerprint)
+
+
+def read_source(path, fingerprint, read):
+    """
+    Liest eine Quelldatei mit read() und stellt sicher, dass das Gelesene
+    zum Fingerprint gehört, unter dem es gecacht wird: Vor und nach dem
+    Lesen wird der Fingerprint verglichen, ändert sich die Datei dabei, wird
+    neu gelesen. Gehört fingerprint nicht (mehr) zur Datei (z.B. ein vom
+    Watcher festgehaltener alter Stand), wird SourceChangedError ausgelöst,
+    statt neuen Inhalt unter dem alten Schlüssel abzulegen. Ausnahmen werden
+    von st.cache_data und load_snapshot nicht gespeichert.
+    """
+    for _ in range(READ_ATTEMPTS):
+        before = file_fingerprint(path)
+        if fingerprint is not None and before != fingerprint:
+            raise SourceChangedError(f"{path} hat sich geändert, bitte neu laden")
+        raw = read()
+        if file_fingerprint(path) == before:
+            return raw
+    raise SourceChangedError(f"{path} ändert sich laufend beim Lesen")
+
+
+def _clean_kistenliste(raw):
+    df = raw.copy()
+    df["Name"] = strip_to_category(df["Name"])
+
+    # Datum wie Termin bei den Strafen (Text wie "letzte Saison" wird NaT)
+    if "Datum" in df.columns:
+        df["Datum"] = parse_termin(df["Datum"])
+
+    # Bezahlt-Status korrigieren
+    df["Bezahlt"] = map_unique(df["Bezahlt"], lambda v: v.fillna("").str.strip())
+    _set_status(df, df["Bezahlt"] == "J")
+
+    return compact_dtypes(df, KISTENLISTE_CATEGORIES)
+
+
+def _finish_kistenliste(df):
+    return drop_unused_categories(df, KISTENLISTE_CATEGORIES)
+
+
+def _set_status(df, paid):
+    """
+    Setzt Ist_Bezahlt (bool) und Bezahlt_Status ("Bezahlt"/"Offen") vektorisiert.
+    """
+    paid = paid.fillna(False).to_numpy(dtype=bool)
+    df["Ist_Bezahlt"] = paid
+    df["Bezahlt_Status"] = pd.Categorical.from_codes(
+        np.where(paid, 0, 1).astype(np.int8), categories=STATUS_CATEGORIES
+    )
+
+
+def compact_dtypes(df, categories):
+    """
+    Gemeinsame Typ-Stufe beider Loader: Spalten mit wenigen Ausprägungen
+    als category, Beträge als float32.
+    """
+    for col in categories:
+        df[col] = df[col].astype("category")
+    if "Betrag" in df.columns:
+        df["Betrag"] = df["Betrag"].astype(np.float32)
+    return df
+
+
+def map_unique(values, func):
+    """
+    Wendet func nur auf die verschiedenen Werte einer Spalte an und verteilt
+    das Ergebnis über die factorize-Codes wieder auf alle Zeilen.
+    Fehlende Werte werden ebenfalls einmal durch func geschickt.
+    """
+    codes, uniques = pd.factorize(values)
+    uniques = pd.Series(list(uniques) + [np.nan], dtype=object)
+    # Code -1 (fehlender Wert) greift auf das angehängte NaN am Ende zu
+    mapped = func(uniques).to_numpy()
+    return pd.Series(mapped[codes], index=values.index, name=values.name)
+
+
+def strip_to_category(values):
+    """
+    Entfernt Leerzeichen und liefert eine category-Spalte.
+    str.strip() läuft nur über die verschiedenen Werte.
+    """
+    codes, uniques = pd.factorize(values)
+    stripped = pd.Categorical(pd.Series(uniques, dtype=object).str.strip())
+    # Code -1 (fehlender Wert) bleibt -1
+    new_codes = np.append(stripped.codes, -1)[codes]
+    return pd.Series(
+        pd.Categorical.from_codes(new_codes, dtype=stripped.dtype),
+        index=values.index,
+        name=values.name,
+    )
+
+
+def drop_unused_categories(df, categories):
+    """Entfernt Kategorien, die nach Änderungen nicht mehr vorkommen."""
+    for col in categories:
+        df[col] = df[col].cat.remove_unused_categories()
+    return df
+
+
+@profiled()
 def create_open_boxes_table(df):
     """
     Erstellt Tabelle mit offenen Kisten pro Person:
-    - Berücksichtigt "Geteilte Kisten" und teilt diese anteilig auf.
-    - Gibt eine sortierte Tabelle mit Namen und Anzahl offener Kisten zurück.
+    - Berücksichtigt geteilte Kisten ("Geteilte Kiste"/"Geteilte Kisten")
+      und teilt diese anteilig auf.
+    - Gibt eine sortierte Tabelle mit Namen und Anzahl offener Kisten zurück
+      (siehe sort_open_boxes()).
+    Vollständig vektorisiert (split/explode/groupby) statt iterrows().
     """
-    # Nur offene Kisten
-    open_df = df[df["Bezahlt_Status"] == "Offen"].copy()
+    combined = _open_box_parts(df)
 
-    # Namen und deren Anzahl sammeln
-    name_counts = {}
-
-    for _, row in open_df.iterrows():
-        name = str(row["Name"]).strip()
-
-        # Prüfen ob "geteilte Kisten"
-        if name.lower() == "geteilte kisten":
-            # Namen aus Anmerkung auslesen
-            anmerkung = str(row.get("Anmerkung", ""))
-            if anmerkung and anmerkung != "nan":
-                # Teile an Kommas
-                shared_names = [n.strip() for n in anmerkung.split(",") if n.strip()]
-                # Jeder bekommt anteilig 1/Anzahl
-                fraction = 1.0 / len(shared_names) if shared_names else 0
-                for shared_name in shared_names:
-                    name_counts[shared_name] = (
-                        name_counts.get(shared_name, 0) + fraction
-                    )
-        else:
-            # Normaler Eintrag - volle Kiste
-            name_counts[name] = name_counts.get(name, 0) + 1.0
-
-    # In DataFrame umwandeln
-    if name_counts:
-        result = pd.DataFrame(
-            list(name_counts.items()), columns=["Name", "Offene Kisten"]
-        )
-        result = result.sort_values("Offene Kisten", ascending=False)
-        # Runden auf 2 Dezimalstellen
-        result["Offene Kisten"] = result["Offene Kisten"].round(2)
-        return result
+    if combined.empty:
+        return pd.DataFrame({"Name": [], "Offene Kisten": []})
+
+    # Summe pro Name in Reihenfolge der Nennung (bincount addiert sequentiell
+    # und liefert dadurch exakt dieselben Fließkommawerte wie die Einzelsummen)
+    codes, uniques = pd.factorize(combined["Name"], sort=False)
+    totals = np.bincount(codes, weights=combined["Anteil"].to_numpy())
+    result = pd.DataFrame({"Name": uniques, "Offene Kisten": totals})
+    return sort_open_boxes(result)
+
+
+def sort_open_boxes(result):
+    """
+    Rundet auf 2 Dezimalstellen und sortiert absteigend nach offenen Kisten,
+    bei Gleichstand nach Name. Gleiche Reihenfolge für DataFrame, Ledger-
+    Aggregate und SQLite (dort ORDER BY "Offene Kisten" DESC, name).
+    """
+    result = result.assign(**{"Offene Kisten": result["Offene Kisten"].round(2)})
+    order = np.lexsort(
+        (result["Name"].astype(str).to_numpy(), -result["Offene Kisten"].to_numpy())
+    )
+    return result.iloc[order]
+
+
+def _open_box_parts(df):
+    """
+    Anteile offener Kisten pro Name (eine Zeile pro Person und Kiste,
+    geteilte Kisten aufgeteilt) in Reihenfolge des Ledgers.
+    """
+    # Nur offene Kisten, Position im Ledger als Index
+    open_df = df[df["Bezahlt_Status"] == "Offen"].reset_index(drop=True)
+    names = open_df["Name"].astype(object).fillna("nan").astype(str).str.strip()
+
+    # Geteilte Kiste? (derselbe Vergleich wie im Spieler-Index)
+    shared = map_unique(names, lambda v: v.map(is_shared_box)).astype(bool)
+
+    # Normaler Eintrag - volle Kiste
+    full = pd.DataFrame({"Name": names[~shared], "Anteil": 1.0})
+
+    # Namen aus Anmerkung auslesen und an Kommas teilen
+    if "Anmerkung" in open_df.columns:
+        anmerkung = open_df.loc[shared, "Anmerkung"].fillna("nan").astype(str)
     else:
+        anmerkung = pd.Series("", index=names[shared].index)
+    anmerkung = anmerkung[(anmerkung != "") & (anmerkung != "nan")]
+    shared_names = anmerkung.str.split(",").explode().str.strip()
+    shared_names = shared_names[shared_names.notna() & (shared_names != "")]
+
+    # Jeder bekommt anteilig 1/Anzahl
+    per_row = shared_names.groupby(level=0).transform("size")
+    parts = pd.DataFrame({"Name": shared_names, "Anteil": 1.0 / per_row})
+
+    # Reihenfolge des Ledgers beibehalten (erste Nennung bestimmt die Reihenfolge)
+    return pd.concat([full, parts]).sort_index(kind="stable")
+
+
+def _kisten_contributions(df):
+    """Beiträge einzelner Kisten-Zeilen zu den laufenden Aggregaten."""
+    parts = _open_box_parts(df)
+    offen = (~df["Ist_Bezahlt"]).sum()
+    return {
+        "offene_kisten": parts.set_index("Name")["Anteil"],
+        "kisten_pro_name": count_boxes(df),
+        "pro_tag": kisten_pro_tag(df),
+        "gesamt": pd.Series(
+            {"eintraege": len(df), "offen": offen, "bezahlt": len(df) - offen},
+            dtype=float,
+        ),
+    }
+
+
+def _strafen_contributions(df):
+    """Beiträge einzelner Strafen-Zeilen zu den laufenden Aggregaten."""
+    is_open = ~df["Ist_Bezahlt"]
+    open_df = df[is_open & df["Wer?"].notna()]
+    per_person = pd.DataFrame(
+        {
+            "Offener Betrag (€)": open_df["Betrag"].to_numpy(dtype=float),
+            "Anzahl Strafen": open_df["Was?"].notna().to_numpy(dtype=float),
+        },
+        index=pd.Index(open_df["Wer?"].astype(object), name="Name"),
+    )
+    return {
+        "offen_pro_person": per_person,
+        "pro_tag": strafen_pro_tag(df),
+        "gesamt": pd.Series(
+            {
+                "gesamt": len(df),
+                "offen": is_open.sum(),
+                "bezahlt": df["Ist_Bezahlt"].sum(),
+                "betrag_offen": df.loc[is_open, "Betrag"].astype(np.float64).sum(),
+                "betrag_bezahlt": df.loc[~is_open, "Betrag"].astype(np.float64).sum(),
+            },
+            dtype=float,
+        ),
+    }
+
+
+@profiled()
+def load_open_boxes():
+    """
+    Offene Kisten pro Person für die aktuelle Kistenliste.
+    Kommt aus den laufend gepflegten Aggregaten, falls der Ledger auf dem
+    aktuellen Stand ist, sonst über create_open_boxes_table().
+    Mit SQLite-Speicher (FCM_STORAGE=sqlite) als SQL-Abfrage.
+    """
+    if storage.is_enabled():
+        try:
+            conn = sync_storage()
+        except Exception as e:
+            st.error(f"❌ Fehler beim Abgleich der Datenbank: {e}")
+            return pd.DataFrame({"Name": [], "Offene Kisten": []})
+        with closing(conn):
+            return storage.offene_kisten(conn, storage.current_season())
+
+    try:
+        fingerprint = source_fingerprint(KISTENLISTE_PATH)
+    except OSError:
+        fingerprint = None
+
+    # Fingerprint und Aggregate zusammen lesen, nie einen halben Stand
+    ledger_fingerprint, aggregates = KISTEN_LEDGER.snapshot()
+    if fingerprint is not None and ledger_fingerprint == fingerprint:
+        open_boxes = aggregates["offene_kisten"]
+        open_boxes = open_boxes[open_boxes.abs() > 1e-9]
+        result = open_boxes.rename("Offene Kisten").rename_axis("Name").reset_index()
+        return sort_open_boxes(result)
+
+    df = load_data()
+    if df is None:
         return pd.DataFrame({"Name": [], "Offene Kisten": []})
+    return create_open_boxes_table(df)
 
 
-def create_ranking_table(df):
+@profiled()
+def create_ranking_table(df, method=DEFAULT_METHOD):
     """
     Erstellt eine Tabelle:
     Listet Personen nach Anzahl Kisten absteigend.
-    Vergibt Medaillen-Emojis für die Top 3.
-    Fügt Rangnummern hinzu.
+    Fügt Rangnummern hinzu, Gleichstände teilen sich den Rang
+    (method "competition": 1, 1, 3 oder "dense": 1, 1, 2).
+    Vergibt Medaillen-Emojis für die Ränge 1 bis 3.
+    """
+    return RankingIndex.from_frame(df).table(method)
+
+
+@profiled()
+def load_ranking():
+    """
+    Rangliste der aktuellen Kistenliste als RankingIndex (siehe utils/ranking.py).
+    Ist der Ledger auf dem aktuellen Stand, werden nur die geänderten
+    Personen aus seinen Aggregaten übernommen, sonst wird einmal pro
+    Datenversion gezählt.
     """
-    ranking = df["Name"].value_counts().reset_index()
-    ranking.columns = ["Name", "Anzahl Kisten"]
-    ranking["Rang"] = range(1, len(ranking) + 1)
+    try:
+        fingerprint = source_fingerprint(KISTENLISTE_PATH)
+    except OSError:
+        return RankingIndex()
+
+    ledger_fingerprint, aggregates = KISTEN_LEDGER.snapshot()
+    if ledger_fingerprint == fingerprint:
+        KISTEN_RANKING.sync(aggregates["kisten_pro_name"])
+        return KISTEN_RANKING
+
+    df = load_data(fingerprint)
+    if df is None:
+        return RankingIndex()
+    return _build_ranking(fingerprint, df)
+
+
+@st.cache_resource(max_entries=2)
+def _build_ranking(fingerprint, _df):
+    # cache_resource: ein gemeinsamer (nur gelesener) Index pro Datenversion
+    return RankingIndex.from_frame(_df)
+
 
-    medals = {1: "🥇", 2: "🥈", 3: "🥉"}
-    ranking["Medaille"] = ranking["Rang"].map(lambda x: medals.get(x, ""))
+@profiled(cached=True)
+def load_timeseries():
+    """
+    Zeitreihen für Strafen und Kisten (siehe utils/timeseries.py) für die
+    aktuelle Datenversion.
+    """
+    return _load_timeseries(data_version())
 
-    return ranking[["Rang", "Medaille", "Name", "Anzahl Kisten"]]
 
+@st.cache_data(max_entries=2)
+def _load_timeseries(version):
+    cache_miss()
+    return build_timeseries(
+        _ledger_per_day(STRAFEN_LEDGER, version[1], load_strafen_excel, strafen_pro_tag),
+        _ledger_per_day(KISTEN_LEDGER, version[0], load_data, kisten_pro_tag),
+    )
 
-st.cache_data
 
+def _ledger_per_day(ledger, fingerprint, load, per_day):
+    """
+    Tagessummen eines Ledgers: aus seinen laufend gepflegten Aggregaten, wenn
+    er auf diesem Stand ist, sonst einmal aus dem geladenen DataFrame.
+    """
+    ledger_fingerprint, aggregates = ledger.snapshot()
+    if fingerprint is not None and ledger_fingerprint == fingerprint:
+        return aggregates["pro_tag"]
+    df = load(fingerprint)
+    if df is None:
+        return pd.DataFrame()
+    return per_day(df)
 
+
+@profiled(cached=True)
 def load_kader():
     """
     Lädt den Kader aus kader.json.
+    Gecacht pro Fingerprint der Datei.
     """
     try:
-        with open("kader.json", "r", encoding="utf-8") as f:
-            kader = json.load(f)
-
-        # Als DataFrame zurückgeben
-        df = pd.DataFrame(kader)
-        return df
+        return _load_json(KADER_PATH, source_fingerprint(KADER_PATH))
     except Exception as e:
         st.error(f"❌ Fehler beim Laden des Kaders: {e}")
         return pd.DataFrame()
 
 
-@st.cache_data
+@profiled(cached=True)
 def load_strafenkatalog():
     """
     Lädt den Strafenkatalog aus strafenkatalog.json als DataFrame.
+    Gecacht pro Fingerprint der Datei.
     """
     try:
-        with open("strafenkatalog.json", "r", encoding="utf-8") as f:
-            strafen = json.load(f)
-
-        # Als DataFrame zurückgeben
-        df = pd.DataFrame(strafen)
-        return df
+        return _load_json(STRAFENKATALOG_PATH, source_fingerprint(STRAFENKATALOG_PATH))
     except Exception as e:
         st.error(f"❌ Fehler beim Laden des Strafenkatalogs: {e}")
         return pd.DataFrame()
 
 
-@st.cache_data
-def load_strafen_excel():
+@st.cache_data(max_entries=4)
+def _load_json(path, fingerprint):
+    cache_miss()
+    compiled = load_compiled(JSON_TABLES[path], path, fingerprint)
+    if compiled is not None:
+        return compiled
+    return _read_json(path)
+
+
+def _read_json(path):
+    with open(path, "r", encoding="utf-8") as f:
+        # Als DataFrame zurückgeben
+        return pd.DataFrame(json.load(f))
+
+
+@profiled(cached=True)
+def load_strafen_excel(fingerprint=None):
     """
     Lädt die aktuellen Strafen aus Strafenkatalog.xlsx.
     Bereinigt die Daten und berechnet Bezahlt-Status.
+    Wie load_data() an den Fingerprint der Datei gebunden.
     """
     try:
-        df = pd.read_excel("Strafenkatalog.xlsx", sheet_name="Tabelle1")
+        return _load_current(
+            _load_strafen, STRAFEN_PATH, fingerprint or source_fingerprint(STRAFEN_PATH)
+        )
+    except Exception as e:
+        st.error(f"❌ Fehler beim Laden der Strafen: {e}")
+        return None
 
-        # Spalten umbenennen (Leerzeichen entfernen)
-        df.columns = df.columns.str.strip()
 
-        # Termin zu Datum konvertieren
-        df["Termin"] = pd.to_datetime(df["Termin"], errors="coerce")
+@st.cache_data(max_entries=2)
+def _load_strafen(fingerprint):
+    cache_miss()
+    compiled = load_compiled("strafen", STRAFEN_PATH, fingerprint)
+    if compiled is not None:
+        return compiled
+    return load_snapshot("strafen", fingerprint, lambda: _parse_strafen(fingerprint))
 
-        # Namen bereinigen
-        df["Wer?"] = df["Wer?"].str.strip()
 
-        # Bezahlt-Status: NaN = Offen, 1 = Bezahlt
-        df["Bezahlt_Status"] = df["Bezahlt?"].apply(
-            lambda x: "Bezahlt" if x == 1 else "Offen"
-        )
+def _parse_strafen(fingerprint=None):
+    # Spaltennamen werden beim Lesen ohne Leerzeichen verglichen
+    raw = read_source(
+        STRAFEN_PATH,
+        fingerprint,
+        lambda: read_sheet(
+            STRAFEN_PATH, "Tabelle1", STRAFEN_COLUMNS, dtypes=STRAFEN_DTYPES
+        ),
+    )
+    return STRAFEN_LEDGER.update(raw, fingerprint)
 
-        # "Wie viel?" bereinigen
-        df["Betrag"] = df["Wie viel?"].fillna(0)
 
-        # Sortieren nach Datum (neueste zuerst)
-        df = df.sort_values("Termin", ascending=False)
+def _clean_strafen(raw):
+    # Leere Zeilen und die Summenzeile ("Ergebnis") am Ende entfernen
+    df = raw.dropna(subset=["Was?", "Wer?"], how="all").copy()
 
-        return df
-    except Exception as e:
-        st.error(f"❌ Fehler beim Laden der Strafen: {e}")
+    # Termin zu Datum konvertieren
+    df["Termin"] = parse_termin(df["Termin"])
+
+    # Namen bereinigen
+    df["Wer?"] = strip_to_category(df["Wer?"])
+
+    # Bezahlt-Status: NaN = Offen, 1 = Bezahlt
+    _set_status(df, df["Bezahlt?"] == 1)
+
+    # "Wie viel?" bereinigen ("€ 0,50" -> 0.5)
+    df["Betrag"] = parse_betrag(df["Wie viel?"])
+
+    return compact_dtypes(df, STRAFEN_CATEGORIES)
+
+
+def _finish_strafen(df):
+    # Sortieren nach Datum (neueste zuerst), bei gleichem Datum in Zeilenreihenfolge
+    df = df.sort_values("Termin", ascending=False, kind="stable")
+    return drop_unused_categories(df, STRAFEN_CATEGORIES)
+
+
+def parse_termin(values):
+    """
+    Wandelt Termine in Datumswerte um. Excel liefert teils echte Datumswerte,
+    teils Text im Format "8/29/2025" oder "14.09.2025". Jeder Wert wird für
+    sich umgewandelt, das Ergebnis hängt also nicht von der Zeilenreihenfolge ab.
+    """
+    return map_unique(values, _parse_termin_unique)
+
+
+def _parse_termin_unique(values):
+    is_text = values.map(lambda v: isinstance(v, str)).astype(bool)
+    text = values.where(is_text).astype("string").str.strip()
+    dates = pd.to_datetime(values.where(~is_text), errors="coerce")
+    us = pd.to_datetime(text, format="%m/%d/%Y", errors="coerce")
+    de = pd.to_datetime(text, format="%d.%m.%Y", errors="coerce")
+    return dates.fillna(us).fillna(de)
+
+
+def parse_betrag(values):
+    """
+    Wandelt Beträge wie "€ 15,00" oder 15 in Zahlen um.
+    Fehlende oder ungültige Werte werden zu 0.
+    """
+    return map_unique(values, _parse_betrag_unique)
+
+
+def _parse_betrag_unique(values):
+    text = (
+        values.astype("string")
+        .str.replace("€", "", regex=False)
+        .str.replace(".", "", regex=False)
+        .str.replace(",", ".", regex=False)
+        .str.strip()
+    )
+    numeric = pd.to_numeric(values, errors="coerce")
+    parsed = pd.to_numeric(text, errors="coerce")
+    return numeric.fillna(parsed).fillna(0).astype(float)
+
+
+# Laufende Ledger pro Prozess: nur angehängte/geänderte Zeilen werden bereinigt
+KISTEN_LEDGER = IncrementalLedger(
+    _clean_kistenliste, _kisten_contributions, finish=_finish_kistenliste
+)
+STRAFEN_LEDGER = IncrementalLedger(
+    _clean_strafen, _strafen_contributions, finish=_finish_strafen
+)
+# Aus KISTEN_LEDGER gepflegte Rangliste (siehe load_ranking())
+KISTEN_RANKING = RankingIndex()
+
+
+# Spalten der Detailansicht im Strafen-Tab
+STRAFEN_DETAIL_COLUMNS = ["Termin", "Was?", "Wer?", "Betrag", "Bezahlt_Status"]
+
+
+@profiled(cached=True)
+def load_strafen_detail():
+    """
+    Lädt die Detailansicht der Strafen (siehe build_strafen_detail) für die
+    aktuelle Version von Strafenkatalog.xlsx.
+    """
+    try:
+        fingerprint = source_fingerprint(STRAFEN_PATH)
+    except OSError:
         return None
+    return _load_strafen_detail(fingerprint)
 
 
+@st.cache_data(max_entries=2)
+def _load_strafen_detail(fingerprint):
+    cache_miss()
+    return load_shared(
+        "strafen-detail", fingerprint, lambda: _build_strafen_detail(fingerprint)
+    )
+
+
+def _build_strafen_detail(fingerprint):
+    df = require_loaded(load_strafen_excel(fingerprint), STRAFEN_PATH, fingerprint)
+    if df.empty:
+        return None
+    return build_strafen_detail(df)
+
+
+@profiled()
+def build_strafen_detail(df):
+    """
+    Bereitet die Detailansicht der Strafen einmal pro Datenversion vor:
+    - "table": Anzeigespalten mit bereits formatiertem Datum
+    - "index": Zeilenpositionen pro (Person, Status), "Alle" als Platzhalter
+    - "personen": sortierte Liste der Personen für den Filter
+    - "termin": echtes Datum pro Zeile (Sortierschlüssel für "Termin")
+    """
+    table = df[STRAFEN_DETAIL_COLUMNS].reset_index(drop=True)
+    termin = table["Termin"].copy()
+    table["Termin"] = table["Termin"].dt.strftime("%d.%m.%Y")
+
+    index = {}
+    for person, positions in table.groupby("Wer?", observed=True).indices.items():
+        index[(person, "Alle")] = positions
+    for status, positions in table.groupby("Bezahlt_Status", observed=True).indices.items():
+        index[("Alle", status)] = positions
+    for key, positions in table.groupby(
+        ["Wer?", "Bezahlt_Status"], observed=True
+    ).indices.items():
+        index[key] = positions
+
+    return {
+        "table": table,
+        "index": index,
+        "personen": sorted(table["Wer?"].dropna().unique().tolist()),
+        "termin": termin,
+    }
+
+
+@profiled()
+def filter_strafen_detail(detail, person="Alle", status="Alle"):
+    """
+    Liefert die Zeilen der Detailansicht für Person und Status über den
+    vorberechneten Index, ohne das gesamte DataFrame zu maskieren.
+    """
+    table = detail["table"]
+    if person == "Alle" and status == "Alle":
+        return table
+    positions = detail["index"].get((person, status))
+    if positions is None:
+        return table.iloc[0:0]
+    return table.iloc[positions]
+
+
+@profiled()
 def calculate_strafen_per_person(df):
     """
     Berechnet offene Strafen pro Person.
@@ -176,7 +711,9 @@ def calculate_strafen_per_person(df):
 
     # Gruppieren nach Person
     strafen_summary = (
-        open_df.groupby("Wer?").agg({"Betrag": "sum", "Was?": "count"}).reset_index()
+        open_df.groupby("Wer?", observed=True)
+        .agg({"Betrag": "sum", "Was?": "count"})
+        .reset_index()
     )
 
     strafen_summary.columns = ["Name", "Offener Betrag (€)", "Anzahl Strafen"]
@@ -185,6 +722,7 @@ def calculate_strafen_per_person(df):
     return strafen_summary
 
 
+@profiled()
 def get_strafen_stats(df):
     """
     Berechnet Statistiken über alle Strafen.
@@ -212,3 +750,76 @@ def get_strafen_stats(df):
         "betrag_offen": betrag_offen,
         "betrag_bezahlt": betrag_bezahlt,
     }
+
+
+@profiled()
+def sync_storage(season=None, path=None, force=False, version=None):
+    """
+    Importiert Kistenliste, Strafen, Kader und Strafenkatalog in den
+    SQLite-Speicher (siehe utils/storage.py). Die Excel-Dateien werden als
+    Saison season (Standard: aktuelle Saison) übernommen, Quellen mit
+    unverändertem Fingerprint werden übersprungen. version wählt wie bei
+    data_version() die Fingerprints der Excel-Dateien.
+    Gibt die offene Verbindung zurück.
+    """
+    season = season or storage.current_season()
+    kisten_fingerprint, strafen_fingerprint = version or data_version()
+    conn = storage.connect(path)
+    try:
+        synced = {} if force else storage.synced_fingerprints(conn, season)
+
+        fingerprint = kisten_fingerprint or source_fingerprint(KISTENLISTE_PATH)
+        if synced.get("kistenliste") != fingerprint:
+            df = _load_kistenliste(fingerprint)
+            storage.import_kisten(conn, season, df, _open_box_parts(df), fingerprint)
+
+        fingerprint = strafen_fingerprint or source_fingerprint(STRAFEN_PATH)
+        if synced.get("strafen") != fingerprint:
+            storage.import_strafen(conn, season, _load_strafen(fingerprint), fingerprint)
+
+        for name, path_json, loader in (
+            ("kader", KADER_PATH, load_kader),
+            ("strafenkatalog", STRAFENKATALOG_PATH, load_strafenkatalog),
+        ):
+            if not os.path.exists(path_json):
+                continue
+            fingerprint = source_fingerprint(path_json)
+            if synced.get(name) != fingerprint:
+                df = loader()
+                if not df.empty:
+                    storage.import_table(conn, name, df, fingerprint)
+    except Exception:
+        conn.close()
+        raise
+    return conn
+
+
+@profiled()
+def query_strafen(person="Alle", status="Alle", von=None, bis=None, season=None):
+    """
+    Strafen gefiltert nach Person, Status und Zeitraum (Termin von/bis inklusive).
+    Mit SQLite-Speicher über die Indizes der Datenbank (auch ältere Saisons),
+    sonst aus der aktuellen Strafenliste.
+    """
+    person = None if person == "Alle" else person
+    status = None if status == "Alle" else status
+
+    if storage.is_enabled():
+        with closing(sync_storage()) as conn:
+            return storage.strafen(
+                conn, season or storage.current_season(), person, status, von, bis
+            )
+
+    df = load_strafen_excel()
+    if df is None:
+        return pd.DataFrame(columns=STRAFEN_DETAIL_COLUMNS)
+    # Zeitraum per Binärsuche (df ist absteigend nach Termin sortiert)
+    if von is not None or bis is not None:
+        start, stop = termin_range(df["Termin"], von, bis)
+        df = df.iloc[start:stop]
+    mask = pd.Series(True, index=df.index)
+    if person is not None:
+        mask &= df["Wer?"] == person
+    if status is not None:
+        mask &= df["Bezahlt_Status"] == status
+    return df.loc[mask, STRAFEN_DETAIL_COLUMNS].reset_index(drop=True)
@@ -0,0 +1,53 @@
+"""
+Streamender Excel-Reader für die Arbeitsmappen der Mannschaftskasse
+"""
+
+from openpyxl import load_workbook
+import pandas as pd
+
+
+def _is_empty(value):
+    return value is None or (isinstance(value, str) and not value.strip())
+
+
+def read_sheet(path, sheet_name, columns, dtypes=None):
+    """
+    Liest nur die angegebenen Spalten eines Sheets im read-only Modus von
+    openpyxl (Zeile für Zeile, ohne das ganze Sheet zu materialisieren).
+    - Spaltenköpfe werden ohne Leerzeichen verglichen ("Wer? " == "Wer?")
+    - Vollständig leere Zeilen werden übersprungen, auch Blöcke mitten in
+      der Liste; das Sheet wird immer bis zum Ende gelesen
+    - Zellen rechts der letzten benötigten Spalte werden nicht geladen
+    - dtypes legt den Typ einzelner Spalten fest (Standard: object)
+    """
+    dtypes = dtypes or {}
+    wb = load_workbook(path, read_only=True, data_only=True)
+    try:
+        ws = wb[sheet_name]
+        header = [
+            str(h).strip() if h is not None else ""
+            for h in next(ws.iter_rows(max_row=1, values_only=True), ())
+        ]
+
+        missing = [col for col in columns if col not in header]
+        if missing:
+            raise ValueError(f"Spalten fehlen in '{sheet_name}': {', '.join(missing)}")
+        positions = [header.index(col) for col in columns]
+
+        data = [[] for _ in columns]
+        rows = ws.iter_rows(min_row=2, max_col=max(positions) + 1, values_only=True)
+        for row in rows:
+            values = [row[i] if i < len(row) else None for i in positions]
+            if all(_is_empty(v) for v in values):
+                continue
+            for column, value in zip(data, values):
+                column.append(value)
+    finally:
+        wb.close()
+
+    return pd.DataFrame(
+        {
+            col: pd.Series(values, dtype=dtypes.get(col, object))
+            for col, values in zip(columns, data)
+        }
+    )
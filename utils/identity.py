@@ -0,0 +1,327 @@
+"""
+Zuordnung der Namen aus Kistenliste und Strafen zum Kader
+
+Die Ledger nennen dieselbe Person unterschiedlich ("Köhne", "Coach Nico",
+"Robin Richard Wenning"). build_player_index() ordnet einmal pro
+Datenversion jeden vorkommenden Namen einem Kader-Eintrag zu:
+- Vergleich ohne Groß-/Kleinschreibung und überzählige Leerzeichen
+- voller Name, erster und letzter Namensteil, eindeutiger Nachname oder
+  Vorname sowie vom Verein bestätigte Aliase aus aliase.json
+  ({"Alias": Rückennummer}, ausgeliefert leer)
+- bei geteilten Kisten zählt jede in der Anmerkung genannte Person anteilig
+
+Zugeordnet wird pro verschiedenem Namen, nicht pro Zeile. Pro Spieler werden
+Kennzahlen und Zeilenpositionen vorberechnet, die Spielerseite liest nur noch
+nach. Nicht (eindeutig) zuordenbare Namen stehen in "nicht_zugeordnet".
+"""
+
+import json
+import os
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from .cache import file_fingerprint, load_shared
+from .data_loader import (
+    KADER_PATH,
+    KISTENLISTE_PATH,
+    STRAFEN_PATH,
+    data_version,
+    load_data,
+    load_kader,
+    load_strafen_excel,
+    require_loaded,
+    source_fingerprint,
+)
+from .names import SHARED_BOX_NAMES, is_shared_box, normalize_name
+from .profiling import cache_miss, profiled
+from .ranking import RankingIndex
+
+ALIASES_PATH = "aliase.json"
+
+PLAYER_COLUMNS = [
+    "Name",
+    "Position",
+    "Kisten",
+    "Geteilte Kisten",
+    "Offene Kisten",
+    "Strafen",
+    "Offene Strafen",
+    "Betrag gesamt (€)",
+    "Offener Betrag (€)",
+]
+
+
+def name_keys(kader, aliases=None):
+    """
+    Vergleichsschlüssel pro Art ("voll", "nachname", "vorname") -> Rückennummer.
+    Schlüssel, die auf mehrere Spieler passen (z.B. zwei Spieler namens Till),
+    zeigen auf None.
+    """
+    keys = {"voll": {}, "nachname": {}, "vorname": {}}
+
+    def add(kind, key, nummer):
+        if not key:
+            return
+        known = keys[kind].get(key, nummer)
+        keys[kind][key] = nummer if known == nummer else None
+
+    for row in kader.itertuples(index=False):
+        nummer = int(row.nummer)
+        vorname, nachname = normalize_name(row.vorname), normalize_name(row.nachname)
+        add("voll", f"{vorname} {nachname}", nummer)
+        add("nachname", nachname, nummer)
+        # "von Bülow" auch als "Bülow"
+        add("nachname", nachname.rsplit(" ", 1)[-1], nummer)
+        add("vorname", vorname, nummer)
+    for alias, nummer in (aliases or {}).items():
+        add("voll", normalize_name(alias), int(nummer))
+    return keys
+
+
+def resolve_name(name, keys):
+    """
+    Ordnet einen Namen zu. Gibt (Rückennummer oder None, Status) zurück,
+    Status ist "zugeordnet", "mehrdeutig" oder "unbekannt".
+    """
+    key = normalize_name(name)
+    parts = key.split()
+    if not parts:
+        return None, "unbekannt"
+
+    lookups = [("voll", key)]
+    if len(parts) > 1:
+        # "Robin Richard Wenning" -> "robin wenning", sonst nur der Nachname
+        # ("Thies Vater" ist nicht Thies)
+        lookups += [("voll", f"{parts[0]} {parts[-1]}"), ("nachname", parts[-1])]
+    else:
+        lookups += [("nachname", key), ("vorname", key)]
+
+    ambiguous = False
+    for kind, lookup in lookups:
+        if lookup in keys[kind]:
+            nummer = keys[kind][lookup]
+            if nummer is not None:
+                return nummer, "zugeordnet"
+            ambiguous = True
+    return None, "mehrdeutig" if ambiguous else "unbekannt"
+
+
+def read_aliases(path=ALIASES_PATH):
+    """Aliase aus aliase.json ({"Alias": Rückennummer}), leer ohne Datei."""
+    if not os.path.exists(path):
+        return {}
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+@profiled()
+def build_player_index(kader, df_kisten, df_strafen, aliases=None):
+    """
+    Baut den Spieler-Index:
+    - "spieler": Kader (Index Rückennummer) mit Kennzahlen aus beiden Ledgern
+    - "kisten_zeilen" / "strafen_zeilen": Zeilenpositionen pro Rückennummer
+      (geteilte Kisten bei jeder genannten Person)
+    - "kisten_rang": Rang nach Kisten pro Rückennummer (RankingIndex.entry(),
+      nur Spieler mit Kisten)
+    - "nicht_zugeordnet": Name, Quellen, Zeilen, Grund (ein Eintrag pro Name)
+    """
+    keys = name_keys(kader, aliases)
+    full_names = kader["vorname"].str.strip() + " " + kader["nachname"].str.strip()
+    spieler = pd.DataFrame(
+        {
+            "Name": full_names.to_numpy(),
+            "Position": kader["position"].str.strip().to_numpy(),
+        },
+        index=pd.Index(kader["nummer"].astype(int), name="Nummer"),
+    )
+    unmatched = {}
+
+    # Kistenliste: eine Beteiligung pro (Zeile, Person), geteilte Kisten anteilig
+    kisten = _kisten_shares(df_kisten, keys, unmatched)
+    by_player = kisten.groupby("nummer")
+    spieler["Kisten"] = (~kisten["geteilt"]).groupby(kisten["nummer"]).sum()
+    spieler["Geteilte Kisten"] = by_player["geteilt"].sum()
+    open_share = kisten["anteil"].where(kisten["offen"], 0.0)
+    spieler["Offene Kisten"] = open_share.groupby(kisten["nummer"]).sum().round(2)
+
+    # Strafen
+    strafen = _strafen_rows(df_strafen, keys, unmatched)
+    by_player = strafen.groupby("nummer")
+    spieler["Strafen"] = by_player.size()
+    spieler["Offene Strafen"] = by_player["offen"].sum()
+    spieler["Betrag gesamt (€)"] = by_player["betrag"].sum()
+    open_amount = strafen["betrag"].where(strafen["offen"], 0.0)
+    spieler["Offener Betrag (€)"] = open_amount.groupby(strafen["nummer"]).sum()
+
+    counts = [col for col in PLAYER_COLUMNS if col not in ("Name", "Position")]
+    spieler[counts] = spieler[counts].fillna(0)
+    integer = ["Kisten", "Geteilte Kisten", "Strafen", "Offene Strafen"]
+    spieler[integer] = spieler[integer].astype(int)
+
+    # Rang über alle zugeordneten Schreibweisen, einmal pro Datenversion
+    ranking = RankingIndex(
+        pd.DataFrame({"Anzahl": spieler["Kisten"], "Offen": spieler["Offene Kisten"]})
+    )
+    ranks = {nummer: ranking.entry(nummer) for nummer in ranking.anzahl}
+
+    return {
+        "spieler": spieler[PLAYER_COLUMNS],
+        "kisten_zeilen": _positions(kisten),
+        "strafen_zeilen": _positions(strafen),
+        "kisten_rang": ranks,
+        "nicht_zugeordnet": pd.DataFrame(
+            [
+                (name, ", ".join(sources), rows, status)
+                for name, (sources, rows, status) in unmatched.items()
+            ],
+            columns=["Name", "Quellen", "Zeilen", "Grund"],
+        ),
+    }
+
+
+def _resolve_column(values, keys):
+    """
+    Ordnet die verschiedenen Werte einer Namensspalte einmal zu.
+    Gibt Rückennummer pro Zeile (NaN ohne Zuordnung), die verschiedenen
+    Werte, deren Codes pro Zeile und den Status pro Wert zurück.
+    """
+    codes, uniques = pd.factorize(values, sort=False)
+    resolved = [resolve_name(name, keys) for name in uniques]
+    # Letzter Eintrag NaN: Code -1 (fehlender Name) landet dort
+    numbers = np.array(
+        [np.nan if nummer is None else nummer for nummer, _ in resolved] + [np.nan],
+        dtype=float,
+    )
+    return numbers[codes], uniques, codes, [status for _, status in resolved]
+
+
+def _report(unmatched, uniques, codes, statuses, source, skip=()):
+    """Sammelt nicht zugeordnete Namen in unmatched: Name -> (Quellen, Zeilen, Grund)."""
+    rows = np.bincount(codes[codes >= 0], minlength=len(uniques))
+    for name, count, status in zip(uniques, rows, statuses):
+        if status != "zugeordnet" and normalize_name(name) not in skip:
+            sources, total, _ = unmatched.get(name, ([], 0, status))
+            unmatched[name] = (sources + [source], total + int(count), status)
+
+
+def _kisten_shares(df, keys, unmatched):
+    if df is None or df.empty:
+        return pd.DataFrame(
+            {"pos": [], "nummer": [], "anteil": [], "offen": [], "geteilt": []}
+        ).astype({"offen": bool, "geteilt": bool})
+
+    names = df["Name"].astype(object).to_numpy()
+    offen = ~df["Ist_Bezahlt"].to_numpy(dtype=bool)
+    nummer, uniques, codes, statuses = _resolve_column(names, keys)
+    _report(unmatched, uniques, codes, statuses, "Kistenliste", skip=SHARED_BOX_NAMES)
+
+    shared_codes = [
+        i for i, name in enumerate(uniques) if is_shared_box(name)
+    ]
+    shared = np.isin(codes, shared_codes)
+    direct = pd.DataFrame(
+        {
+            "pos": np.arange(len(df)),
+            "nummer": nummer,
+            "anteil": 1.0,
+            "offen": offen,
+            "geteilt": False,
+        }
+    )[~shared]
+
+    # Namen aus der Anmerkung geteilter Kisten, jeder bekommt 1/Anzahl
+    anmerkung = pd.Series(df["Anmerkung"].to_numpy(), dtype=object)[shared]
+    anmerkung = anmerkung[anmerkung.map(lambda v: isinstance(v, str))]
+    parts = anmerkung.str.split(",").explode().str.strip()
+    parts = parts[parts != ""]
+    part_nummer, uniques, codes, statuses = _resolve_column(parts.to_numpy(), keys)
+    _report(unmatched, uniques, codes, statuses, "Geteilte Kisten")
+    share = 1.0 / parts.groupby(level=0).transform("size").to_numpy(dtype=float)
+    positions = parts.index.to_numpy()
+    split = pd.DataFrame(
+        {
+            "pos": positions,
+            "nummer": part_nummer,
+            "anteil": share,
+            "offen": offen[positions],
+            "geteilt": True,
+        }
+    )
+    rows = pd.concat([direct, split], ignore_index=True)
+    return rows[rows["nummer"].notna()].astype({"nummer": int})
+
+
+def _strafen_rows(df, keys, unmatched):
+    if df is None or df.empty:
+        return pd.DataFrame({"pos": [], "nummer": [], "betrag": [], "offen": []}).astype(
+            {"offen": bool}
+        )
+
+    names = df["Wer?"].astype(object).to_numpy()
+    nummer, uniques, codes, statuses = _resolve_column(names, keys)
+    _report(unmatched, uniques, codes, statuses, "Strafen")
+    rows = pd.DataFrame(
+        {
+            "pos": np.arange(len(df)),
+            "nummer": nummer,
+            "betrag": df["Betrag"].to_numpy(dtype=float),
+            "offen": ~df["Ist_Bezahlt"].to_numpy(dtype=bool),
+        }
+    )
+    return rows[rows["nummer"].notna()].astype({"nummer": int})
+
+
+def _positions(rows):
+    """Zeilenpositionen pro Rückennummer (jede Zeile nur einmal, in Ledger-Reihenfolge)."""
+    return {
+        nummer: np.unique(group.to_numpy())
+        for nummer, group in rows.groupby("nummer")["pos"]
+    }
+
+
+def player_version():
+    """Fingerprints aller Quellen des Spieler-Index (Ledger, Kader, Aliase)."""
+    version = list(data_version())
+    for fingerprint, path in ((source_fingerprint, KADER_PATH), (file_fingerprint, ALIASES_PATH)):
+        try:
+            version.append(fingerprint(path))
+        except OSError:
+            version.append(None)
+    return tuple(version)
+
+
+@profiled(cached=True)
+def load_player_index():
+    """
+    Lädt den Spieler-Index (siehe build_player_index) für die aktuelle
+    Datenversion. Gibt None zurück, wenn er nicht gebaut werden kann
+    (Fehler werden angezeigt, aber nicht gecacht).
+    """
+    try:
+        return _load_player_index(player_version())
+    except Exception as e:
+        st.error(f"❌ Fehler beim Zuordnen der Spieler: {e}")
+        return None
+
+
+@st.cache_data(max_entries=2)
+def _load_player_index(version):
+    cache_miss()
+    index = load_shared("spieler", version, lambda: _build_player_index(version))
+    if index is not None:
+        index["version"] = version
+    return index
+
+
+def _build_player_index(version):
+    kader = load_kader()
+    if kader.empty:
+        return None
+    return build_player_index(
+        kader,
+        require_loaded(load_data(version[0]), KISTENLISTE_PATH, version[0]),
+        require_loaded(load_strafen_excel(version[1]), STRAFEN_PATH, version[1]),
+        read_aliases(),
+    )
@@ -0,0 +1,24 @@
+"""
+Namensvergleich für Kistenliste, Strafen und Kader
+
+Gemeinsam genutzt von data_loader (offene Kisten) und identity
+(Spieler-Index), damit beide dieselben Einträge als geteilte Kiste erkennen.
+"""
+
+import unicodedata
+
+# Einträge in "Name", deren Kiste auf die Personen in "Anmerkung" verteilt
+# wird (in der Kistenliste steht "Geteilte Kiste", ältere Listen nutzen den Plural)
+SHARED_BOX_NAMES = {"geteilte kiste", "geteilte kisten"}
+
+
+def normalize_name(name):
+    """Vergleichsform eines Namens: Unicode-normalisiert, casefold, einfache Leerzeichen."""
+    if not isinstance(name, str):
+        return ""
+    return " ".join(unicodedata.normalize("NFKC", name).casefold().split())
+
+
+def is_shared_box(name):
+    """True, wenn der Name-Eintrag eine geteilte Kiste ist."""
+    return normalize_name(name) in SHARED_BOX_NAMES
@@ -0,0 +1,200 @@
+"""
+Tabellen mit serverseitiger Seitenaufteilung
+
+Statt der kompletten Tabelle wird nur die sichtbare Seite mit den
+angezeigten Spalten an den Browser geschickt. Suche, Sortierung und
+Seitenauswahl laufen auf dem Server:
+- search_rows(): Textsuche ohne Groß-/Kleinschreibung (category-Spalten nur
+  über ihre Kategorien)
+- sort_rows(): stabile Sortierung, optional über eigene Sortierschlüssel
+  (z.B. das echte Datum zu einer formatierten Datumsspalte)
+- page_slice(): eine Seite, nur die angezeigten Spalten, ungenutzte
+  Kategorien entfernt
+
+Die Größe der übertragenen Seite (Arrow) wird im Diagnose-Panel als
+payload_kb gemessen (siehe utils/profiling.py).
+"""
+
+import math
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import streamlit as st
+
+from .profiling import measure
+
+PAGE_SIZES = [25, 50, 100, 250]
+DEFAULT_SORT = "Standard"
+
+
+def search_rows(df, term, columns):
+    """Zeilen, in denen term in einer der Spalten vorkommt."""
+    term = (term or "").strip()
+    if not term or df.empty:
+        return df
+
+    mask = np.zeros(len(df), dtype=bool)
+    for col in columns:
+        values = df[col]
+        if isinstance(values.dtype, pd.CategoricalDtype):
+            # Nur die (wenigen) Kategorien durchsuchen, nicht jede Zeile
+            hits = values.cat.categories.astype(str).str.contains(
+                term, case=False, regex=False
+            )
+            mask |= np.isin(values.cat.codes.to_numpy(), np.flatnonzero(hits))
+        else:
+            mask |= (
+                values.astype(str)
+                .str.contains(term, case=False, regex=False, na=False)
+                .to_numpy()
+            )
+    return df[mask]
+
+
+def sort_rows(df, column, ascending=True, sort_keys=None):
+    """
+    Stabile Sortierung nach column. sort_keys kann pro Spalte eine Series
+    mit demselben Index liefern, nach der stattdessen sortiert wird.
+    """
+    if column in (None, DEFAULT_SORT) or df.empty:
+        return df if ascending else df.iloc[::-1]
+
+    if sort_keys and column in sort_keys:
+        values = sort_keys[column].reindex(df.index)
+    else:
+        values = df[column]
+    if isinstance(values.dtype, pd.CategoricalDtype):
+        # Nach Beschriftung statt nach interner Kategorienreihenfolge
+        values = values.cat.reorder_categories(sorted(values.cat.categories))
+
+    order = (
+        values.reset_index(drop=True)
+        .sort_values(ascending=ascending, kind="stable", na_position="last")
+        .index.to_numpy()
+    )
+    return df.iloc[order]
+
+
+def page_slice(df, page, page_size, columns=None):
+    """
+    Zeilen der Seite page (ab 1), nur mit den angegebenen Spalten.
+    category-Spalten behalten nur die Kategorien der Seite, damit nicht
+    die komplette Kategorienliste mitgeschickt wird.
+    """
+    start = (page - 1) * page_size
+    rows = df.iloc[start : start + page_size]
+    if columns is not None:
+        rows = rows[list(columns)]
+    rows = rows.copy()
+    for col in rows.columns:
+        if isinstance(rows[col].dtype, pd.CategoricalDtype):
+            rows[col] = rows[col].cat.remove_unused_categories()
+    return rows
+
+
+def paginate(
+    df,
+    page=1,
+    page_size=PAGE_SIZES[1],
+    sort_by=None,
+    ascending=True,
+    search="",
+    search_columns=(),
+    columns=None,
+    sort_keys=None,
+):
+    """
+    Suche, Sortierung und Seitenauswahl in einem Schritt.
+    Gibt die Seite und die Anzahl aller Treffer zurück.
+    """
+    rows = search_rows(df, search, search_columns)
+    rows = sort_rows(rows, sort_by, ascending, sort_keys)
+    return page_slice(rows, page, page_size, columns), len(rows)
+
+
+def payload_bytes(df):
+    """Größe der Seite als Arrow-Stream (so wird sie an den Browser geschickt)."""
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    return sink.getvalue().size
+
+
+def render_paginated_table(
+    df,
+    key,
+    column_config=None,
+    search_columns=(),
+    sort_keys=None,
+    page_size=PAGE_SIZES[1],
+):
+    """
+    Zeigt df seitenweise mit Suche, Sortierung und Seitenauswahl an.
+    Angezeigt (und übertragen) werden nur die Spalten aus column_config.
+    Gibt die angezeigte Seite und die Anzahl aller Treffer zurück.
+    """
+    columns = list(column_config) if column_config else list(df.columns)
+    page_key = f"{key}_seite"
+
+    def reset_page():
+        st.session_state[page_key] = 1
+
+    col_search, col_sort, col_order, col_size, col_page = st.columns([3, 2, 1, 1, 1])
+    with col_search:
+        search = (
+            st.text_input("Suche", key=f"{key}_suche", on_change=reset_page)
+            if search_columns
+            else ""
+        )
+    with col_sort:
+        sort_by = st.selectbox(
+            "Sortieren nach",
+            [DEFAULT_SORT] + columns,
+            format_func=lambda col: _label(column_config, col),
+            key=f"{key}_sortierung",
+        )
+    with col_order:
+        order = st.selectbox("Reihenfolge", ["Auf", "Ab"], key=f"{key}_reihenfolge")
+    with col_size:
+        size = st.selectbox(
+            "Pro Seite",
+            PAGE_SIZES,
+            index=PAGE_SIZES.index(page_size),
+            key=f"{key}_groesse",
+            on_change=reset_page,
+        )
+
+    with measure(f"tabelle.{key}") as record:
+        rows = search_rows(df, search, search_columns)
+        rows = sort_rows(rows, sort_by, order == "Auf", sort_keys)
+
+        pages = max(1, math.ceil(len(rows) / size))
+        # Nach einem Filterwechsel kann die gemerkte Seite nicht mehr existieren
+        if st.session_state.get(page_key, 1) > pages:
+            st.session_state[page_key] = pages
+        with col_page:
+            page = st.number_input(
+                "Seite", min_value=1, max_value=pages, step=1, key=page_key
+            )
+
+        visible = page_slice(rows, page, size, columns)
+        st.dataframe(
+            visible, hide_index=True, use_container_width=True, column_config=column_config
+        )
+        if record is not None:
+            record["payload_kb"] = round(payload_bytes(visible) / 1024, 1)
+
+    if len(visible):
+        first = (page - 1) * size + 1
+        st.caption(
+            f"Seite {page} von {pages} • Zeilen {first}–{first + len(visible) - 1} "
+            f"von {len(rows)}"
+        )
+    return visible, len(rows)
+
+
+def _label(column_config, col):
+    config = (column_config or {}).get(col) or {}
+    return config.get("label") or col
@@ -0,0 +1,319 @@
+"""
+Preisprüfung der Strafen gegen strafenkatalog.json
+
+Der Katalog enthält Preise als Anzeigetext ("5.00 €", "Kiste", "n.Abspr.")
+und Staffeln wie "Zu spät Spiel >15 min (1. Mal)" / "(jedes weitere Mal)".
+compile_katalog() macht daraus einmal eine typisierte Tabelle (eine Zeile
+pro Katalogeintrag mit Regel, Stufe, Art und Betrag). check_prices()
+berechnet damit für alle Zeilen der Strafenliste in einem Durchlauf den
+erwarteten Betrag:
+- "Was?" wird pro verschiedenem Wert einer Regel zugeordnet (ohne Groß-/
+  Kleinschreibung und Leerzeichen, notfalls ohne Klammerzusatz)
+- "2x" am Ende zählt als zwei Vergehen
+- bei Staffeln zählt ein gruppierter kumulierter Zähler pro Person und
+  Regel (chronologisch), das wievielte Vergehen eine Zeile ist
+Abweichungen vom eingetragenen Betrag werden markiert.
+"""
+
+import re
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from .cache import load_shared
+from .data_loader import (
+    STRAFEN_PATH,
+    STRAFENKATALOG_PATH,
+    load_strafen_excel,
+    load_strafenkatalog,
+    require_loaded,
+    source_fingerprint,
+)
+from .identity import normalize_name
+from .profiling import cache_miss, profiled
+
+# Art eines Katalogpreises
+ART_BETRAG = "Betrag"
+ART_KISTE = "Kiste"
+ART_ABSPRACHE = "nach Absprache"
+ART_UNBEKANNT = "unbekannt"
+
+# Ergebnis der Prüfung pro Zeile
+PRUEFUNG_OK = "ok"
+PRUEFUNG_ABWEICHUNG = "abweichend"
+PRUEFUNG_OHNE_PREIS = "ohne festen Preis"
+PRUEFUNG_UNBEKANNT = "nicht im Katalog"
+PRUEFUNGEN = [PRUEFUNG_OK, PRUEFUNG_ABWEICHUNG, PRUEFUNG_OHNE_PREIS, PRUEFUNG_UNBEKANNT]
+
+# Eingetragene Beträge gelten bis auf diese Differenz als korrekt (€)
+TOLERANZ = 0.005
+
+_PRICE = re.compile(r"^(\d+(?:[.,]\d+)?)\s*€?$")
+_STAGE = re.compile(r"\((\d+)\.\s*mal\)")
+_FURTHER = re.compile(r"\(jedes weitere mal\)")
+_BRACKETS = re.compile(r"\([^)]*\)")
+_COUNT = re.compile(r"\s(\d+)\s*x$")
+
+CHECK_COLUMNS = [
+    "Termin",
+    "Was?",
+    "Wer?",
+    "Betrag",
+    "Regel",
+    "Anzahl",
+    "Vorkommen",
+    "Erwartet",
+    "Differenz",
+    "Prüfung",
+]
+
+
+def parse_strafe(text):
+    """
+    Wandelt einen Katalogpreis in (Art, Betrag) um. Der Katalog schreibt
+    Dezimalpunkte ("0.50 €"), daher nicht über parse_betrag().
+    """
+    value = normalize_name(text)
+    match = _PRICE.match(value)
+    if match:
+        return ART_BETRAG, float(match.group(1).replace(",", "."))
+    if value == "kiste":
+        return ART_KISTE, np.nan
+    if value.startswith("n.abspr"):
+        return ART_ABSPRACHE, np.nan
+    return ART_UNBEKANNT, np.nan
+
+
+def rule_key(text):
+    """
+    Regel eines Vergehens und die Staffelstufe: (Schlüssel, Stufe), Stufe 0
+    für den regulären bzw. "jedes weitere Mal"-Preis, n für "(n. Mal)".
+    Der Schlüssel ist ohne Leerzeichen und Markierungen ("*") verglichen.
+    """
+    value = normalize_name(text)
+    stage = 0
+    match = _STAGE.search(value)
+    if match:
+        stage = int(match.group(1))
+    value = _FURTHER.sub("", _STAGE.sub("", value))
+    return _compact(value), stage
+
+
+def _compact(value):
+    return "".join(value.replace("*", "").split())
+
+
+@profiled()
+def compile_katalog(katalog):
+    """
+    Kompiliert den Strafenkatalog (Spalten Vergehen, Strafe) in eine
+    Nachschlagetabelle mit den Spalten Regel, Vergehen, Stufe, Art, Betrag.
+    "Vergehen" ist die Bezeichnung ohne Staffelzusatz.
+    """
+    rows = []
+    for vergehen, strafe in zip(katalog["Vergehen"], katalog["Strafe"]):
+        regel, stufe = rule_key(vergehen)
+        art, betrag = parse_strafe(strafe)
+        rows.append(
+            {
+                "Regel": regel,
+                "Vergehen": _strip_stage(vergehen),
+                "Stufe": stufe,
+                "Art": art,
+                "Betrag": betrag,
+            }
+        )
+    return pd.DataFrame(rows, columns=["Regel", "Vergehen", "Stufe", "Art", "Betrag"])
+
+
+def _strip_stage(vergehen):
+    text = re.sub(r"\(\s*\d+\.\s*Mal\s*\)", "", vergehen, flags=re.IGNORECASE)
+    text = re.sub(r"\(\s*jedes weitere Mal\s*\)", "", text, flags=re.IGNORECASE)
+    return " ".join(text.split())
+
+
+def katalog_keys(regeln):
+    """
+    Vergleichsschlüssel -> Regel: der volle Schlüssel und, falls eindeutig,
+    der Schlüssel ohne Klammerzusätze ("Ball verloren (für jeden/...)" auch
+    als "Ball verloren"). Mehrdeutige Kurzformen zeigen auf None.
+    """
+    keys = {regel: regel for regel in regeln["Regel"]}
+    short = {}
+    for regel, vergehen in zip(regeln["Regel"], regeln["Vergehen"]):
+        key = _compact(_BRACKETS.sub("", normalize_name(vergehen)))
+        known = short.get(key, regel)
+        short[key] = regel if known == regel else None
+    for key, regel in short.items():
+        keys.setdefault(key, regel)
+    return keys
+
+
+def resolve_vergehen(text, keys):
+    """
+    Ordnet ein "Was?" aus der Strafenliste einer Regel zu.
+    Gibt (Regel oder None, Anzahl) zurück; "Bierfrevel 2x" zählt doppelt.
+    """
+    value = normalize_name(text)
+    count = 1
+    match = _COUNT.search(value)
+    if match:
+        count = max(int(match.group(1)), 1)
+        value = value[: match.start()]
+    for key in (rule_key(value)[0], _compact(_BRACKETS.sub("", value))):
+        if key and keys.get(key) is not None:
+            return keys[key], count
+    return None, count
+
+
+def _price_table(regeln):
+    """
+    Preise pro Regel: Spalte 0 ist der reguläre bzw. "jedes weitere
+    Mal"-Preis, Spalten 1..n die Staffelstufen. Fehlt der reguläre Preis,
+    gilt der der höchsten Stufe, fehlt eine Stufe, der reguläre Preis.
+    """
+    prices = regeln.pivot_table(
+        index="Regel", columns="Stufe", values="Betrag", aggfunc="first", dropna=False
+    )
+    if 0 not in prices.columns:
+        prices[0] = np.nan
+    stages = sorted(stage for stage in prices.columns if stage > 0)
+    for stage in reversed(stages):
+        prices[0] = prices[0].fillna(prices[stage])
+    for stage in stages:
+        prices[stage] = prices[stage].fillna(prices[0])
+    return prices[[0] + stages]
+
+
+@profiled()
+def check_prices(df, regeln):
+    """
+    Prüft alle Zeilen der Strafenliste gegen die kompilierten Regeln.
+    Gibt ein DataFrame mit den Spalten CHECK_COLUMNS in der Reihenfolge
+    der Strafenliste zurück ("Vorkommen": wievieltes Vergehen dieser Regel
+    der Person bis einschließlich dieser Zeile).
+    """
+    if df is None or df.empty:
+        return pd.DataFrame(columns=CHECK_COLUMNS)
+
+    # Zuordnung pro verschiedenem "Was?", nicht pro Zeile
+    keys = katalog_keys(regeln)
+    codes, uniques = pd.factorize(df["Was?"], sort=False)
+    resolved = [resolve_vergehen(text, keys) for text in uniques]
+    # Letzter Eintrag: Code -1 (fehlendes "Was?")
+    rule_codes, rules = pd.factorize(
+        pd.Series([regel for regel, _ in resolved] + [None], dtype=object)
+    )
+    counts = np.array([count for _, count in resolved] + [1], dtype=np.int64)
+    regel = rule_codes[codes]
+    anzahl = counts[codes]
+
+    # Chronologisch pro Person und Regel kumuliert zählen (NaT zuletzt,
+    # bei gleichem Datum in Zeilenreihenfolge)
+    codes, uniques = pd.factorize(df["Wer?"], sort=False)
+    person = pd.factorize(np.array([normalize_name(name) for name in uniques] + [""]))[0][codes]
+    termin = df["Termin"]
+    order = np.lexsort((np.arange(len(df)), termin.to_numpy(), termin.isna().to_numpy()))
+    prior = np.empty(len(df), dtype=np.int64)
+    prior[order] = (
+        pd.Series(anzahl[order])
+        .groupby([person[order], regel[order]])
+        .cumsum()
+        .to_numpy()
+        - anzahl[order]
+    )
+
+    # Erwarteter Betrag: jede Staffelstufe, die in diese Zeile fällt, mit
+    # ihrem Preis, alle übrigen Vergehen mit dem regulären Preis
+    prices = _price_table(regeln).reindex(rules)
+    matched = regel >= 0
+    price_rows = np.vstack([prices.to_numpy(), np.full(prices.shape[1], np.nan)])[regel]
+    erwartet = np.zeros(len(df))
+    staged = np.zeros(len(df), dtype=np.int64)
+    for column, stage in enumerate(prices.columns):
+        if stage == 0:
+            continue
+        hit = (prior < stage) & (stage <= prior + anzahl)
+        erwartet += np.where(hit, price_rows[:, column], 0.0)
+        staged += hit
+    erwartet += (anzahl - staged) * price_rows[:, 0]
+
+    betrag = df["Betrag"].to_numpy(dtype=float)
+    differenz = betrag - erwartet
+    pruefung = np.select(
+        [~matched, np.isnan(erwartet), np.abs(differenz) <= TOLERANZ],
+        [PRUEFUNGEN.index(PRUEFUNG_UNBEKANNT), PRUEFUNGEN.index(PRUEFUNG_OHNE_PREIS), 0],
+        PRUEFUNGEN.index(PRUEFUNG_ABWEICHUNG),
+    )
+
+    result = df[["Termin", "Was?", "Wer?"]].copy()
+    result["Betrag"] = betrag
+    result["Regel"] = np.append(np.asarray(rules, dtype=object), None)[regel]
+    result["Anzahl"] = anzahl
+    result["Vorkommen"] = np.where(matched, prior + anzahl, 0)
+    result["Erwartet"] = erwartet
+    result["Differenz"] = np.where(np.isnan(erwartet), np.nan, differenz)
+    result["Prüfung"] = pd.Categorical.from_codes(pruefung, categories=PRUEFUNGEN)
+    return result[CHECK_COLUMNS]
+
+
+@profiled()
+def build_price_check(df, katalog):
+    """
+    Preisprüfung einer Saison einmal pro Datenversion:
+    - "regeln": kompilierter Katalog (siehe compile_katalog)
+    - "zeilen": Prüfung aller Zeilen (siehe check_prices)
+    - "abweichungen": Zeilen mit abweichendem Betrag
+    - "unbekannt": "Was?"-Werte ohne Katalogeintrag mit Anzahl Zeilen
+    - "anzahl": Anzahl Zeilen pro Prüfungsergebnis
+    """
+    regeln = compile_katalog(katalog)
+    zeilen = check_prices(df, regeln)
+    unknown = zeilen[zeilen["Prüfung"] == PRUEFUNG_UNBEKANNT]
+    return {
+        "regeln": regeln,
+        "zeilen": zeilen,
+        "abweichungen": zeilen[zeilen["Prüfung"] == PRUEFUNG_ABWEICHUNG],
+        "unbekannt": unknown["Was?"].astype(object).value_counts().rename("Zeilen").reset_index(),
+        "anzahl": zeilen["Prüfung"].value_counts(sort=False).to_dict(),
+    }
+
+
+def price_version():
+    """Fingerprints der Strafenliste und des Strafenkatalogs."""
+    version = []
+    for path in (STRAFEN_PATH, STRAFENKATALOG_PATH):
+        try:
+            version.append(source_fingerprint(path))
+        except OSError:
+            version.append(None)
+    return tuple(version)
+
+
+@profiled(cached=True)
+def load_price_check():
+    """
+    Lädt die Preisprüfung (siehe build_price_check) für die aktuelle
+    Datenversion. Gibt None zurück, wenn sie nicht berechnet werden kann
+    (Fehler werden angezeigt, aber nicht gecacht).
+    """
+    try:
+        return _load_price_check(price_version())
+    except Exception as e:
+        st.error(f"❌ Fehler bei der Preisprüfung: {e}")
+        return None
+
+
+@st.cache_data(max_entries=2)
+def _load_price_check(version):
+    cache_miss()
+    return load_shared("preise", version, lambda: _build_price_check(version))
+
+
+def _build_price_check(version):
+    katalog = load_strafenkatalog()
+    df = require_loaded(load_strafen_excel(version[0]), STRAFEN_PATH, version[0])
+    if katalog.empty or df is None:
+        return None
+    return build_price_check(df, katalog)
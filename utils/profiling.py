@@ -0,0 +1,193 @@
+"""
+Zeit- und Speichermessung der Hot Paths mit optionalem Diagnose-Panel
+
+Aktivierung:
+- Umgebungsvariable FCM_PROFILE=1 (für alle Sessions)
+- Query-Parameter ?profile=1 (nur für die eigene Session)
+Mit FCM_PROFILE_LOG=<datei> wird jede Messung als JSON-Zeile angehängt.
+Deaktiviert kostet ein gemessener Aufruf nur eine Attributabfrage.
+"""
+
+import functools
+import json
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+ENV_ENABLED = os.environ.get("FCM_PROFILE", "") not in ("", "0")
+LOG_PATH = os.environ.get("FCM_PROFILE_LOG")
+
+# Maximale Anzahl Messungen pro Thread (falls nie start_run() aufgerufen wird)
+MAX_RECORDS = 1000
+
+_local = threading.local()
+_log_lock = threading.Lock()
+
+
+def current_rss():
+    """Aktueller Speicherverbrauch (RSS) des Prozesses in Bytes."""
+    try:
+        with open("/proc/self/statm", "r") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError):
+        import resource
+
+        # ru_maxrss ist Spitzenwert (Linux: KiB)
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+def is_enabled():
+    return getattr(_local, "enabled", ENV_ENABLED)
+
+
+def start_run(enabled=None):
+    """
+    Beginnt eine neue Messreihe für den aktuellen Rerun (pro Session-Thread).
+    """
+    _local.enabled = ENV_ENABLED if enabled is None else enabled
+    _local.records = deque(maxlen=MAX_RECORDS)
+    _local.stack = []
+
+
+def get_records():
+    """Messungen des aktuellen Reruns in Reihenfolge ihres Beginns."""
+    return list(getattr(_local, "records", ()))
+
+
+def _state():
+    if not hasattr(_local, "records"):
+        _local.records = deque(maxlen=MAX_RECORDS)
+        _local.stack = []
+    return _local.records, _local.stack
+
+
+@contextmanager
+def measure(name, cached=False):
+    """
+    Misst Laufzeit und RSS-Differenz eines Blocks.
+    cached=True kennzeichnet einen gecachten Aufruf: ohne cache_miss()
+    innerhalb des Blocks gilt er als Treffer.
+    """
+    if not is_enabled():
+        yield None
+        return
+
+    records, stack = _state()
+    record = {"name": name, "cache": "hit" if cached else None, "tiefe": len(stack)}
+    stack.append(record)
+    records.append(record)
+    rss_start = current_rss()
+    start = time.perf_counter()
+    try:
+        yield record
+    finally:
+        record["ms"] = round((time.perf_counter() - start) * 1000, 3)
+        record["rss_delta_kb"] = (current_rss() - rss_start) // 1024
+        stack.pop()
+        if LOG_PATH:
+            _append_log(record)
+
+
+def profiled(name=None, cached=False):
+    """
+    Decorator-Variante von measure(). Name ist standardmäßig modul.funktion.
+    """
+
+    def decorator(func):
+        label = name or f"{func.__module__.rsplit('.', 1)[-1]}.{func.__name__}"
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not getattr(_local, "enabled", ENV_ENABLED):
+                return func(*args, **kwargs)
+            with measure(label, cached=cached):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+def cache_miss():
+    """
+    Wird im Rumpf gecachter Funktionen aufgerufen (läuft nur bei einem Miss)
+    und markiert die innerste gecachte Messung als Miss.
+    """
+    if not is_enabled():
+        return
+    _, stack = _state()
+    for record in reversed(stack):
+        if record["cache"] is not None:
+            record["cache"] = "miss"
+            return
+
+
+def _append_log(record):
+    line = json.dumps(
+        dict(record, zeit=time.time(), pid=os.getpid()), ensure_ascii=False
+    )
+    with _log_lock:
+        with open(LOG_PATH, "a", encoding="utf-8") as f:
+            f.write(line + "\n")
+
+
+def render_panel():
+    """
+    Zeigt die Messungen des aktuellen Reruns in einem Diagnose-Panel.
+    """
+    if not is_enabled():
+        return
+
+    import pandas as pd
+    import streamlit as st
+
+    records = get_records()
+    with st.expander("🛠️ Diagnose", expanded=False):
+        if not records:
+            st.caption("Keine Messungen in diesem Rerun.")
+            return
+        df = pd.DataFrame(records)
+        # payload_kb nur bei Tabellen (siehe utils/pagination.py)
+        columns = ["name", "ms", "rss_delta_kb", "payload_kb", "cache", "tiefe"]
+        df = df[[col for col in columns if col in df.columns]]
+        df["name"] = df["tiefe"].map(lambda d: "  " * d) + df["name"]
+        hits = (df["cache"] == "hit").sum()
+        misses = (df["cache"] == "miss").sum()
+        top_level = df.loc[df["tiefe"] == 0, "ms"].sum()
+        st.caption(
+            f"Gemessen: {top_level:.1f} ms • Cache: {hits} Treffer / {misses} Misses "
+            f"• RSS: {current_rss() / 2**20:.1f} MiB"
+        )
+        st.dataframe(df.drop(columns="tiefe"), hide_index=True, use_container_width=True)
+        _render_warmup_status(st)
+        _render_compiled_status(st)
+
+
+def _render_warmup_status(st):
+    from . import warmup
+
+    info = warmup.status()
+    if not info["gestartet"]:
+        return
+    text = f"Warm-up: {info['aufbauten']} Aufbauten"
+    if info["dauer_s"] is not None:
+        text += f", zuletzt {info['dauer_s']:.2f} s"
+    if info["neuaufbau"]:
+        text += " • Neuaufbau läuft (alter Stand wird ausgeliefert)"
+    if info["fehler"]:
+        text += f" • Fehler: {info['fehler']}"
+    st.caption(text)
+
+
+def _render_compiled_status(st):
+    from .compiled import compiled_status
+
+    status = compiled_status()
+    if all(value == "fehlt" for value in status.values()):
+        return
+    st.caption(
+        "Kompilierter Stand: "
+        + ", ".join(f"{name} {value}" for name, value in status.items())
+    )
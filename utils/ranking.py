@@ -0,0 +1,206 @@
+"""
+Rangliste der Kistenliste als laufend gepflegter Index
+
+Hält pro Person die Anzahl Kisten (und davon offene) in einer sortierten
+Liste, sodass Rang-Abfragen und die Top N ohne erneutes Zählen des Ledgers
+beantwortet werden:
+- RankingIndex.from_frame(): einmaliger Aufbau aus der Kistenliste
+- sync(): übernimmt geänderte Zählungen (z.B. die Aggregate des
+  IncrementalLedger), nur betroffene Personen werden neu einsortiert
+- rank(), entry(), top(), table(): Abfragen mit "competition"- oder
+  "dense"-Rangfolge, Gleichstände teilen sich Rang und Medaille
+"""
+
+import threading
+from bisect import bisect_left, insort
+
+import numpy as np
+import pandas as pd
+
+# Rangfolge bei Gleichstand: "competition" (1, 1, 3) oder "dense" (1, 1, 2)
+RANK_METHODS = ("competition", "dense")
+DEFAULT_METHOD = "competition"
+MEDALS = {1: "🥇", 2: "🥈", 3: "🥉"}
+
+# Ab diesem Anteil geänderter Personen baut sync() komplett neu auf
+MAX_CHANGED_RATIO = 0.25
+
+
+class RankingIndex:
+    """
+    Anzahl Kisten pro Person, absteigend sortiert (Gleichstand nach Name).
+
+    _order enthält (-Anzahl, Name) sortiert, _distinct die verschiedenen
+    negierten Anzahlen. Der Competition-Rang einer Person ist damit
+    1 + Anzahl Personen mit mehr Kisten, der Dense-Rang
+    1 + Anzahl verschiedener größerer Werte (jeweils per Binärsuche).
+    """
+
+    def __init__(self, counts=None):
+        self._lock = threading.Lock()
+        self._set(counts if counts is not None else _empty_counts())
+
+    @classmethod
+    def from_frame(cls, df):
+        """Baut den Index aus einer Kistenliste (Spalten Name, Ist_Bezahlt)."""
+        return cls(count_boxes(df))
+
+    def __len__(self):
+        return len(self.anzahl)
+
+    def _set(self, counts):
+        names = counts.index
+        values = np.rint(counts[["Anzahl", "Offen"]].to_numpy(dtype=float)).astype(int)
+        keep = values[:, 0] > 0
+        self.anzahl = dict(zip(names[keep], values[keep, 0].tolist()))
+        self.offen = dict(zip(names[keep], values[keep, 1].tolist()))
+        self._order = sorted((-count, name) for name, count in self.anzahl.items())
+        self._multiplicity = {}
+        for count in self.anzahl.values():
+            self._multiplicity[count] = self._multiplicity.get(count, 0) + 1
+        self._distinct = sorted(-count for count in self._multiplicity)
+        # Zuletzt übernommener Stand, gegen den sync() per Array-Vergleich diffet
+        self._names, self._values = names, values
+
+    def sync(self, counts):
+        """
+        Übernimmt den aktuellen Stand (DataFrame mit Index Name und Spalten
+        Anzahl/Offen). Verglichen wird per Array mit dem zuletzt übernommenen
+        Stand, nur Personen mit geänderten Werten werden neu einsortiert; bei
+        sehr vielen Änderungen wird neu aufgebaut.
+        Gibt die Anzahl geänderter Personen zurück.
+        """
+        names = counts.index
+        values = np.rint(counts[["Anzahl", "Offen"]].to_numpy(dtype=float)).astype(int)
+        with self._lock:
+            if names.equals(self._names):
+                old = self._values
+                removed = names[:0]
+            else:
+                # Neue Personen zählen als 0, weggefallene werden auf 0 gesetzt
+                # (Position -1 trifft die angehängte Nullzeile)
+                positions = self._names.get_indexer(names)
+                old = np.vstack([self._values, [[0, 0]]])[positions]
+                removed = self._names.difference(names)
+            rows = np.flatnonzero((values != old).any(axis=1))
+            changed = len(rows) + len(removed)
+            if changed > max(10, len(self.anzahl) * MAX_CHANGED_RATIO):
+                self._set(counts)
+                return changed
+            for name, (anzahl, offen) in zip(names[rows], values[rows].tolist()):
+                self._update(name, anzahl, offen)
+            for name in removed:
+                self._update(name, 0, 0)
+            self._names, self._values = names, values
+        return changed
+
+    def _update(self, name, anzahl, offen):
+        old = self.anzahl.pop(name, 0)
+        self.offen.pop(name, None)
+        if old:
+            del self._order[bisect_left(self._order, (-old, name))]
+            self._multiplicity[old] -= 1
+            if not self._multiplicity[old]:
+                del self._multiplicity[old]
+                del self._distinct[bisect_left(self._distinct, -old)]
+        if anzahl > 0:
+            self.anzahl[name] = anzahl
+            self.offen[name] = offen
+            insort(self._order, (-anzahl, name))
+            if anzahl not in self._multiplicity:
+                insort(self._distinct, -anzahl)
+            self._multiplicity[anzahl] = self._multiplicity.get(anzahl, 0) + 1
+
+    def rank(self, name, method=DEFAULT_METHOD):
+        """Rang der Person (None, wenn sie keine Kisten hat)."""
+        with self._lock:
+            return self._rank(name, method)
+
+    def _rank(self, name, method):
+        # Aufrufer hält self._lock
+        if method not in RANK_METHODS:
+            raise ValueError(f"Unbekannte Rangfolge: {method}")
+        count = self.anzahl.get(name)
+        if count is None:
+            return None
+        if method == "dense":
+            return bisect_left(self._distinct, -count) + 1
+        return bisect_left(self._order, (-count,)) + 1
+
+    def entry(self, name, method=DEFAULT_METHOD):
+        """Rang, Medaille, Anzahl und offene Kisten einer Person (oder None)."""
+        with self._lock:
+            rank = self._rank(name, method)
+            if rank is None:
+                return None
+            return {
+                "Rang": rank,
+                "Medaille": MEDALS.get(rank, ""),
+                "Anzahl Kisten": self.anzahl[name],
+                "Offene Kisten": self.offen[name],
+                "Personen": len(self.anzahl),
+            }
+
+    def top(self, n, method=DEFAULT_METHOD):
+        """
+        Alle Personen mit Rang <= n (bei Gleichstand an der Grenze also
+        auch mehr als n), als Tabelle wie table().
+        """
+        with self._lock:
+            order = list(self._order)
+        if not order:
+            return _ranking_frame(order, method)
+        counts = np.array([-count for count, _ in order])
+        ranks = _ranks(counts, method)
+        return _ranking_frame(order[: np.searchsorted(ranks, n, side="right")], method)
+
+    def table(self, method=DEFAULT_METHOD):
+        """Rangliste mit den Spalten Rang, Medaille, Name, Anzahl Kisten."""
+        with self._lock:
+            order = list(self._order)
+        return _ranking_frame(order, method)
+
+
+def count_boxes(df):
+    """Anzahl und offene Kisten pro Person (Index Name) in einem groupby."""
+    rows = df[df["Name"].notna()]
+    return (
+        pd.DataFrame(
+            {
+                "Name": rows["Name"].astype(object).to_numpy(),
+                "Anzahl": 1,
+                "Offen": (~rows["Ist_Bezahlt"]).to_numpy(dtype=int),
+            }
+        )
+        .groupby("Name")
+        .sum()
+    )
+
+
+def _empty_counts():
+    return pd.DataFrame(
+        {"Anzahl": [], "Offen": []}, index=pd.Index([], name="Name"), dtype=int
+    )
+
+
+def _ranks(counts, method):
+    """Ränge zu absteigend sortierten Anzahlen."""
+    if method not in RANK_METHODS:
+        raise ValueError(f"Unbekannte Rangfolge: {method}")
+    if method == "dense":
+        return np.cumsum(np.r_[True, counts[1:] != counts[:-1]])
+    # Position des ersten Eintrags mit derselben Anzahl
+    return np.searchsorted(-counts, -counts, side="left") + 1
+
+
+def _ranking_frame(order, method):
+    counts = np.array([-count for count, _ in order], dtype=int)
+    ranks = _ranks(counts, method) if len(order) else np.array([], dtype=int)
+    return pd.DataFrame(
+        {
+            "Rang": ranks,
+            "Medaille": [MEDALS.get(rank, "") for rank in ranks],
+            "Name": [name for _, name in order],
+            "Anzahl Kisten": counts,
+        }
+    )
@@ -0,0 +1,349 @@
+"""
+Statischer Export: HTML, JSON-Zusammenfassungen und Diagramme als Dateien
+
+Für das reine Nachschauen ("wie viel bin ich schuldig?") reicht eine
+statische Seite ohne Python-Session pro Besucher. export_bundle() rechnet
+Kennzahlen und Diagramme einmal und schreibt:
+
+    <ausgabe>/index.html              Einstiegsseite (nicht cachen)
+    <ausgabe>/manifest.json           Eingaben und Dateinamen pro Teil
+    <ausgabe>/assets/<teil>.<hash>.*  Inhalte mit Hash im Namen (dauerhaft cachebar)
+
+Jeder Teil hängt nur von bestimmten Quelldateien ab. Ist deren Fingerprint
+unverändert, wird der Teil nicht neu berechnet.
+"""
+
+import hashlib
+import html
+import json
+import os
+from datetime import datetime
+from functools import cached_property
+
+
+from .cache import file_fingerprint
+from .data_loader import (
+    KADER_PATH,
+    KISTENLISTE_PATH,
+    STRAFEN_PATH,
+    STRAFENKATALOG_PATH,
+    build_strafen_detail,
+    create_open_boxes_table,
+    create_ranking_table,
+    load_data,
+    load_kader,
+    load_strafen_excel,
+    load_strafenkatalog,
+)
+from .summary import build_summary
+
+# Erhöhen, wenn sich Inhalt oder Aufbau der Dateien ändert (alles wird neu gebaut)
+EXPORT_FORMAT = 1
+
+DEFAULT_OUT_DIR = "site"
+ASSETS_DIR = "assets"
+MANIFEST_NAME = "manifest.json"
+
+
+class _Inputs:
+    """Lädt Quellen und Kennzahlen erst, wenn ein Teil sie braucht."""
+
+    def __init__(self, fingerprints):
+        self.fingerprints = fingerprints
+
+    @cached_property
+    def kisten(self):
+        df = load_data(self.fingerprints.get(KISTENLISTE_PATH))
+        if df is None:
+            raise RuntimeError(f"{KISTENLISTE_PATH} konnte nicht geladen werden")
+        return df
+
+    @cached_property
+    def strafen(self):
+        df = load_strafen_excel(self.fingerprints.get(STRAFEN_PATH))
+        if df is None:
+            raise RuntimeError(f"{STRAFEN_PATH} konnte nicht geladen werden")
+        return df
+
+    @cached_property
+    def kisten_summary(self):
+        summary = build_summary(self.kisten, None)
+        summary.version = (self.fingerprints.get(KISTENLISTE_PATH), None)
+        return summary
+
+    @cached_property
+    def strafen_summary(self):
+        summary = build_summary(None, self.strafen)
+        summary.version = (None, self.fingerprints.get(STRAFEN_PATH))
+        return summary
+
+    def stand(self, path):
+        """Änderungszeit einer Quelle als ISO-Zeitstempel."""
+        return datetime.fromtimestamp(os.path.getmtime(path)).isoformat(timespec="minutes")
+
+
+def _records(df):
+    """DataFrame als JSON-taugliche Liste von Zeilen (category -> Text)."""
+    df = df.astype({col: object for col in df.select_dtypes("category").columns})
+    return json.loads(df.to_json(orient="records", force_ascii=False, date_format="iso"))
+
+
+def _json_bytes(data):
+    return json.dumps(data, ensure_ascii=False, indent=1, sort_keys=True).encode("utf-8")
+
+
+def _build_kisten(inputs):
+    summary = inputs.kisten_summary
+    return _json_bytes(
+        {
+            "stand": inputs.stand(KISTENLISTE_PATH),
+            "gesamt": summary.kisten_gesamt,
+            "bezahlt": summary.kisten_bezahlt,
+            "offen": summary.kisten_offen,
+            "personen": summary.personen,
+            "offene_kisten": _records(create_open_boxes_table(inputs.kisten)),
+            "rangliste": _records(create_ranking_table(inputs.kisten)),
+            "pro_person": _records(summary.kisten_pro_person.reset_index()),
+        }
+    )
+
+
+def _build_strafen(inputs):
+    summary = inputs.strafen_summary
+    return _json_bytes(
+        {
+            "stand": inputs.stand(STRAFEN_PATH),
+            **summary.strafen_stats,
+            "offen_pro_person": _records(summary.strafen_pro_person),
+            "pro_grund": _records(summary.strafen_pro_grund.reset_index()),
+        }
+    )
+
+
+def _build_strafen_detail(inputs):
+    return _json_bytes(_records(build_strafen_detail(inputs.strafen)["table"]))
+
+
+def _build_json_source(loader):
+    def build(inputs):
+        return _json_bytes(_records(loader()))
+
+    return build
+
+
+def _build_chart(name):
+    def build(inputs):
+        from .charts import render_chart
+
+        return render_chart(name, inputs.kisten_summary)
+
+    return build
+
+
+# Teil -> (Quelldateien, Dateiendung, Erzeugung)
+PARTS = {
+    "kisten": ((KISTENLISTE_PATH,), "json", _build_kisten),
+    "strafen": ((STRAFEN_PATH,), "json", _build_strafen),
+    "strafen-detail": ((STRAFEN_PATH,), "json", _build_strafen_detail),
+    "kader": ((KADER_PATH,), "json", _build_json_source(load_kader)),
+    "strafenkatalog": ((STRAFENKATALOG_PATH,), "json", _build_json_source(load_strafenkatalog)),
+    "diagramm-person": ((KISTENLISTE_PATH,), "png", _build_chart("person")),
+    "diagramm-bezahlstatus": ((KISTENLISTE_PATH,), "png", _build_chart("payment")),
+    "diagramm-gruende": ((KISTENLISTE_PATH,), "png", _build_chart("reasons")),
+}
+
+
+def _input_key(name, sources, fingerprints):
+    parts = [str(EXPORT_FORMAT), name] + [str(fingerprints.get(path)) for path in sources]
+    return hashlib.sha256("|".join(parts).encode("utf-8")).hexdigest()
+
+
+def _write_atomic(path, data):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+
+
+def _read_bytes(path):
+    try:
+        with open(path, "rb") as f:
+            return f.read()
+    except OSError:
+        return None
+
+
+def _read_manifest(out_dir):
+    try:
+        with open(os.path.join(out_dir, MANIFEST_NAME), "r", encoding="utf-8") as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if manifest.get("format") != EXPORT_FORMAT:
+        return {}
+    return manifest.get("teile", {})
+
+
+def export_bundle(out_dir=DEFAULT_OUT_DIR, force=False):
+    """
+    Schreibt das statische Bundle nach out_dir und gibt pro Teil zurück,
+    ob er "neu" gebaut wurde oder "unverändert" blieb.
+    force=True baut alle Teile neu.
+    """
+    fingerprints = {}
+    for path in (KISTENLISTE_PATH, STRAFEN_PATH, KADER_PATH, STRAFENKATALOG_PATH):
+        try:
+            fingerprints[path] = file_fingerprint(path)
+        except OSError:
+            fingerprints[path] = None
+
+    previous = {} if force else _read_manifest(out_dir)
+    inputs = _Inputs(fingerprints)
+    parts, result = {}, {}
+
+    for name, (sources, extension, build) in PARTS.items():
+        key = _input_key(name, sources, fingerprints)
+        entry = previous.get(name)
+        if (
+            entry
+            and entry["eingabe"] == key
+            and os.path.exists(os.path.join(out_dir, entry["datei"]))
+        ):
+            parts[name] = entry
+            result[name] = "unverändert"
+            continue
+
+        data = build(inputs)
+        digest = hashlib.sha256(data).hexdigest()[:12]
+        filename = f"{ASSETS_DIR}/{name}.{digest}.{extension}"
+        _write_atomic(os.path.join(out_dir, filename), data)
+        parts[name] = {"eingabe": key, "datei": filename}
+        result[name] = "neu"
+
+    page = render_index(out_dir, parts).encode("utf-8")
+    index_path = os.path.join(out_dir, "index.html")
+    if _read_bytes(index_path) != page:
+        _write_atomic(index_path, page)
+        result["index.html"] = "neu"
+    else:
+        result["index.html"] = "unverändert"
+
+    _write_atomic(
+        os.path.join(out_dir, MANIFEST_NAME),
+        _json_bytes({"format": EXPORT_FORMAT, "teile": parts}),
+    )
+    _remove_unreferenced(out_dir, parts)
+    return result
+
+
+def _remove_unreferenced(out_dir, parts):
+    referenced = {os.path.basename(entry["datei"]) for entry in parts.values()}
+    assets = os.path.join(out_dir, ASSETS_DIR)
+    for filename in os.listdir(assets):
+        if filename not in referenced:
+            try:
+                os.remove(os.path.join(assets, filename))
+            except OSError:
+                pass
+
+
+def _load_part(out_dir, parts, name):
+    with open(os.path.join(out_dir, parts[name]["datei"]), "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _table(rows, columns, formats=None):
+    """HTML-Tabelle aus JSON-Zeilen; formats: Spalte -> Formatfunktion."""
+    formats = formats or {}
+    head = "".join(f"<th>{html.escape(label)}</th>" for _, label in columns)
+    body = []
+    for row in rows:
+        cells = []
+        for column, _ in columns:
+            value = row.get(column)
+            text = "" if value is None else formats.get(column, str)(value)
+            cells.append(f"<td>{html.escape(text)}</td>")
+        body.append(f"<tr>{''.join(cells)}</tr>")
+    return f"<table><thead><tr>{head}</tr></thead><tbody>{''.join(body)}</tbody></table>"
+
+
+def _euro(value):
+    return f"{value:.2f} €"
+
+
+def render_index(out_dir, parts):
+    """
+    Erzeugt index.html aus den bereits geschriebenen JSON-Dateien.
+    Enthält nur Werte aus den Quellen, damit sich die Seite bei
+    unveränderten Daten nicht ändert.
+    """
+    kisten = _load_part(out_dir, parts, "kisten")
+    strafen = _load_part(out_dir, parts, "strafen")
+
+    def asset(name):
+        return html.escape(parts[name]["datei"])
+
+    links = " • ".join(
+        f'<a href="{asset(name)}">{name}.json</a>'
+        for name in ("kisten", "strafen", "strafen-detail", "kader", "strafenkatalog")
+    )
+
+    return f"""<!DOCTYPE html>
+<html lang="de">
+<head>
+<meta charset="utf-8">
+<meta name="viewport" content="width=device-width, initial-scale=1">
+<title>FC Münster 05 - Kasse</title>
+<style>
+body {{ font-family: sans-serif; margin: 0 auto; max-width: 960px; padding: 16px;
+       background: linear-gradient(135deg, #f0fdf4 0%, #dbeafe 100%); color: #1f2937; }}
+h1 {{ text-align: center; }}
+.metrics {{ display: flex; flex-wrap: wrap; gap: 12px; }}
+.metric {{ background: white; padding: 16px 20px; border-radius: 10px;
+          box-shadow: 0 2px 4px rgba(0,0,0,0.1); flex: 1; min-width: 140px; }}
+.metric b {{ display: block; font-size: 28px; }}
+table {{ border-collapse: collapse; width: 100%; background: white; }}
+th, td {{ padding: 6px 10px; border-bottom: 1px solid #e5e7eb; text-align: left; }}
+img {{ max-width: 100%; }}
+footer {{ text-align: center; color: #6b7280; font-size: 14px; margin-top: 24px; }}
+</style>
+</head>
+<body>
+<h1>FC Münster 05 1. Mannschaft</h1>
+
+<h2>⚠️ Offene Strafen</h2>
+<div class="metrics">
+<div class="metric">Gesamt Strafen<b>{strafen["gesamt"]}</b></div>
+<div class="metric">✅ Bezahlt<b>{strafen["bezahlt"]}</b></div>
+<div class="metric">⚠️ Offen<b>{strafen["offen"]}</b></div>
+<div class="metric">💰 Offener Betrag<b>{_euro(strafen["betrag_offen"])}</b></div>
+</div>
+<h3>Offene Strafen pro Person</h3>
+{_table(strafen["offen_pro_person"], [("Name", "Name"), ("Offener Betrag (€)", "Offener Betrag"), ("Anzahl Strafen", "Anzahl Strafen")], {"Offener Betrag (€)": _euro, "Anzahl Strafen": lambda v: str(int(v))})}
+
+<h2>📦 Kistenliste</h2>
+<div class="metrics">
+<div class="metric">Gesamt Einträge<b>{kisten["gesamt"]}</b></div>
+<div class="metric">Bezahlt<b>{kisten["bezahlt"]}</b></div>
+<div class="metric">Offen<b>{kisten["offen"]}</b></div>
+<div class="metric">Personen<b>{kisten["personen"]}</b></div>
+</div>
+<h3>Offene Kisten</h3>
+{_table(kisten["offene_kisten"], [("Name", "Name"), ("Offene Kisten", "Offene Kisten")], {"Offene Kisten": lambda v: f"{v:g}"})}
+<h3>🏆 Kisten pro Person</h3>
+<img src="{asset("diagramm-person")}" alt="Kisten pro Person">
+<h3>💰 Bezahlstatus</h3>
+<img src="{asset("diagramm-bezahlstatus")}" alt="Bezahlstatus">
+<h3>📋 Top 10 Häufigste Gründe</h3>
+<img src="{asset("diagramm-gruende")}" alt="Häufigste Gründe">
+<h3>🏆 Rangliste</h3>
+{_table(kisten["rangliste"], [("Rang", "Rang"), ("Medaille", ""), ("Name", "Name"), ("Anzahl Kisten", "Anzahl Kisten")])}
+
+<footer>
+Stand Strafen: {html.escape(strafen["stand"])} • Stand Kistenliste: {html.escape(kisten["stand"])}<br>
+Daten: {links}
+</footer>
+</body>
+</html>
+"""
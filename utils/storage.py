@@ -0,0 +1,416 @@
+"""
+Optionaler SQLite-Speicher für Kistenliste, Strafen, Kader und Strafenkatalog
+
+Die Excel-Dateien bleiben die Quelle: sync_storage() in data_loader importiert
+den aktuellen Stand als eine Saison. Ältere Saisons bleiben in der Datenbank
+und können per SQL abgefragt werden, ohne sie in den Speicher zu laden.
+
+Aktivierung:
+- FCM_STORAGE=sqlite
+- FCM_DB_PATH=<datei> (Standard: .cache/mannschaftskasse.sqlite)
+- FCM_SAISON=<saison> (Standard: aktuelle Saison, z.B. "2025/26")
+
+Manueller Import: python -m utils.storage [--saison 2025/26]
+"""
+
+import os
+import sqlite3
+import time
+from contextlib import closing
+from datetime import date
+
+import pandas as pd
+
+from .cache import CACHE_DIR
+
+STORAGE_BACKEND = os.environ.get("FCM_STORAGE", "excel")
+DB_PATH = os.environ.get("FCM_DB_PATH", os.path.join(CACHE_DIR, "mannschaftskasse.sqlite"))
+
+# Wird bei Änderungen an SCHEMA erhöht, steht in PRAGMA user_version der Datei
+SCHEMA_VERSION = 1
+
+# Ab dieser Zeilenzahl werden nach einem Import die Statistiken für den
+# Query-Planer neu erhoben (ANALYZE), kleinere Tabellen brauchen keine
+ANALYZE_MIN_ROWS = 10_000
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS kisten (
+    saison TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    name TEXT,
+    grund TEXT,
+    anmerkung TEXT,
+    ist_bezahlt INTEGER NOT NULL,
+    PRIMARY KEY (saison, position)
+);
+CREATE INDEX IF NOT EXISTS idx_kisten_name ON kisten (saison, name, ist_bezahlt);
+CREATE INDEX IF NOT EXISTS idx_kisten_grund ON kisten (saison, grund);
+CREATE INDEX IF NOT EXISTS idx_kisten_status ON kisten (saison, ist_bezahlt);
+
+-- Offene Kisten pro Person, geteilte Kisten bereits aufgeteilt
+CREATE TABLE IF NOT EXISTS kisten_anteile (
+    saison TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    name TEXT NOT NULL,
+    anteil REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_anteile_name ON kisten_anteile (saison, name);
+
+CREATE TABLE IF NOT EXISTS strafen (
+    saison TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    termin TEXT,
+    was TEXT,
+    wer TEXT,
+    betrag REAL NOT NULL,
+    ist_bezahlt INTEGER NOT NULL,
+    PRIMARY KEY (saison, position)
+);
+-- Person/Status mit Termin: Abfragen pro Person ohne Sortierung
+CREATE INDEX IF NOT EXISTS idx_strafen_wer ON strafen (saison, wer, ist_bezahlt, termin);
+CREATE INDEX IF NOT EXISTS idx_strafen_was ON strafen (saison, was);
+-- Deckt die Aggregate pro Status und Person ab (ohne Zugriff auf die Tabelle)
+CREATE INDEX IF NOT EXISTS idx_strafen_status ON strafen (saison, ist_bezahlt, wer, was, betrag);
+CREATE INDEX IF NOT EXISTS idx_strafen_termin ON strafen (saison, termin);
+
+CREATE TABLE IF NOT EXISTS sync (
+    quelle TEXT NOT NULL,
+    saison TEXT NOT NULL,
+    fingerprint TEXT NOT NULL,
+    zeit REAL NOT NULL,
+    PRIMARY KEY (quelle, saison)
+);
+"""
+
+
+def is_enabled():
+    return STORAGE_BACKEND == "sqlite"
+
+
+def current_season(today=None):
+    """
+    Saison zum Datum (Saisonwechsel am 1. Juli), z.B. "2025/26".
+    FCM_SAISON hat Vorrang.
+    """
+    if os.environ.get("FCM_SAISON"):
+        return os.environ["FCM_SAISON"]
+    today = today or date.today()
+    start = today.year if today.month >= 7 else today.year - 1
+    return f"{start}/{(start + 1) % 100:02d}"
+
+
+def connect(path=None):
+    """
+    Öffnet die Datenbank und legt fehlende Tabellen und Indizes an, aber
+    nur, wenn die Datei noch nicht auf SCHEMA_VERSION ist (PRAGMA
+    user_version). Verbindungen sind nicht threadübergreifend, also pro
+    Aufruf öffnen.
+    """
+    path = path or DB_PATH
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    conn = sqlite3.connect(path)
+    if conn.execute("PRAGMA user_version").fetchone()[0] < SCHEMA_VERSION:
+        # WAL bleibt in der Datei gespeichert, muss also nur einmal gesetzt werden
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.executescript(SCHEMA)
+        conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+    return conn
+
+
+def synced_fingerprints(conn, season):
+    """
+    Fingerprints des letzten Imports pro Quelle für eine Saison
+    (inklusive der saisonunabhängigen Stammdaten).
+    """
+    rows = conn.execute(
+        "SELECT quelle, fingerprint FROM sync WHERE saison IN (?, '')", (season,)
+    ).fetchall()
+    return dict(rows)
+
+
+def seasons(conn):
+    """Alle importierten Saisons, neueste zuerst."""
+    rows = conn.execute("SELECT DISTINCT saison FROM sync ORDER BY saison DESC")
+    return [row[0] for row in rows]
+
+
+def _none(value):
+    return None if pd.isna(value) else value
+
+
+def import_kisten(conn, season, df, open_parts, fingerprint):
+    """
+    Ersetzt die Kisten einer Saison. open_parts sind die Anteile offener
+    Kisten in Reihenfolge der Kistenliste (siehe data_loader._open_box_parts).
+    """
+    with conn:
+        conn.execute("DELETE FROM kisten WHERE saison = ?", (season,))
+        conn.execute("DELETE FROM kisten_anteile WHERE saison = ?", (season,))
+        conn.executemany(
+            "INSERT INTO kisten VALUES (?, ?, ?, ?, ?, ?)",
+            (
+                (season, position, _none(name), _none(grund), _none(anmerkung), int(paid))
+                for position, name, grund, anmerkung, paid in zip(
+                    range(len(df)),
+                    df["Name"].astype(object),
+                    df["Grund"].astype(object),
+                    df["Anmerkung"].astype(object),
+                    df["Ist_Bezahlt"],
+                )
+            ),
+        )
+        conn.executemany(
+            "INSERT INTO kisten_anteile VALUES (?, ?, ?, ?)",
+            (
+                (season, int(position), name, float(anteil))
+                for position, name, anteil in zip(
+                    open_parts.index, open_parts["Name"], open_parts["Anteil"]
+                )
+            ),
+        )
+        _mark_synced(conn, "kistenliste", season, fingerprint)
+    _analyze(conn, len(df), "kisten", "kisten_anteile")
+
+
+def import_strafen(conn, season, df, fingerprint):
+    """Ersetzt die Strafen einer Saison (Termin als ISO-Datum)."""
+    termin = df["Termin"].dt.strftime("%Y-%m-%d")
+    with conn:
+        conn.execute("DELETE FROM strafen WHERE saison = ?", (season,))
+        conn.executemany(
+            "INSERT INTO strafen VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (
+                (season, position, _none(t), _none(was), _none(wer), float(betrag), int(paid))
+                for position, t, was, wer, betrag, paid in zip(
+                    range(len(df)),
+                    termin,
+                    df["Was?"].astype(object),
+                    df["Wer?"].astype(object),
+                    df["Betrag"],
+                    df["Ist_Bezahlt"],
+                )
+            ),
+        )
+        _mark_synced(conn, "strafen", season, fingerprint)
+    _analyze(conn, len(df), "strafen")
+
+
+def import_table(conn, name, df, fingerprint):
+    """
+    Ersetzt eine Stammdaten-Tabelle (kader, strafenkatalog) unabhängig von der Saison.
+    """
+    with conn:
+        df.to_sql(name, conn, if_exists="replace", index=False)
+        _mark_synced(conn, name, "", fingerprint)
+
+
+def _mark_synced(conn, source, season, fingerprint):
+    conn.execute(
+        "INSERT OR REPLACE INTO sync VALUES (?, ?, ?, ?)",
+        (source, season, fingerprint, time.time()),
+    )
+
+
+def _analyze(conn, rows, *tables):
+    """
+    Aktualisiert nach großen Importen die Statistiken für den Query-Planer,
+    sonst wählt er bei großen Tabellen z.B. den Termin-Index statt des
+    Personen-Index. Nur die importierten Tabellen, nicht die ganze Datenbank.
+    """
+    if rows < ANALYZE_MIN_ROWS:
+        return
+    for table in tables:
+        conn.execute(f"ANALYZE {table}")
+    conn.commit()
+
+
+def _query(conn, sql, params=()):
+    return pd.read_sql_query(sql, conn, params=params)
+
+
+def kisten_pro_person(conn, season):
+    """Index Name, Spalten Bezahlt/Offen/Gesamt, absteigend nach Gesamt."""
+    df = _query(
+        conn,
+        """
+        SELECT name AS Name,
+               SUM(ist_bezahlt) AS Bezahlt,
+               SUM(1 - ist_bezahlt) AS Offen,
+               COUNT(*) AS Gesamt
+        FROM kisten
+        WHERE saison = ? AND name IS NOT NULL
+        GROUP BY name
+        ORDER BY Gesamt DESC, name
+        """,
+        (season,),
+    )
+    return df.set_index("Name")
+
+
+def kisten_pro_grund(conn, season):
+    """Anzahl Kisten pro Grund, absteigend."""
+    df = _query(
+        conn,
+        """
+        SELECT grund AS Grund, COUNT(*) AS Anzahl
+        FROM kisten
+        WHERE saison = ? AND grund IS NOT NULL
+        GROUP BY grund
+        ORDER BY Anzahl DESC, grund
+        """,
+        (season,),
+    )
+    return df.set_index("Grund")["Anzahl"]
+
+
+def kisten_status(conn, season):
+    """Anzahl Kisten pro Bezahlt_Status, absteigend."""
+    df = _query(
+        conn,
+        """
+        SELECT CASE ist_bezahlt WHEN 1 THEN 'Bezahlt' ELSE 'Offen' END AS Bezahlt_Status,
+               COUNT(*) AS Anzahl
+        FROM kisten
+        WHERE saison = ?
+        GROUP BY ist_bezahlt
+        ORDER BY Anzahl DESC, Bezahlt_Status
+        """,
+        (season,),
+    )
+    return df.set_index("Bezahlt_Status")["Anzahl"]
+
+
+def offene_kisten(conn, season):
+    """Offene Kisten pro Person wie create_open_boxes_table()."""
+    df = _query(
+        conn,
+        """
+        SELECT name AS Name, ROUND(SUM(anteil), 2) AS "Offene Kisten"
+        FROM kisten_anteile
+        WHERE saison = ?
+        GROUP BY name
+        HAVING ABS(SUM(anteil)) > 1e-9
+        ORDER BY "Offene Kisten" DESC, name
+        """,
+        (season,),
+    )
+    return df
+
+
+def strafen_stats(conn, season):
+    """Statistiken im Format von get_strafen_stats()."""
+    row = conn.execute(
+        """
+        SELECT COUNT(*),
+               COALESCE(SUM(1 - ist_bezahlt), 0),
+               COALESCE(SUM(ist_bezahlt), 0),
+               COALESCE(SUM(CASE ist_bezahlt WHEN 0 THEN betrag END), 0),
+               COALESCE(SUM(CASE ist_bezahlt WHEN 1 THEN betrag END), 0)
+        FROM strafen
+        WHERE saison = ?
+        """,
+        (season,),
+    ).fetchone()
+    gesamt, offen, bezahlt, betrag_offen, betrag_bezahlt = row
+    return {
+        "gesamt": gesamt,
+        "offen": offen,
+        "bezahlt": bezahlt,
+        "betrag_offen": round(betrag_offen, 2),
+        "betrag_bezahlt": round(betrag_bezahlt, 2),
+    }
+
+
+def strafen_pro_person(conn, season):
+    """Offene Strafen pro Person wie calculate_strafen_per_person()."""
+    return _query(
+        conn,
+        """
+        SELECT wer AS Name,
+               ROUND(SUM(betrag), 2) AS "Offener Betrag (€)",
+               COUNT(was) AS "Anzahl Strafen"
+        FROM strafen
+        WHERE saison = ? AND ist_bezahlt = 0 AND wer IS NOT NULL
+        GROUP BY wer
+        ORDER BY "Offener Betrag (€)" DESC, wer
+        """,
+        (season,),
+    )
+
+
+def strafen_pro_grund(conn, season):
+    """Index Was?, Spalten Anzahl/Betrag/Offener Betrag, absteigend nach Anzahl."""
+    df = _query(
+        conn,
+        """
+        SELECT was AS "Was?",
+               COUNT(*) AS Anzahl,
+               ROUND(SUM(betrag), 2) AS Betrag,
+               ROUND(COALESCE(SUM(CASE ist_bezahlt WHEN 0 THEN betrag END), 0), 2)
+                   AS "Offener Betrag"
+        FROM strafen
+        WHERE saison = ? AND was IS NOT NULL
+        GROUP BY was
+        ORDER BY Anzahl DESC, was
+        """,
+        (season,),
+    )
+    return df.set_index("Was?")
+
+
+def strafen(conn, season, person=None, status=None, von=None, bis=None):
+    """
+    Strafen einer Saison, gefiltert nach Person, Status ("Bezahlt"/"Offen")
+    und Zeitraum (ISO-Datum, inklusive). Neueste zuerst.
+    """
+    conditions = ["saison = ?"]
+    params = [season]
+    if person is not None:
+        conditions.append("wer = ?")
+        params.append(person)
+    if status is not None:
+        conditions.append("ist_bezahlt = ?")
+        params.append(1 if status == "Bezahlt" else 0)
+    if von is not None:
+        conditions.append("termin >= ?")
+        params.append(str(von))
+    if bis is not None:
+        conditions.append("termin <= ?")
+        params.append(str(bis))
+
+    df = _query(
+        conn,
+        f"""
+        SELECT termin AS Termin, was AS "Was?", wer AS "Wer?", betrag AS Betrag,
+               CASE ist_bezahlt WHEN 1 THEN 'Bezahlt' ELSE 'Offen' END AS Bezahlt_Status
+        FROM strafen
+        WHERE {" AND ".join(conditions)}
+        ORDER BY termin DESC, position
+        """,
+        params,
+    )
+    df["Termin"] = pd.to_datetime(df["Termin"])
+    return df
+
+
+def main():
+    import argparse
+
+    from .data_loader import sync_storage
+
+    parser = argparse.ArgumentParser(description="Excel-Dateien in SQLite importieren")
+    parser.add_argument("--saison", default=None, help="Standard: aktuelle Saison")
+    parser.add_argument("--db", default=None, help=f"Standard: {DB_PATH}")
+    args = parser.parse_args()
+
+    with closing(sync_storage(season=args.saison, path=args.db, force=True)) as conn:
+        season = args.saison or current_season()
+        stats = strafen_stats(conn, season)
+        kisten = kisten_status(conn, season).sum()
+        print(f"✅ Saison {season}: {kisten} Kisten, {stats['gesamt']} Strafen importiert")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,252 @@
+"""
+Gemeinsames Statistik-Modell für alle Tabs
+"""
+
+from contextlib import closing
+from dataclasses import dataclass, field
+
+import pandas as pd
+import streamlit as st
+
+from . import storage
+from .cache import load_shared
+from .data_loader import (
+    KISTENLISTE_PATH,
+    STRAFEN_PATH,
+    data_version,
+    load_data,
+    load_strafen_excel,
+    require_loaded,
+    sync_storage,
+)
+from .profiling import cache_miss, profiled
+
+
+def _empty_kisten_pro_person():
+    return pd.DataFrame(
+        {"Bezahlt": [], "Offen": [], "Gesamt": []}, index=pd.Index([], name="Name")
+    )
+
+
+def _empty_strafen_pro_person():
+    return pd.DataFrame(
+        {"Name": [], "Offener Betrag (€)": [], "Anzahl Strafen": []}
+    )
+
+
+@dataclass
+class DashboardSummary:
+    """
+    Alle Kennzahlen der Kistenliste und der Strafen, einmal pro Datenversion
+    berechnet. Tabs und Diagramme lesen nur noch hieraus.
+    """
+
+    # Fingerprints der Quelldateien (siehe data_version())
+    version: tuple = ()
+
+    # Kistenliste
+    kisten_gesamt: int = 0
+    kisten_bezahlt: int = 0
+    kisten_offen: int = 0
+    personen: int = 0
+    # Index Name, Spalten Bezahlt/Offen/Gesamt, absteigend nach Gesamt
+    kisten_pro_person: pd.DataFrame = field(default_factory=_empty_kisten_pro_person)
+    # Anzahl pro Grund, absteigend
+    kisten_pro_grund: pd.Series = field(default_factory=lambda: pd.Series(dtype=int))
+    # Anzahl pro Bezahlt_Status, absteigend
+    kisten_status: pd.Series = field(default_factory=lambda: pd.Series(dtype=int))
+
+    # Strafen
+    strafen_gesamt: int = 0
+    strafen_offen: int = 0
+    strafen_bezahlt: int = 0
+    betrag_offen: float = 0.0
+    betrag_bezahlt: float = 0.0
+    # Wie calculate_strafen_per_person()
+    strafen_pro_person: pd.DataFrame = field(default_factory=_empty_strafen_pro_person)
+    # Index Was?, Spalten Anzahl/Betrag/Offener Betrag, absteigend nach Anzahl
+    strafen_pro_grund: pd.DataFrame = field(default_factory=pd.DataFrame)
+
+    @property
+    def strafen_stats(self):
+        """Statistiken im Format von get_strafen_stats()."""
+        return {
+            "gesamt": self.strafen_gesamt,
+            "offen": self.strafen_offen,
+            "bezahlt": self.strafen_bezahlt,
+            "betrag_offen": self.betrag_offen,
+            "betrag_bezahlt": self.betrag_bezahlt,
+        }
+
+
+@profiled(cached=True)
+def load_summary():
+    """
+    Lädt die DashboardSummary für die aktuelle Datenversion.
+    Berechnet wird nur, wenn sich eine der Excel-Dateien geändert hat.
+    Mit SQLite-Speicher (FCM_STORAGE=sqlite) kommen die Kennzahlen aus SQL.
+    Schlägt die Berechnung fehl, wird eine leere Summary angezeigt, aber
+    nicht gecacht: der nächste Rerun versucht es erneut.
+    """
+    version = data_version()
+    try:
+        return _load_summary(version)
+    except Exception as e:
+        st.error(f"❌ Fehler beim Berechnen der Kennzahlen: {e}")
+        summary = DashboardSummary()
+        summary.version = version
+        return summary
+
+
+@st.cache_data(max_entries=2)
+def _load_summary(version):
+    cache_miss()
+    # Über alle Server-Prozesse geteilt: nur einer berechnet pro Version
+    summary = load_shared("summary", version, lambda: _build_summary(version))
+    summary.version = version
+    return summary
+
+
+def _build_summary(version):
+    if storage.is_enabled():
+        with closing(sync_storage(version=version)) as conn:
+            return build_summary_sql(conn, storage.current_season())
+    return build_summary(
+        require_loaded(load_data(version[0]), KISTENLISTE_PATH, version[0]),
+        require_loaded(load_strafen_excel(version[1]), STRAFEN_PATH, version[1]),
+    )
+
+
+@profiled()
+def build_summary(df_kisten, df_strafen):
+    """
+    Berechnet die DashboardSummary mit je einem groupby pro Ledger.
+    Alle weiteren Kennzahlen werden aus den (kleinen) Gruppenergebnissen abgeleitet.
+    """
+    summary = DashboardSummary()
+    if df_kisten is not None and not df_kisten.empty:
+        _summarize_kisten(summary, df_kisten)
+    if df_strafen is not None and not df_strafen.empty:
+        _summarize_strafen(summary, df_strafen)
+    return summary
+
+
+def _status_slice(groups, status):
+    """Teilmenge eines gruppierten Ergebnisses für einen Bezahlt_Status."""
+    mask = groups.index.get_level_values("Bezahlt_Status") == status
+    return groups[mask].droplevel("Bezahlt_Status")
+
+
+def _summarize_kisten(summary, df):
+    groups = df.groupby(
+        ["Name", "Grund", "Bezahlt_Status"], dropna=False, observed=True
+    ).size()
+
+    status = groups.groupby(level="Bezahlt_Status", observed=True).sum()
+    summary.kisten_gesamt = len(df)
+    summary.kisten_bezahlt = int(status.get("Bezahlt", 0))
+    summary.kisten_offen = int(status.get("Offen", 0))
+    summary.kisten_status = status.sort_values(ascending=False, kind="stable")
+
+    per_person = (
+        groups.groupby(level=["Name", "Bezahlt_Status"], observed=True)
+        .sum()
+        .unstack(fill_value=0)
+        .reindex(columns=["Bezahlt", "Offen"], fill_value=0)
+    )
+    per_person = per_person[per_person.index.notna()]
+    # Spalten aus dem kategorialen Bezahlt_Status in einen normalen Index umwandeln
+    per_person.columns = pd.Index(list(per_person.columns))
+    per_person["Gesamt"] = per_person["Bezahlt"] + per_person["Offen"]
+    summary.kisten_pro_person = per_person.sort_values(
+        "Gesamt", ascending=False, kind="stable"
+    )
+    summary.personen = len(per_person)
+
+    per_reason = groups.groupby(level="Grund", observed=True).sum()
+    summary.kisten_pro_grund = per_reason[per_reason.index.notna()].sort_values(
+        ascending=False, kind="stable"
+    )
+
+
+def _summarize_strafen(summary, df):
+    groups = df.groupby(
+        ["Wer?", "Was?", "Bezahlt_Status"], dropna=False, observed=True
+    ).agg(Zeilen=("Betrag", "size"), Betrag=("Betrag", "sum"))
+    # Betrag ist float32, Summen in float64 auf Cent runden
+    groups["Betrag"] = groups["Betrag"].astype("float64").round(2)
+
+    status = groups.groupby(level="Bezahlt_Status", observed=True).sum()
+    summary.strafen_gesamt = len(df)
+    summary.strafen_offen = int(status["Zeilen"].get("Offen", 0))
+    summary.strafen_bezahlt = int(status["Zeilen"].get("Bezahlt", 0))
+    summary.betrag_offen = round(float(status["Betrag"].get("Offen", 0.0)), 2)
+    summary.betrag_bezahlt = round(float(status["Betrag"].get("Bezahlt", 0.0)), 2)
+
+    # Offene Strafen pro Person (Anzahl zählt nur Zeilen mit Vergehen)
+    open_groups = _status_slice(groups, "Offen")
+    open_groups = open_groups[open_groups.index.get_level_values("Wer?").notna()]
+    if not open_groups.empty:
+        with_reason = open_groups.index.get_level_values("Was?").notna()
+        per_person = pd.DataFrame(
+            {
+                "Offener Betrag (€)": open_groups["Betrag"]
+                .groupby(level="Wer?", observed=True)
+                .sum(),
+                "Anzahl Strafen": open_groups["Zeilen"]
+                .where(with_reason, 0)
+                .groupby(level="Wer?", observed=True)
+                .sum(),
+            }
+        )
+        per_person.index = pd.Index(per_person.index.astype(object), name="Name")
+        per_person["Offener Betrag (€)"] = per_person["Offener Betrag (€)"].round(2)
+        per_person = per_person.reset_index()
+        summary.strafen_pro_person = per_person.sort_values(
+            "Offener Betrag (€)", ascending=False
+        )
+
+    per_reason = groups.groupby(level=["Was?", "Bezahlt_Status"], observed=True).sum()
+    per_reason = per_reason[per_reason.index.get_level_values("Was?").notna()]
+    open_amount = _status_slice(per_reason, "Offen")["Betrag"]
+    by_reason = per_reason.groupby(level="Was?", observed=True).sum()
+    summary.strafen_pro_grund = (
+        pd.DataFrame(
+            {
+                "Anzahl": by_reason["Zeilen"],
+                "Betrag": by_reason["Betrag"],
+                "Offener Betrag": open_amount.reindex(by_reason.index, fill_value=0.0),
+            }
+        )
+        .sort_values("Anzahl", ascending=False, kind="stable")
+    )
+
+
+@profiled()
+def build_summary_sql(conn, season):
+    """
+    Berechnet die DashboardSummary einer Saison mit SQL-Abfragen auf den
+    SQLite-Speicher, ohne die Ledger in den Speicher zu laden.
+    """
+    summary = DashboardSummary()
+
+    status = storage.kisten_status(conn, season)
+    summary.kisten_bezahlt = int(status.get("Bezahlt", 0))
+    summary.kisten_offen = int(status.get("Offen", 0))
+    summary.kisten_gesamt = summary.kisten_bezahlt + summary.kisten_offen
+    summary.kisten_status = status
+    summary.kisten_pro_person = storage.kisten_pro_person(conn, season)
+    summary.personen = len(summary.kisten_pro_person)
+    summary.kisten_pro_grund = storage.kisten_pro_grund(conn, season)
+
+    stats = storage.strafen_stats(conn, season)
+    summary.strafen_gesamt = stats["gesamt"]
+    summary.strafen_offen = stats["offen"]
+    summary.strafen_bezahlt = stats["bezahlt"]
+    summary.betrag_offen = stats["betrag_offen"]
+    summary.betrag_bezahlt = stats["betrag_bezahlt"]
+    per_person = storage.strafen_pro_person(conn, season)
+    if not per_person.empty:
+        summary.strafen_pro_person = per_person
+    summary.strafen_pro_grund = storage.strafen_pro_grund(conn, season)
+    return summary
@@ -0,0 +1,189 @@
+"""
+Zeitreihen für Strafen und Kisten
+
+Grundlage sind Tagessummen pro Ledger (strafen_pro_tag(), kisten_pro_tag()).
+Sie sind Teil der Aggregate des IncrementalLedger und werden bei neuen oder
+geänderten Zeilen nur um deren Beitrag angepasst. build_timeseries() leitet
+daraus einmal pro Datenversion ab:
+- "tage": Tagessummen mit kumulierten Spalten (aufsteigend nach Tag)
+- "woche" / "monat": Summen pro Woche (ab Montag) und Monat
+- "stichtage": die Tage als int64 für Binärsuchen
+- "kumuliert": die kumulierten Spalten als Array (für window())
+
+Zeiträume werden per Binärsuche ausgewertet (window(), days_between(),
+open_age()), Zeilen eines Ledgers mit termin_range() auf der sortierten
+Termin-Spalte statt über boolesche Masken.
+"""
+
+from bisect import bisect_left, bisect_right
+
+import numpy as np
+import pandas as pd
+
+STRAFEN_COLUMNS = ["Strafen", "Betrag", "Offene Strafen", "Offener Betrag"]
+KISTEN_COLUMNS = ["Kisten", "Offene Kisten"]
+DAY_COLUMNS = STRAFEN_COLUMNS + KISTEN_COLUMNS
+
+# Altersstufen offener Strafen in Tagen seit Termin (von, bis, Beschriftung)
+AGE_BUCKETS = [
+    (0, 7, "bis 1 Woche"),
+    (8, 30, "bis 1 Monat"),
+    (31, 90, "bis 3 Monate"),
+    (91, None, "älter"),
+]
+
+
+def strafen_pro_tag(df):
+    """Anzahl, Betrag und davon offen pro Tag (Index Termin), ohne Zeilen ohne Datum."""
+    offen = ~df["Ist_Bezahlt"].to_numpy(dtype=bool)
+    betrag = df["Betrag"].to_numpy(dtype=float)
+    return _per_day(
+        df["Termin"],
+        {
+            "Strafen": np.ones(len(df)),
+            "Betrag": betrag,
+            "Offene Strafen": offen.astype(float),
+            "Offener Betrag": np.where(offen, betrag, 0.0),
+        },
+    )
+
+
+def kisten_pro_tag(df):
+    """Anzahl Kisten und davon offen pro Tag (Index Datum), ohne Zeilen ohne Datum."""
+    if "Datum" not in df.columns:
+        empty = pd.Series([], dtype="datetime64[ns]")
+        return _per_day(empty, {col: [] for col in KISTEN_COLUMNS})
+    offen = ~df["Ist_Bezahlt"].to_numpy(dtype=bool)
+    return _per_day(
+        df["Datum"], {"Kisten": np.ones(len(df)), "Offene Kisten": offen.astype(float)}
+    )
+
+
+def _per_day(dates, values):
+    days = pd.DatetimeIndex(dates).normalize()
+    frame = pd.DataFrame(values, index=days.rename("Tag"))
+    return frame[frame.index.notna()].groupby(level=0).sum()
+
+
+def build_timeseries(strafen_tage, kisten_tage):
+    """
+    Baut Tages-, Wochen- und Monatstabellen aus den Tagessummen beider Ledger.
+    Nur die (wenigen) Tage mit Einträgen werden verarbeitet, kumuliert und
+    gruppiert wird auf den Arrays statt per Spalte und resample().
+    """
+    tage = (
+        pd.concat([strafen_tage, kisten_tage], axis=1)
+        .reindex(columns=DAY_COLUMNS)
+        .fillna(0.0)
+        .sort_index()
+    )
+    tage = tage[(tage != 0).any(axis=1)]
+    values = tage.to_numpy(dtype=float)
+    kumuliert = np.cumsum(values, axis=0)
+    tage = pd.DataFrame(
+        np.hstack([values, kumuliert]),
+        index=tage.index,
+        columns=DAY_COLUMNS + [f"{col} kumuliert" for col in DAY_COLUMNS],
+    )
+
+    return {
+        "tage": tage,
+        "woche": _period_sums(tage, "W"),
+        "monat": _period_sums(tage, "MS"),
+        "stichtage": tage.index.to_numpy(dtype="datetime64[ns]").view("int64"),
+        "kumuliert": kumuliert,
+    }
+
+
+def _period_sums(tage, freq):
+    """
+    Summen pro Woche ("W", beschriftet mit dem Montag) oder Monat ("MS"),
+    lückenlos vom ersten bis zum letzten Zeitraum wie bei resample().
+    """
+    if tage.empty:
+        return tage[DAY_COLUMNS]
+    days = tage.index.to_numpy(dtype="datetime64[D]")
+    if freq == "W":
+        # 1970-01-01 war ein Donnerstag: +3 ergibt 0 für Montag
+        starts = days - (days.view("int64") + 3) % 7
+        periods = np.arange(starts[0], starts[-1] + 1, 7)
+    else:
+        months = days.astype("datetime64[M]")
+        starts = months.astype("datetime64[D]")
+        periods = np.arange(months[0], months[-1] + 1).astype("datetime64[D]")
+    sums = np.zeros((len(periods), len(DAY_COLUMNS)))
+    np.add.at(sums, np.searchsorted(periods, starts), tage[DAY_COLUMNS].to_numpy())
+    index = pd.DatetimeIndex(periods.astype(tage.index.dtype), name="Tag")
+    return pd.DataFrame(sums, index=index, columns=DAY_COLUMNS)
+
+
+def _day(value, unit="ns"):
+    return np.datetime64(pd.Timestamp(value).normalize(), unit).astype("int64")
+
+
+def days_between(ts, von=None, bis=None):
+    """Positionen [start, stop) der Tage mit von <= Tag <= bis (Binärsuche)."""
+    stichtage = ts["stichtage"]
+    start, stop = 0, len(stichtage)
+    if von is not None:
+        start = int(np.searchsorted(stichtage, _day(von), side="left"))
+    if bis is not None:
+        stop = int(np.searchsorted(stichtage, _day(bis), side="right"))
+    return start, max(start, stop)
+
+
+def window(ts, von=None, bis=None):
+    """
+    Summen aller Tagesspalten im Zeitraum (inklusive) als Series, aus der
+    Differenz der kumulierten Spalten an den Rändern.
+    """
+    start, stop = days_between(ts, von, bis)
+    cumulative = ts["kumuliert"]
+    total = cumulative[stop - 1] if stop > 0 else np.zeros(len(DAY_COLUMNS))
+    before = cumulative[start - 1] if start > 0 else np.zeros(len(DAY_COLUMNS))
+    return pd.Series(total - before if stop > start else 0.0, index=DAY_COLUMNS)
+
+
+def open_age(ts, stichtag=None):
+    """
+    Offener Betrag und offene Strafen nach Alter (Tage seit Termin) zum
+    Stichtag (Standard: heute). Ein Zahlungsdatum wird nicht erfasst, das
+    Alter offener Strafen ersetzt daher die Zahlungsdauer.
+    """
+    stichtag = pd.Timestamp(stichtag if stichtag is not None else "today").normalize()
+    rows = []
+    for low, high, label in AGE_BUCKETS:
+        von = None if high is None else stichtag - pd.Timedelta(days=high)
+        bis = stichtag - pd.Timedelta(days=low)
+        sums = window(ts, von, bis)
+        rows.append(
+            {
+                "Alter": label,
+                "Offene Strafen": int(sums["Offene Strafen"]),
+                "Offener Betrag": sums["Offener Betrag"],
+            }
+        )
+    return pd.DataFrame(rows)
+
+
+def termin_range(termin, von=None, bis=None):
+    """
+    Positionen [start, stop) der Zeilen mit von <= Termin <= bis in einer
+    absteigend sortierten Termin-Spalte (NaT am Ende), per Binärsuche.
+    """
+    values = termin.to_numpy()
+    unit = np.datetime_data(values.dtype)[0]
+    ints = values.view("int64")
+    nat = np.iinfo(np.int64).min
+
+    # NaT stehen am Ende: erste Position ohne Datum
+    valid = bisect_left(ints, True, key=lambda v: bool(v == nat))
+    start, stop = 0, valid
+    if bis is not None:
+        # Erste Zeile mit Termin vor dem Tag nach bis (bis ganztägig)
+        end = _day(pd.Timestamp(bis) + pd.Timedelta(days=1), unit)
+        start = bisect_right(ints, -end, 0, valid, key=lambda v: -int(v))
+    if von is not None:
+        # Erste Zeile mit Termin vor von
+        stop = bisect_right(ints, -_day(von, unit), 0, valid, key=lambda v: -int(v))
+    return start, max(start, stop)
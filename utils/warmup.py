@@ -0,0 +1,179 @@
+"""
+Aufwärmen der Caches beim Start und Neuaufbau im Hintergrund
+
+start() wird beim ersten Rerun des Prozesses aufgerufen (app.py) und startet
+einen Hintergrund-Thread:
+- alle vier Quellen werden parallel geladen (Thread-Pool)
+- danach werden Summary, Strafen-Detailansicht und Diagramme vorberechnet
+- anschließend prüft der Thread alle WATCH_INTERVAL Sekunden die Dateien
+  und baut bei einer Änderung im Hintergrund neu auf
+
+Erst wenn ein Neuaufbau komplett fertig ist, wird die neue Version für alle
+Sessions freigegeben (pin_fingerprints). Bis dahin wird der alte Stand
+ausgeliefert, keine Session wartet auf das Parsen.
+
+Abschalten: FCM_WARMUP=0, Intervall: FCM_WATCH_INTERVAL=<sekunden>
+"""
+
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from .cache import file_fingerprint
+from .data_loader import (
+    KADER_PATH,
+    KISTENLISTE_PATH,
+    STRAFEN_PATH,
+    STRAFENKATALOG_PATH,
+    _load_json,
+    _load_kistenliste,
+    _load_strafen,
+    _load_strafen_detail,
+    pin_fingerprints,
+)
+from .summary import _load_summary
+
+ENABLED = os.environ.get("FCM_WARMUP", "1") not in ("", "0")
+WATCH_INTERVAL = float(os.environ.get("FCM_WATCH_INTERVAL", "5"))
+
+# Quelle -> Ladefunktion mit explizitem Fingerprint
+SOURCES = {
+    KISTENLISTE_PATH: _load_kistenliste,
+    STRAFEN_PATH: _load_strafen,
+    KADER_PATH: lambda fingerprint: _load_json(KADER_PATH, fingerprint),
+    STRAFENKATALOG_PATH: lambda fingerprint: _load_json(STRAFENKATALOG_PATH, fingerprint),
+}
+
+logger = logging.getLogger(__name__)
+
+
+class _BackgroundThreadFilter(logging.Filter):
+    """
+    Unterdrückt Streamlits Warnung "missing ScriptRunContext" für die
+    Hintergrund-Threads. Sie rufen nur gecachte Funktionen auf, ohne Session.
+    """
+
+    def filter(self, record):
+        return not threading.current_thread().name.startswith("fcm-")
+
+
+def quiet_background_threads():
+    """Installiert den Filter einmal für Threads mit Namen "fcm-*"."""
+    context_logger = logging.getLogger(
+        "streamlit.runtime.scriptrunner_utils.script_run_context"
+    )
+    if not any(isinstance(f, _BackgroundThreadFilter) for f in context_logger.filters):
+        context_logger.addFilter(_BackgroundThreadFilter())
+
+
+_lock = threading.Lock()
+_status = {
+    "gestartet": False,
+    "fingerprints": None,
+    "fehlgeschlagen": None,
+    "neuaufbau": False,
+    "aufbauten": 0,
+    "letzter_aufbau": None,
+    "dauer_s": None,
+    "fehler": None,
+}
+
+
+def start():
+    """
+    Startet Warm-up und Watcher einmal pro Prozess. Gibt True zurück, wenn
+    der Thread bei diesem Aufruf gestartet wurde.
+    """
+    if not ENABLED:
+        return False
+    with _lock:
+        if _status["gestartet"]:
+            return False
+        _status["gestartet"] = True
+
+    quiet_background_threads()
+    threading.Thread(target=_watch, name="fcm-warmup", daemon=True).start()
+    return True
+
+
+def status():
+    """Zustand von Warm-up und Watcher (für das Diagnose-Panel)."""
+    with _lock:
+        return {
+            key: value
+            for key, value in _status.items()
+            if key not in ("fingerprints", "fehlgeschlagen")
+        }
+
+
+def current_fingerprints():
+    """Aktuelle Fingerprints aller vorhandenen Quelldateien."""
+    fingerprints = {}
+    for path in SOURCES:
+        try:
+            fingerprints[path] = file_fingerprint(path)
+        except OSError:
+            pass
+    return fingerprints
+
+
+def rebuild(fingerprints):
+    """
+    Baut alle Caches für die angegebenen Fingerprints auf und gibt die
+    Version danach für alle Sessions frei.
+    """
+    from .charts import CHART_BUILDERS, render_chart
+
+    # Quellen parallel laden (Dateizugriff und Hashing überlappen sich)
+    with ThreadPoolExecutor(max_workers=len(SOURCES), thread_name_prefix="fcm-load") as pool:
+        futures = [
+            pool.submit(SOURCES[path], fingerprint)
+            for path, fingerprint in fingerprints.items()
+        ]
+        for future in futures:
+            future.result()
+
+    version = (fingerprints.get(KISTENLISTE_PATH), fingerprints.get(STRAFEN_PATH))
+    summary = _load_summary(version)
+    if version[1] is not None:
+        _load_strafen_detail(version[1])
+    for name in CHART_BUILDERS:
+        render_chart(name, summary)
+
+    pin_fingerprints(fingerprints)
+
+
+def _watch():
+    while True:
+        fingerprints = current_fingerprints()
+        with _lock:
+            unchanged = fingerprints in (_status["fingerprints"], _status["fehlgeschlagen"])
+            if not unchanged:
+                _status["neuaufbau"] = True
+
+        if not unchanged:
+            start = time.perf_counter()
+            try:
+                rebuild(fingerprints)
+            except Exception as e:
+                # Alter Stand bleibt freigegeben, erneut erst nach der nächsten Änderung
+                logger.exception("Neuaufbau der Caches fehlgeschlagen")
+                with _lock:
+                    _status.update(fehlgeschlagen=fingerprints, fehler=str(e))
+            else:
+                with _lock:
+                    _status.update(
+                        fingerprints=fingerprints,
+                        fehlgeschlagen=None,
+                        fehler=None,
+                        aufbauten=_status["aufbauten"] + 1,
+                        letzter_aufbau=time.time(),
+                        dauer_s=round(time.perf_counter() - start, 3),
+                    )
+            finally:
+                with _lock:
+                    _status["neuaufbau"] = False
+
+        time.sleep(WATCH_INTERVAL)